@@ -0,0 +1,84 @@
+"""
+Multi-home scaling benchmark
+
+Feeds one step of readings to N homes through a MultiHomeEngine and reports
+per-decision latency and traced Python memory as N grows.
+
+    python benchmarks/bench_multi_home.py --homes 10 100 1000 2000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.multi_home import MultiHomeEngine
+from src.sensors import SensorData, SensorType
+
+
+def step_readings(rng):
+    now = datetime.now()
+    return [
+        SensorData(now, "temp", SensorType.TEMPERATURE, rng.uniform(15, 30), "°C"),
+        SensorData(now, "hum", SensorType.HUMIDITY, rng.uniform(30, 70), "%"),
+        SensorData(now, "door", SensorType.DOOR, rng.random() < 0.2),
+        SensorData(now, "air", SensorType.AIR_QUALITY, rng.uniform(80, 100), "%"),
+        SensorData(now, "pres", SensorType.PRESENCE, rng.random() < 0.6),
+    ]
+
+
+def run(n_homes, steps, max_loaded_homes):
+    rng = random.Random(42)
+    base_dir = tempfile.mkdtemp(prefix='bench_homes_')
+    tracemalloc.start()
+    engine = MultiHomeEngine(base_dir, max_loaded_homes=max_loaded_homes, retrain_threshold=None)
+    latencies = []
+    try:
+        for _ in range(steps):
+            for i in range(n_homes):
+                readings = step_readings(rng)
+                start = time.perf_counter()
+                engine.process_readings(f"home_{i}", readings)
+                latencies.append(time.perf_counter() - start)
+        current, peak = tracemalloc.get_traced_memory()
+        loaded = len(engine.loaded_homes)
+    finally:
+        engine.close()
+        tracemalloc.stop()
+        shutil.rmtree(base_dir, ignore_errors=True)
+    latencies.sort()
+    return {
+        'homes': n_homes,
+        'loaded': loaded,
+        'decisions': len(latencies),
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'memory_mb': current / 2**20,
+        'peak_mb': peak / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--homes', type=int, nargs='+', default=[10, 100, 1000, 2000])
+    parser.add_argument('--steps', type=int, default=12,
+                        help='readings per home (the first model is fitted after 10)')
+    parser.add_argument('--max-loaded-homes', type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'homes':>6} {'loaded':>6} {'decisions':>9} {'p50 ms':>8} {'p99 ms':>8} {'mem MB':>8} {'peak MB':>8}")
+    for n_homes in args.homes:
+        r = run(n_homes, args.steps, args.max_loaded_homes)
+        print(f"{r['homes']:>6} {r['loaded']:>6} {r['decisions']:>9} {r['p50_ms']:>8.3f} "
+              f"{r['p99_ms']:>8.3f} {r['memory_mb']:>8.1f} {r['peak_mb']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
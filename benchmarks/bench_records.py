@@ -0,0 +1,104 @@
+"""
+Record size benchmark
+
+Builds N readings and actions as the regular dataclasses, as the slotted
+records from src.records and (for readings) as packed binary rows, and
+reports traced memory and live allocations per record.
+
+    python benchmarks/bench_records.py --count 100000 --output records.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.actions import Action
+from src.records import ActionRecord, ActionType, Reading, ReadingPacker, epoch_ms
+from src.sensors import SensorData, SensorType
+
+SENSORS = [
+    ("temp_001", SensorType.TEMPERATURE, "°C"),
+    ("hum_001", SensorType.HUMIDITY, "%"),
+    ("door_001", SensorType.DOOR, None),
+    ("air_001", SensorType.AIR_QUALITY, "AQI"),
+    ("pres_001", SensorType.PRESENCE, None),
+]
+
+
+def sensor_data(count):
+    start = datetime(2024, 1, 1)
+    readings = []
+    for i in range(count):
+        sensor_id, sensor_type, unit = SENSORS[i % len(SENSORS)]
+        value = bool(i % 2) if unit is None else 20.0 + (i % 100) / 10
+        # Ids built per reading, as they are when parsed off the wire
+        readings.append(SensorData(start + timedelta(seconds=i), ''.join(sensor_id),
+                                   sensor_type, value, unit))
+    return readings
+
+
+def actions(count):
+    start = datetime(2024, 1, 1)
+    return [Action(f"cooling_{(start + timedelta(seconds=i)).timestamp()}", "ACTIVATE_COOLING",
+                   {"target_temp": 23}, 2, start + timedelta(seconds=i))
+            for i in range(count)]
+
+
+def action_records(count):
+    start = epoch_ms(datetime(2024, 1, 1))
+    return [ActionRecord.create(ActionType.COOLING, start + i * 1000) for i in range(count)]
+
+
+def traced(build, *args):
+    """(result, bytes still allocated, live allocations, seconds) for build(*args)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return (result, sum(s.size_diff for s in stats), sum(s.count_diff for s in stats), elapsed)
+
+
+def measure(name, count, build, *args):
+    result, size, allocations, elapsed = traced(build, *args)
+    row = {'bytes_per_record': size / count, 'allocations_per_record': allocations / count,
+           'build_seconds': elapsed}
+    print(f"{name:20} {row['bytes_per_record']:>10.1f} {row['allocations_per_record']:>10.2f} "
+          f"{elapsed:>9.3f}")
+    return result, row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--output', help='write results JSON here')
+    args = parser.parse_args()
+    n = args.count
+
+    results = {}
+    print(f"{'records':20} {'bytes/rec':>10} {'allocs/rec':>10} {'seconds':>9}")
+    data, results['SensorData'] = measure('SensorData', n, sensor_data, n)
+    readings, results['Reading'] = measure('Reading', n, lambda: [Reading.from_sensor_data(r) for r in data])
+    packer = ReadingPacker()
+    _, results['packed'] = measure('packed', n, packer.pack, readings)
+    _, results['Action'] = measure('Action', n, actions, n)
+    _, results['ActionRecord'] = measure('ActionRecord', n, action_records, n)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'count': n, 'results': results}, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
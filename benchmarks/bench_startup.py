@@ -0,0 +1,76 @@
+"""
+Startup benchmark
+
+Imports each entry point in a fresh interpreter and reports the median
+import time and whether NumPy / scikit-learn were loaded.
+
+    python benchmarks/bench_startup.py --repeat 7 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    'src',
+    'src.sensors',
+    'src.polling',
+    'src.actions',
+    'src.records',
+    'src.dispatch',
+    'src.ai_engine',
+    'src.async_engine',
+    'src.ai_controller',
+    'src.ai_model',
+    'src.multi_home',
+    'simulate_smart_home',
+]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, 'numpy' in sys.modules, 'sklearn' in sys.modules)
+"""
+
+
+def measure(module, repeat):
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        elapsed, numpy_loaded, sklearn_loaded = result.stdout.split()
+        times.append(float(elapsed))
+    return {
+        'median_ms': statistics.median(times) * 1000,
+        'min_ms': min(times) * 1000,
+        'numpy': numpy_loaded == 'True',
+        'sklearn': sklearn_loaded == 'True',
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'module':22} {'median ms':>10} {'min ms':>8}  numpy  sklearn")
+    for module in args.modules:
+        r = results[module] = measure(module, args.repeat)
+        print(f"{module:22} {r['median_ms']:>10.1f} {r['min_ms']:>8.1f}  {str(r['numpy']):6} {r['sklearn']}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': {f'import[{m}]': r for m, r in results.items()}}, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
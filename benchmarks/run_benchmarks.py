@@ -0,0 +1,239 @@
+"""
+Hot path benchmark suite
+
+Measures, on synthetic histories from the simulator's sensor models
+(bulk-generated with src.synthetic_data, readings from the scalar generators):
+  - per-reading latency of AIEngine.process_sensor_data vs history size
+  - SmartHomeAI.train_model time vs history size
+  - save_history / load_history throughput
+  - end-to-end SmartHomeSimulator step throughput
+
+Results are written as JSON; pass a previous results file to --compare to
+flag regressions (exit status 1).
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --quick --compare results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import sklearn
+
+from simulate_smart_home import SmartHomeSimulator
+from src.ai_engine import AIEngine
+from src.ai_model import SmartHomeAI
+from src.history import JSONLinesHistoryStore, SyncPolicy
+from src.sensors import SensorData, SensorType
+from src.synthetic_data import iter_chunks, write_store
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+QUICK_SIZES = [10, 1_000, 10_000]
+# load_history materializes every entry, so I/O is only measured up to here
+MAX_IO_SIZE = 100_000
+CHUNK = 10_000
+SEED = 42
+TRAIN_REPEATS = 3
+# Tail latencies are reported but too noisy on short runs to gate on
+INFORMATIONAL_METRICS = ('p99_ms', 'mean_ms')
+
+
+def new_simulator(ai):
+    return SmartHomeSimulator(ai_engine=AIEngine(ai_controller=ai))
+
+
+def generate_features(sim, n, start, step=timedelta(minutes=5)):
+    """(n, 5) feature rows from the simulator's sensor generators"""
+    X = np.empty((n, 5))
+    for i in range(n):
+        sim.time = start + i * step
+        temperature = sim.simulate_temperature()
+        X[i] = (temperature, sim.simulate_humidity(), sim.simulate_door(),
+                sim.simulate_air_quality(), sim.simulate_presence())
+    return X
+
+
+def write_history(path, n):
+    """Stream a synthetic n-entry JSONL history to path"""
+    with JSONLinesHistoryStore(path, sync_policy=SyncPolicy.NONE) as store:
+        for X, timestamps in iter_chunks(n, CHUNK, start_time=datetime(2024, 1, 1), seed=SEED):
+            write_store(store, X, timestamps)
+
+
+def sensor_readings(sim, n):
+    now = datetime.now()
+    X = generate_features(sim, n, now)
+    types = (SensorType.TEMPERATURE, SensorType.HUMIDITY, SensorType.DOOR,
+             SensorType.AIR_QUALITY, SensorType.PRESENCE)
+    readings = []
+    for i, row in enumerate(X.tolist()):
+        sensor_type = types[i % len(types)]
+        value = row[i % len(types)]
+        if sensor_type in (SensorType.DOOR, SensorType.PRESENCE):
+            value = bool(value)
+        readings.append(SensorData(now, f"sensor_{i % len(types)}", sensor_type, value))
+    return readings
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def bench_history_size(workdir, n, readings):
+    """Decision latency, train time and history I/O for an n-entry history"""
+    random.seed(SEED)
+    path = os.path.join(workdir, f'history_{n}.jsonl')
+    gen_ai = SmartHomeAI(history_file=os.path.join(workdir, 'generator.jsonl'))
+    gen_sim = new_simulator(gen_ai)
+    write_history(path, n)
+
+    results = {}
+    start = time.perf_counter()
+    ai = SmartHomeAI(history_file=path, retrain_threshold=None)
+    results[f'history_open[n={n}]'] = {'seconds': time.perf_counter() - start}
+    # Decisions only; retraining is measured separately
+    ai.on_retrain_due = lambda: None
+
+    train_times = []
+    for _ in range(TRAIN_REPEATS):
+        start = time.perf_counter()
+        ai.train_model()
+        train_times.append(time.perf_counter() - start)
+    results[f'train_model[n={n}]'] = {'seconds': min(train_times)}
+
+    engine = AIEngine(ai_controller=ai)
+    latencies = []
+    for reading in sensor_readings(gen_sim, readings):
+        start = time.perf_counter()
+        engine.process_sensor_data(reading)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    results[f'decision_latency[n={n}]'] = {
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+    }
+
+    if n <= MAX_IO_SIZE:
+        start = time.perf_counter()
+        entries = ai.load_history()
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        ai.save_history(entries)
+        save_seconds = time.perf_counter() - start
+        results[f'history_io[n={n}]'] = {
+            'load_per_s': len(entries) / load_seconds,
+            'save_per_s': len(entries) / save_seconds,
+        }
+    ai.close()
+    gen_ai.close()
+    os.remove(path)
+    return results
+
+
+def bench_simulator(workdir, steps):
+    random.seed(SEED)
+    ai = SmartHomeAI(history_file=os.path.join(workdir, 'simulator.jsonl'))
+    sim = new_simulator(ai)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(steps):
+            sim.step()
+    elapsed = time.perf_counter() - start
+    ai.close()
+    return {'simulator_steps': {'steps_per_s': steps / elapsed}}
+
+
+def run(sizes, readings, steps):
+    workdir = tempfile.mkdtemp(prefix='smart_home_bench_')
+    results = {}
+    try:
+        for n in sizes:
+            print(f"history size {n}...", file=sys.stderr)
+            results.update(bench_history_size(workdir, n, readings))
+        print("simulator...", file=sys.stderr)
+        results.update(bench_simulator(workdir, steps))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'machine': platform.machine(),
+            'sizes': sizes,
+            'readings': readings,
+            'steps': steps,
+        },
+        'results': results,
+    }
+
+
+def higher_is_better(metric):
+    return metric.endswith('_per_s')
+
+
+def compare(current, baseline, tolerance):
+    """Print metric changes vs baseline; return the regressions beyond tolerance"""
+    regressions = []
+    for name, metrics in current['results'].items():
+        for metric, value in metrics.items():
+            old = baseline['results'].get(name, {}).get(metric)
+            if not old:
+                continue
+            change = value / old - 1
+            worse = -change if higher_is_better(metric) else change
+            flag = ''
+            if worse > tolerance and metric not in INFORMATIONAL_METRICS:
+                flag = '  REGRESSION'
+                regressions.append((name, metric, old, value))
+            print(f"{name:32} {metric:12} {old:12.4g} -> {value:12.4g} ({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=None)
+    parser.add_argument('--quick', action='store_true', help=f'use sizes {QUICK_SIZES}')
+    parser.add_argument('--readings', type=int, default=2000, help='decisions timed per size')
+    parser.add_argument('--steps', type=int, default=500, help='simulator steps timed')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown before a metric counts as regressed')
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    current = run(sizes, args.readings, args.steps)
+    output = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,21 +2,40 @@
 Smart Home System Simulator
 Simulates realistic sensor data and demonstrates AI decision making
 """
+import argparse
+import asyncio
+import contextlib
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import random
 import math
 from src.sensors import (
-    SensorManager, TemperatureSensor, HumiditySensor,
+    SensorManager, SensorData, SensorType, TemperatureSensor, HumiditySensor,
     DoorSensor, AirQualitySensor, PresenceSensor
 )
-from src.ai_engine import AIEngine, ActionExecutor
+from src.actions import ActionExecutor
+from src.ai_engine import AIEngine
+from src.dispatch import ActionDispatcher
+from src.async_engine import AsyncAIEngine
+from src.synthetic_data import SensorState, generate
+
+SENSOR_UNITS = {
+    SensorType.TEMPERATURE: "°C",
+    SensorType.HUMIDITY: "%",
+    SensorType.AIR_QUALITY: "AQI"
+}
+
 
 class SmartHomeSimulator:
-    def __init__(self):
+    def __init__(self, ai_engine=None, output=None, quiet=False):
+        """output is a file-like object receiving the simulation log instead
+        of stdout; quiet skips the log."""
+        self.output = output
+        self.quiet = quiet
         self.sensor_manager = SensorManager()
-        self.ai_engine = AIEngine()
-        self.action_executor = ActionExecutor()
+        self.ai_engine = ai_engine if ai_engine is not None else AIEngine()
+        self.action_executor = ActionExecutor(output=output, quiet=quiet)
+        self.dispatcher = ActionDispatcher(self.action_executor)
 
         # Register sensors
         self.sensors = {
@@ -91,49 +110,160 @@ class SmartHomeSimulator:
                 self.presence = False
         return self.presence
 
-    def run_simulation(self, duration_minutes=60, time_step_minutes=5):
-        """Run the simulation for a specified duration."""
+    def generate_bulk(self, n_steps, time_step_minutes=5, n_homes=None, seed=None):
+        """Vectorized equivalent of n_steps calls to the simulate_* methods.
+
+        Starts from the current simulated time and door/air quality state and
+        returns SyntheticData (features, timestamps). For a single home the
+        simulator's state is advanced to the last step.
+        """
+        data = generate(n_steps, n_homes=n_homes, start_time=self.time,
+                        time_step_minutes=time_step_minutes,
+                        state=SensorState(self.door_open, self.air_quality), seed=seed)
+        if n_homes is None and n_steps:
+            last = data.features[-1]
+            self.time += timedelta(minutes=time_step_minutes * (n_steps - 1))
+            self.temperature, self.humidity = float(last[0]), float(last[1])
+            self.door_open, self.air_quality = data.final_state
+            self.presence = bool(last[4])
+        return data
+
+    def _simulate_step(self, at=None):
+        """Advance the simulated environment by one step and print its state.
+
+        at is the simulated time of the step; None uses the wall clock.
+        """
+        # Update simulation time
+        self.time = at if at is not None else datetime.now()
+
+        # Simulate sensor readings
+        temp = self.simulate_temperature()
+        humidity = self.simulate_humidity()
+        door_status = self.simulate_door()
+        air_qual = self.simulate_air_quality()
+        presence = self.simulate_presence()
+
+        if self.quiet:
+            return
+        self._print(f"\nTime: {self.time.strftime('%H:%M:%S')}")
+        self._print(f"Temperature: {temp:.1f}°C")
+        self._print(f"Humidity: {humidity:.1f}%")
+        self._print(f"Door Status: {'Open' if door_status else 'Closed'}")
+        self._print(f"Air Quality: {air_qual:.1f}")
+        self._print(f"Presence: {'Detected' if presence else 'Not Detected'}")
+
+    def run_simulation(self, duration_minutes=60, time_step_minutes=5,
+                       virtual_time=False, start_time=None):
+        """Run the simulation for a specified duration.
+
+        With virtual_time the simulated clock starts at start_time (default
+        now) and advances by time_step_minutes per step without sleeping, so
+        days of readings take seconds.
+        """
+        steps = duration_minutes // time_step_minutes
+        step_delta = timedelta(minutes=time_step_minutes)
+        if start_time is None:
+            start_time = datetime.now()
+
+        self._print_header("", duration_minutes, time_step_minutes)
+
+        for step in range(steps):
+            if virtual_time:
+                self.step(at=start_time + step * step_delta)
+            else:
+                self.step()
+
+                # Wait for next time step
+                time.sleep(1)  # Shortened for demonstration
+
+    def _print(self, text=""):
+        """Write a line of the simulation log to self.output (default stdout)"""
+        print(text, file=self.output)
+
+    def _print_header(self, mode, duration_minutes, time_step_minutes):
+        if self.quiet:
+            return
+        self._print(f"\n=== Smart Home Simulation Started{mode} ===")
+        self._print(f"Duration: {duration_minutes} minutes")
+        self._print(f"Time step: {time_step_minutes} minutes")
+        self._print("=====================================\n")
+
+    def _print_actions(self, actions):
+        if self.quiet:
+            return
+        self._print("\nAI System Response:")
+        for action in actions:
+            self._print(f"- {action.action_type}: {action.parameters}")
+
+    def _simulated_readings(self):
+        """The current simulated state as one reading per sensor"""
+        values = {
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "door": self.door_open,
+            "air_quality": self.air_quality,
+            "presence": self.presence
+        }
+        return [
+            SensorData(self.time, sensor.sensor_id, sensor.sensor_type, values[name],
+                       SENSOR_UNITS.get(sensor.sensor_type))
+            for name, sensor in self.sensors.items()
+        ]
+
+    def step(self, at=None):
+        """Simulate one time step, decide on it and execute the resulting actions."""
+        self._simulate_step(at)
+
+        # Process the step's simulated readings through the AI engine as one decision
+        actions = self.ai_engine.process_readings(self._simulated_readings(),
+                                                  timestamp=self.time.timestamp())
+        self._print_actions(actions)
+        # Only commands that change a device's state reach the executor
+        self.dispatcher.dispatch(actions, temperature=self.temperature,
+                                 now=self.time.timestamp())
+
+        if not self.quiet:
+            self._print("\n-----------------------------------")
+        return actions
+
+    async def run_simulation_async(self, duration_minutes=60, time_step_minutes=5, step_delay=1.0):
+        """Asyncio variant of run_simulation: decisions run off the loop and waits don't block it."""
+        ai_engine = AsyncAIEngine(self.ai_engine)
         steps = duration_minutes // time_step_minutes
 
-        print("\n=== Smart Home Simulation Started ===")
-        print(f"Duration: {duration_minutes} minutes")
-        print(f"Time step: {time_step_minutes} minutes")
-        print("=====================================\n")
+        self._print_header(" (asyncio)", duration_minutes, time_step_minutes)
 
         for step in range(steps):
-            # Update simulation time
-            self.time = datetime.now()
-
-            # Simulate sensor readings
-            temp = self.simulate_temperature()
-            humidity = self.simulate_humidity()
-            door_status = self.simulate_door()
-            air_qual = self.simulate_air_quality()
-            presence = self.simulate_presence()
-
-            print(f"\nTime: {self.time.strftime('%H:%M:%S')}")
-            print(f"Temperature: {temp:.1f}°C")
-            print(f"Humidity: {humidity:.1f}%")
-            print(f"Door Status: {'Open' if door_status else 'Closed'}")
-            print(f"Air Quality: {air_qual:.1f}")
-            print(f"Presence: {'Detected' if presence else 'Not Detected'}")
-
-            # Process sensor data through AI engine
-            print("\nAI System Response:")
-            for sensor in self.sensors.values():
-                sensor_data = sensor.get_reading()
-                actions = self.ai_engine.process_sensor_data(sensor_data)
-
-                # Execute actions
-                for action in actions:
-                    print(f"- {action.action_type}: {action.parameters}")
-                    self.action_executor.execute_action(action)
-
-            print("\n-----------------------------------")
-
-            # Wait for next time step
-            time.sleep(1)  # Shortened for demonstration
+            self._simulate_step()
+
+            actions = await ai_engine.process_readings(self._simulated_readings())
+            self._print_actions(actions)
+            self.dispatcher.dispatch(actions, temperature=self.temperature,
+                                     now=self.time.timestamp())
+
+            if not self.quiet:
+                self._print("\n-----------------------------------")
+            await asyncio.sleep(step_delay)
+
+        await ai_engine.aclose()
 
 if __name__ == "__main__":
-    simulator = SmartHomeSimulator()
-    simulator.run_simulation(duration_minutes=30, time_step_minutes=5)
+    parser = argparse.ArgumentParser(description="Smart home simulation")
+    parser.add_argument("--duration-minutes", type=int, default=30)
+    parser.add_argument("--time-step-minutes", type=int, default=5)
+    parser.add_argument("--fast", action="store_true",
+                        help="advance a virtual clock instead of waiting between steps")
+    parser.add_argument("--output", help="write the simulation log to this file")
+    parser.add_argument("--quiet", action="store_true", help="discard the simulation log")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(open(args.output, "w")) if args.output else None
+        simulator = SmartHomeSimulator(output=output, quiet=args.quiet)
+        stack.callback(simulator.ai_engine.close)
+        start = time.perf_counter()
+        simulator.run_simulation(duration_minutes=args.duration_minutes,
+                                 time_step_minutes=args.time_step_minutes,
+                                 virtual_time=args.fast)
+        if args.fast:
+            print(f"Simulated {args.duration_minutes} minutes in {time.perf_counter() - start:.2f}s")
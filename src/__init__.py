@@ -1,2 +1,43 @@
 # Smart Home AI System
-# This makes the src directory a Python package
+# This makes the src directory a Python package.
+#
+# Public classes are loaded on first attribute access so that importing the
+# package (or light modules such as src.sensors and src.actions) doesn't pull
+# in NumPy and scikit-learn.
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'SensorType': 'sensors',
+    'SensorData': 'sensors',
+    'SensorManager': 'sensors',
+    'SensorPoller': 'polling',
+    'Action': 'actions',
+    'ActionExecutor': 'actions',
+    'ActionDispatcher': 'dispatch',
+    'Reading': 'records',
+    'ActionRecord': 'records',
+    'ActionType': 'records',
+    'ReadingPacker': 'records',
+    'AIEngine': 'ai_engine',
+    'AIController': 'ai_controller',
+    'SmartHomeAI': 'ai_model',
+    'MultiHomeEngine': 'multi_home',
+    'AsyncAIEngine': 'async_engine',
+    'AsyncActionExecutor': 'async_engine',
+    'AsyncSensorManager': 'async_engine',
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,77 @@
+"""
+Smart Home Actions
+Action records produced by the AI engine and the executor that carries them
+out. Kept free of model dependencies so device-side processes can import it
+without NumPy or scikit-learn.
+"""
+from datetime import datetime
+from typing import Dict, Optional, TextIO
+from dataclasses import dataclass
+
+@dataclass
+class Action:
+    action_id: str
+    action_type: str
+    parameters: Dict
+    priority: int
+    timestamp: datetime
+
+class ActionExecutor:
+    def __init__(self, output: Optional[TextIO] = None, quiet: bool = False):
+        """Handlers report each command to output (default stdout); quiet reports nothing."""
+        self.output = output
+        self.quiet = quiet
+        self.action_handlers = {
+            "ACTIVATE_COOLING": self._handle_cooling,
+            "ACTIVATE_HEATING": self._handle_heating,
+            "ACTIVATE_DEHUMIDIFIER": self._handle_dehumidifier,
+            "ACTIVATE_HUMIDIFIER": self._handle_humidifier,
+            "DOOR_NOTIFICATION": self._handle_door_notification,
+            "ACTIVATE_VENTILATION": self._handle_ventilation,
+            "ADJUST_ENVIRONMENT": self._handle_environment,
+            "ENERGY_SAVING": self._handle_energy_saving
+        }
+
+    def execute_action(self, action: Action) -> bool:
+        """Execute the given action using the appropriate handler."""
+        if action.action_type in self.action_handlers:
+            return self.action_handlers[action.action_type](action.parameters)
+        return False
+
+    def _report(self, message: str, *args) -> None:
+        # Formatted only when it is going to be written
+        if not self.quiet:
+            print(message.format(*args), file=self.output)
+
+    def _handle_cooling(self, params: Dict) -> bool:
+        # Implementation would interface with actual HVAC system
+        self._report("Activating cooling to {}°C", params['target_temp'])
+        return True
+
+    def _handle_heating(self, params: Dict) -> bool:
+        self._report("Activating heating to {}°C", params['target_temp'])
+        return True
+
+    def _handle_dehumidifier(self, params: Dict) -> bool:
+        self._report("Activating dehumidifier to {}%", params['target_humidity'])
+        return True
+
+    def _handle_humidifier(self, params: Dict) -> bool:
+        self._report("Activating humidifier to {}%", params['target_humidity'])
+        return True
+
+    def _handle_door_notification(self, params: Dict) -> bool:
+        self._report("Door {} notification sent", params['status'])
+        return True
+
+    def _handle_ventilation(self, params: Dict) -> bool:
+        self._report("Activating ventilation: {} speed for {} minutes", params['speed'], params['duration_minutes'])
+        return True
+
+    def _handle_environment(self, params: Dict) -> bool:
+        self._report("Adjusting environment: lights={}, optimize_hvac={}", params['lights'], params['optimize_hvac'])
+        return True
+
+    def _handle_energy_saving(self, params: Dict) -> bool:
+        self._report("Energy saving mode: lights={}, reduce_hvac={}", params['lights'], params['reduce_hvac'])
+        return True
@@ -1,27 +1,71 @@
 from .ai_model import SmartHomeAI
-import threading
-import time
+from .scheduler import RetrainScheduler
+from .training_worker import ProcessTrainingWorker
+
+# 'thread' fits in the controller's training thread, 'process' hands fits to
+# a ProcessTrainingWorker so they don't hold this interpreter's GIL
+TRAINING_MODES = ('thread', 'process')
 
 class AIController:
-    def __init__(self):
-        self.ai = SmartHomeAI()
-        self.lock = threading.Lock()
-        self._start_training_thread()
+    def __init__(self, ai=None, training_mode='thread', retrain_policy=None, metrics=None):
+        if training_mode not in TRAINING_MODES:
+            raise ValueError(f"Unknown training mode {training_mode!r}, expected one of {TRAINING_MODES}")
+        self.ai = ai if ai is not None else SmartHomeAI()
+        self.training_mode = training_mode
+        if metrics is not None:
+            # Lock waits are recorded where the locks live, in SmartHomeAI
+            self.ai.metrics = metrics
+        self._process_trainer = None
+        if training_mode == 'process':
+            self._process_trainer = self.ai.trainer = ProcessTrainingWorker()
+        # Inference reads the published model without locking; SmartHomeAI
+        # serializes history writes internally and fits on a snapshot, so
+        # nothing here waits for a fit to finish.
+        self.scheduler = RetrainScheduler(self.ai, retrain_policy)
+        # Readings that cross the retrain threshold wake the scheduler
+        # instead of fitting on the caller's thread
+        self.ai.on_retrain_due = self.scheduler.notify
+        self.scheduler.start()
+
+    def stop(self, timeout=None):
+        """Stop the retraining loop"""
+        self.scheduler.stop(timeout)
+
+    def close(self):
+        """Stop retraining and release the training worker and history store"""
+        self.stop()
+        if self._process_trainer is not None:
+            self._process_trainer.close()
+        self.ai.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
-    def _start_training_thread(self):
-        def training_loop():
-            while True:
-                with self.lock:
-                    self.ai.train_model()
-                time.sleep(300)  # Train every 5 minutes
+    def process_sensor_data(self, sensor_data, timestamp=None):
+        return self.ai.process_sensor_data(sensor_data, timestamp)
 
-        thread = threading.Thread(target=training_loop, daemon=True)
-        thread.start()
+    def decide(self, sensor_data):
+        return self.ai.decide(sensor_data)
 
-    def process_sensor_data(self, sensor_data):
-        with self.lock:
-            return self.ai.process_sensor_data(sensor_data)
+    def decide_cached(self, sensor_data):
+        return self.ai.decide_cached(sensor_data)
+
+    def record(self, sensor_data, actions, timestamp=None):
+        self.ai.record(sensor_data, actions, timestamp)
+
+    def process_batch(self, readings, record=False, timestamps=None):
+        return self.ai.process_batch(readings, record=record, timestamps=timestamps)
 
     def get_learned_rules(self):
-        with self.lock:
-            return self.ai.get_learned_rules()
+        return self.ai.get_learned_rules()
+
+    @property
+    def metrics(self):
+        return self.ai.metrics
+
+    def model_staleness(self):
+        """Version, age and readings-behind of the model currently serving"""
+        return self.ai.model_staleness()
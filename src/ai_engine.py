@@ -2,45 +2,179 @@
 Smart Home AI Decision Engine
 Processes sensor data and makes intelligent decisions for home automation using neural networks.
 """
+import math
+import time
+from array import array
 from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass
-import numpy as np
+from typing import Callable, Iterable, List, Dict, Optional
 from .sensors import SensorData, SensorType
-from .ai_model import SmartHomeAI
-from .ai_controller import AIController
-
-@dataclass
-class Action:
-    action_id: str
-    action_type: str
-    parameters: Dict
-    priority: int
-    timestamp: datetime
+from .actions import Action, ActionExecutor
+from .metrics import NULL_METRICS
+
+# Values assumed for sensors that haven't reported yet
+DEFAULT_SENSOR_VALUES = {
+    SensorType.TEMPERATURE: 22.0,
+    SensorType.HUMIDITY: 45.0,
+    SensorType.DOOR: False,
+    SensorType.AIR_QUALITY: 95.0,
+    SensorType.PRESENCE: True
+}
+
+# Position of each sensor type in the model's feature vector (FEATURE_KEYS order)
+FEATURE_SLOTS = {
+    SensorType.TEMPERATURE: 0,
+    SensorType.HUMIDITY: 1,
+    SensorType.DOOR: 2,
+    SensorType.AIR_QUALITY: 3,
+    SensorType.PRESENCE: 4
+}
+BOOLEAN_SLOTS = frozenset((FEATURE_SLOTS[SensorType.DOOR], FEATURE_SLOTS[SensorType.PRESENCE]))
 
 class AIEngine:
-    def __init__(self):
-        self.ai_controller = AIController()
+    def __init__(self, coalesce_window: Optional[float] = None,
+                 coalesce_until_complete: bool = False,
+                 clock: Callable[[], float] = time.monotonic, ai_controller=None,
+                 metrics=None):
+        """Create the engine.
+
+        With coalesce_window (seconds) and/or coalesce_until_complete set,
+        sensor updates are merged and a single decision runs once the window
+        has elapsed or every sensor type has reported; until then
+        process_sensor_data returns no actions. The window is checked as
+        readings arrive, so call flush() to close it when the stream goes quiet.
+        ai_controller defaults to a new AIController; anything with the same
+        process_sensor_data/get_learned_rules interface (e.g. a SmartHomeAI
+        trained elsewhere) can be passed instead.
+        metrics receives an actions_total counter per action type.
+        """
+        if ai_controller is None:
+            # Imported here so executor-only users don't load sklearn
+            from .ai_controller import AIController
+            ai_controller = AIController()
+        self.ai_controller = ai_controller
         self.current_state: Dict[SensorType, SensorData] = {}
+        # Parsed feature values, updated one slot per reading, and the clock
+        # time each slot was last reported (NaN until it has been)
+        self.features = array('d', [0.0] * len(FEATURE_SLOTS))
+        for sensor_type, slot in FEATURE_SLOTS.items():
+            self.features[slot] = float(DEFAULT_SENSOR_VALUES[sensor_type])
+        self.updated_at = array('d', [math.nan] * len(FEATURE_SLOTS))
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.coalesce_window = coalesce_window
+        self.coalesce_until_complete = coalesce_until_complete
+        self._clock = clock
+        self._pending: set = set()
+        self._window_start: Optional[float] = None
+
+    @property
+    def coalescing(self) -> bool:
+        return self.coalesce_window is not None or self.coalesce_until_complete
 
     def process_sensor_data(self, sensor_data: SensorData) -> List[Action]:
         """Process new sensor data and determine required actions using neural network."""
-        # Update current state
-        self.current_state[sensor_data.sensor_type] = sensor_data
+        if self.coalescing:
+            return self._coalesce(sensor_data)
 
-        # Prepare sensor data for AI processing
-        sensor_dict = {
-            'temperature': float(self.current_state.get(SensorType.TEMPERATURE, SensorData(SensorType.TEMPERATURE, "22.0", datetime.now())).value),
-            'humidity': float(self.current_state.get(SensorType.HUMIDITY, SensorData(SensorType.HUMIDITY, "45.0", datetime.now())).value),
-            'door_status': bool(self.current_state.get(SensorType.DOOR, SensorData(SensorType.DOOR, "False", datetime.now())).value),
-            'air_quality': float(self.current_state.get(SensorType.AIR_QUALITY, SensorData(SensorType.AIR_QUALITY, "95.0", datetime.now())).value),
-            'presence': bool(self.current_state.get(SensorType.PRESENCE, SensorData(SensorType.PRESENCE, "True", datetime.now())).value)
-        }
+        sensor_dict = self.update_state(sensor_data)
 
         # Get AI predictions
         system_actions = self.ai_controller.process_sensor_data(sensor_dict)
 
-        # Convert AI decisions to actions
+        return self.build_actions(system_actions)
+
+    def process_readings(self, readings: Iterable[SensorData],
+                         timestamp: Optional[float] = None) -> List[Action]:
+        """Apply several readings (e.g. one time step) and run a single decision.
+
+        timestamp (epoch seconds, default now) is recorded with the decision.
+        """
+        now = self._clock()
+        for sensor_data in readings:
+            self._apply(sensor_data, now)
+        self.take_pending()
+        return self._decide(timestamp)
+
+    def flush(self) -> List[Action]:
+        """Run the decision for coalesced updates still pending, if any."""
+        if not self.take_pending():
+            return []
+        return self._decide()
+
+    def _coalesce(self, sensor_data: SensorData) -> List[Action]:
+        if self.add_pending(sensor_data):
+            return self.flush()
+        return []
+
+    def add_pending(self, sensor_data: SensorData) -> bool:
+        """Apply a reading to the coalescing window; True once the window should close."""
+        now = self._clock()
+        self._apply(sensor_data, now)
+        self._pending.add(sensor_data.sensor_type)
+        if self._window_start is None:
+            self._window_start = now
+        complete = self.coalesce_until_complete and len(self._pending) == len(SensorType)
+        expired = (self.coalesce_window is not None
+                   and now - self._window_start >= self.coalesce_window)
+        return complete or expired
+
+    def take_pending(self) -> bool:
+        """Close the coalescing window; False if no updates were pending."""
+        if not self._pending:
+            return False
+        self._pending.clear()
+        self._window_start = None
+        return True
+
+    def _decide(self, timestamp: Optional[float] = None) -> List[Action]:
+        system_actions = self.ai_controller.process_sensor_data(self.sensor_dict(), timestamp)
+        return self.build_actions(system_actions)
+
+    def _apply(self, sensor_data: SensorData, now: float) -> None:
+        """Store a reading and update its feature slot"""
+        sensor_type = sensor_data.sensor_type
+        self.current_state[sensor_type] = sensor_data
+        slot = FEATURE_SLOTS[sensor_type]
+        value = sensor_data.value
+        if slot in BOOLEAN_SLOTS:
+            self.features[slot] = 1.0 if value else 0.0
+        else:
+            self.features[slot] = float(value)
+        self.updated_at[slot] = now
+
+    def _state_value(self, sensor_type: SensorType):
+        return self.features[FEATURE_SLOTS[sensor_type]]
+
+    def reading_age(self, sensor_type: SensorType) -> Optional[float]:
+        """Seconds (on the engine's clock) since sensor_type last reported, None if never."""
+        updated_at = self.updated_at[FEATURE_SLOTS[sensor_type]]
+        return None if math.isnan(updated_at) else self._clock() - updated_at
+
+    def stale_sensors(self, max_age: float) -> List[SensorType]:
+        """Sensor types that haven't reported within max_age seconds (or ever)."""
+        now = self._clock()
+        return [sensor_type for sensor_type, slot in FEATURE_SLOTS.items()
+                if not now - self.updated_at[slot] <= max_age]
+
+    def update_state(self, sensor_data: SensorData) -> Dict:
+        """Record a reading in the current state and return the model's input dict."""
+        # Update current state
+        self._apply(sensor_data, self._clock())
+        return self.sensor_dict()
+
+    def sensor_dict(self) -> Dict:
+        """The model's input dict for the current state."""
+        # Prepare sensor data for AI processing
+        temperature, humidity, door_status, air_quality, presence = self.features
+        return {
+            'temperature': temperature,
+            'humidity': humidity,
+            'door_status': door_status != 0.0,
+            'air_quality': air_quality,
+            'presence': presence != 0.0
+        }
+
+    def build_actions(self, system_actions: Dict) -> List[Action]:
+        """Convert AI decisions to prioritized actions."""
         actions = []
 
         if system_actions['ventilation']:
@@ -53,7 +187,7 @@ class AIEngine:
             ))
 
         if system_actions['hvac']:
-            current_temp = float(self.current_state.get(SensorType.TEMPERATURE, SensorData(SensorType.TEMPERATURE, "22.0", datetime.now())).value)
+            current_temp = self._state_value(SensorType.TEMPERATURE)
             if current_temp > 24:
                 actions.append(Action(
                     action_id=f"cooling_{datetime.now().timestamp()}",
@@ -98,60 +232,15 @@ class AIEngine:
                 timestamp=datetime.now()
             ))
 
+        if self.metrics.enabled:
+            for action in actions:
+                self.metrics.increment('actions_total', type=action.action_type)
         return sorted(actions, key=lambda x: x.priority)
 
     def get_learned_rules(self):
         """Get the current set of rules learned by the AI"""
         return self.ai_controller.get_learned_rules()
 
-class ActionExecutor:
-    def __init__(self):
-        self.action_handlers = {
-            "ACTIVATE_COOLING": self._handle_cooling,
-            "ACTIVATE_HEATING": self._handle_heating,
-            "ACTIVATE_DEHUMIDIFIER": self._handle_dehumidifier,
-            "ACTIVATE_HUMIDIFIER": self._handle_humidifier,
-            "DOOR_NOTIFICATION": self._handle_door_notification,
-            "ACTIVATE_VENTILATION": self._handle_ventilation,
-            "ADJUST_ENVIRONMENT": self._handle_environment,
-            "ENERGY_SAVING": self._handle_energy_saving
-        }
-
-    def execute_action(self, action: Action) -> bool:
-        """Execute the given action using the appropriate handler."""
-        if action.action_type in self.action_handlers:
-            return self.action_handlers[action.action_type](action.parameters)
-        return False
-
-    def _handle_cooling(self, params: Dict) -> bool:
-        # Implementation would interface with actual HVAC system
-        print(f"Activating cooling to {params['target_temp']}°C")
-        return True
-
-    def _handle_heating(self, params: Dict) -> bool:
-        print(f"Activating heating to {params['target_temp']}°C")
-        return True
-
-    def _handle_dehumidifier(self, params: Dict) -> bool:
-        print(f"Activating dehumidifier to {params['target_humidity']}%")
-        return True
-
-    def _handle_humidifier(self, params: Dict) -> bool:
-        print(f"Activating humidifier to {params['target_humidity']}%")
-        return True
-
-    def _handle_door_notification(self, params: Dict) -> bool:
-        print(f"Door {params['status']} notification sent")
-        return True
-
-    def _handle_ventilation(self, params: Dict) -> bool:
-        print(f"Activating ventilation: {params['speed']} speed for {params['duration_minutes']} minutes")
-        return True
-
-    def _handle_environment(self, params: Dict) -> bool:
-        print(f"Adjusting environment: lights={params['lights']}, optimize_hvac={params['optimize_hvac']}")
-        return True
-
-    def _handle_energy_saving(self, params: Dict) -> bool:
-        print(f"Energy saving mode: lights={params['lights']}, reduce_hvac={params['reduce_hvac']}")
-        return True
+    def close(self):
+        """Stop the controller's background work and flush its history"""
+        self.ai_controller.close()
@@ -1,43 +1,361 @@
 import numpy as np
-import json
+import copy
 import os
+import threading
+import time
+from collections import namedtuple
 from sklearn.tree import DecisionTreeClassifier
+from .history import ACTION_KEYS, FEATURE_KEYS, open_history_store, rows_to_entries
+from .history_buffer import HistoryBuffer
+from .metrics import NULL_METRICS, TimedLock
+from .model_store import ModelStore
+from .online_model import OnlineActionModel
+from .retention import collapse_duplicates
+from .training_worker import TREE_PARAMS, fit_tree
+from .tree_compiler import CompiledTree
+
+# Minimum number of history entries before the first model is fitted
+MIN_TRAINING_SAMPLES = 10
+# Cached in place of a model prediction while there is no model: the rules alone decide
+NO_PREDICTION = (False,) * len(ACTION_KEYS)
+
+DEFAULT_HISTORY_FILE = 'sensor_history.jsonl'
+
+# 'tree' refits a DecisionTreeClassifier on the full history, 'online'
+# updates per-action incremental classifiers with new samples only
+LEARNERS = ('tree', 'online')
+
+FEATURE_NAMES = ['Temperature', 'Humidity', 'Door Status', 'Air Quality', 'Presence']
+ACTION_NAMES = ['Ventilation', 'HVAC', 'Lighting', 'Security', 'Energy Saving']
+
+# A published model together with its compiled single-sample predictor (None
+# for models that can't be compiled) and version metadata; swapped in as one
+# reference. sample_count is the number of readings recorded when the
+# training snapshot was taken.
+ServingModel = namedtuple('ServingModel', ['model', 'compiled', 'version', 'trained_at', 'sample_count'])
+
+
+def _new_model(learner='tree'):
+    if learner == 'online':
+        return OnlineActionModel(n_actions=len(ACTION_KEYS))
+    return DecisionTreeClassifier(**TREE_PARAMS)
+
+
+def _is_fitted(model):
+    if isinstance(model, OnlineActionModel):
+        return model.is_fitted()
+    return isinstance(model, CompiledTree) or hasattr(model, 'tree_')
+
+
+def readings_to_features(readings):
+    """Stack sensor dicts (or pass through an (n, 5) array) into a float feature matrix"""
+    if isinstance(readings, np.ndarray):
+        return readings.astype(np.float64, copy=False).reshape(-1, len(FEATURE_KEYS))
+    X = np.array([[reading[key] for key in FEATURE_KEYS] for reading in readings],
+                 dtype=np.float64)
+    return X.reshape(-1, len(FEATURE_KEYS))
+
+
+def apply_explicit_rules(X):
+    """Vectorized threshold rules: (n, 5) features -> (n, 5) bool actions before the model"""
+    temperature = X[:, 0]
+    air_quality = X[:, 3]
+    presence = X[:, 4] != 0
+    actions = np.empty((len(X), len(ACTION_KEYS)), dtype=bool)
+    actions[:, 0] = (temperature >= 26.0) | (air_quality < 90.0)
+    actions[:, 1] = (temperature >= 26.0) | (temperature < 18.0)
+    actions[:, 2] = presence
+    actions[:, 3] = X[:, 2] != 0
+    actions[:, 4] = ~presence
+    return actions
+
+
+def apply_energy_saving_override(X, actions):
+    """Vectorized energy saving override, applied in place after model predictions"""
+    saving = actions[:, 4]
+    actions[saving, 2] = False
+    temperature = X[:, 0]
+    comfortable = saving & (temperature >= 18) & (temperature <= 26) & (X[:, 3] >= 90)
+    actions[comfortable, 0] = False
+    actions[comfortable, 1] = False
+    return actions
+
 
 class SmartHomeAI:
-    def __init__(self):
-        """Initialize the Smart Home AI model"""
-        self.history_file = 'sensor_history.json'
-        self.model = DecisionTreeClassifier(max_depth=5, random_state=42)
-        if not os.path.exists(self.history_file):
-            self.save_history([])
+    def __init__(self, history_file=DEFAULT_HISTORY_FILE, retrain_threshold=50,
+                 history_store=None, buffer_path=None, learner='tree', retention=None,
+                 trainer=None, decision_cache=None, metrics=None, model_dir=None):
+        """Initialize the Smart Home AI model
+
+        retrain_threshold is the number of new readings after which
+        process_sensor_data refits the model inline; None leaves retraining
+        to explicit train_model() calls (e.g. the AIController loop).
+        history_store overrides the store opened from history_file, e.g. to
+        pick a different SyncPolicy. A whole-file JSON history next to a new
+        .jsonl or .db/.sqlite file (sensor_history.json for the default) is
+        imported once.
+        buffer_path memory-maps the columnar training buffer so a restart
+        reuses it instead of re-parsing the history store.
+        learner selects the model type, one of LEARNERS.
+        retention is an optional RetentionPolicy bounding and weighting the
+        history used for training.
+        trainer runs tree fits elsewhere, e.g. a ProcessTrainingWorker; None
+        fits in-process.
+        decision_cache is an optional DecisionCache of model predictions;
+        readings that hit it skip inference and are not recorded again.
+        metrics is a metrics sink (e.g. InMemoryMetrics) receiving stage
+        timings, lock waits and model/prediction counters; None disables it.
+        model_dir keeps versioned snapshots of the tree learner's model; the
+        newest one that matches the current feature layout is served at
+        startup without refitting.
+        """
+        if learner not in LEARNERS:
+            raise ValueError(f"Unknown learner {learner!r}, expected one of {LEARNERS}")
+        self.learner = learner
+        self.retention = retention
+        self.trainer = trainer
+        self.decision_cache = decision_cache
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.history_file = history_file
+        if history_store is None:
+            legacy_file = os.path.splitext(history_file)[0] + '.json'
+            history_store = open_history_store(history_file, import_from=legacy_file)
+        self.history = history_store
+        self.buffer = HistoryBuffer(path=buffer_path)
+        # Store rows before the buffer's first row, when only the retention window was loaded
+        self._history_offset = 0
+        self._sync_buffer()
+        self.model = _new_model(learner)
+        self._serving = None
+        self.model_version = 0
+        # Buffer index up to which the online model has learned; None means start over
+        self._online_offset = None
+        self.retrain_threshold = retrain_threshold
+        # Called instead of an inline fit when a retrain is due (e.g. to wake
+        # a background trainer); None trains on the calling thread
+        self.on_retrain_due = None
+        self._samples_since_training = 0
+        self._samples_recorded = len(self.buffer)
+        # Serializes fits; held for the whole fit but never by readers
+        self._training_lock = threading.Lock()
+        # Guards history/buffer writes and training snapshots; held briefly
+        self.history_lock = threading.Lock()
+        self.model_store = ModelStore(model_dir, metrics=self.metrics) if model_dir is not None else None
+        if self.model_store is not None and learner == 'tree':
+            self._warm_start()
+
+    def _warm_start(self):
+        """Serve the newest stored model snapshot, if there is a usable one"""
+        snapshot = self.model_store.load_latest()
+        if snapshot is None:
+            # Number new snapshots past rejected ones, or pruning would delete them first
+            versions = self.model_store.versions()
+            if versions:
+                self.model_version = versions[-1]
+            return
+        # The history may have been truncated since the snapshot was taken
+        history_size = min(snapshot.history_size, len(self.buffer))
+        self._serving = ServingModel(snapshot.compiled, snapshot.compiled, snapshot.version,
+                                     snapshot.trained_at, history_size)
+        self.model = snapshot.compiled
+        self.model_version = snapshot.version
+        self._samples_since_training = len(self.buffer) - history_size
+
+    def _locked(self, lock, name):
+        """lock itself, or a wrapper timing the wait when metrics are enabled"""
+        if self.metrics.enabled:
+            return TimedLock(lock, self.metrics, name)
+        return lock
+
+    def is_trained(self):
+        """Return True once a fitted model has been published"""
+        return _is_fitted(self.model)
+
+    def _retrain_due(self, history_size):
+        if history_size < MIN_TRAINING_SAMPLES:
+            return False
+        if not self.is_trained():
+            return True
+        return (self.retrain_threshold is not None
+                and self._samples_since_training >= self.retrain_threshold)
+
+    def _maybe_retrain(self):
+        if self._retrain_due(len(self.history)):
+            if self.on_retrain_due is not None:
+                self.on_retrain_due()
+            else:
+                self.train_model()
+
+    def model_staleness(self):
+        """How far the serving model lags behind the recorded history"""
+        serving = self._serving
+        if serving is None:
+            return {'version': 0, 'age_seconds': None, 'samples_behind': self._samples_recorded}
+        return {
+            'version': serving.version,
+            'age_seconds': time.time() - serving.trained_at,
+            'samples_behind': self._samples_recorded - serving.sample_count
+        }
+
+    def _sync_buffer(self):
+        """Bring the columnar buffer in line with the history store
+
+        A fresh in-memory buffer over a store that can locate the retention
+        window (e.g. SQLiteHistoryStore) loads only the window's rows.
+        """
+        stored = len(self.history) - self._history_offset
+        if len(self.buffer) > stored:
+            self.buffer.clear()
+            self._history_offset = 0
+            stored = len(self.history)
+        if not len(self.buffer) and self.buffer.path is None and self.retention is not None:
+            offset = self.history.window_offset(self.retention.max_samples,
+                                                self.retention.max_age_seconds)
+            if offset:
+                self._history_offset = offset
+                stored = len(self.history) - offset
+        if len(self.buffer) < stored:
+            self.buffer.extend_entries(self.history.iter_from(self._history_offset + len(self.buffer)))
 
     def load_history(self):
-        """Load training history from file"""
+        """Load training history from the history store"""
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
+            if not self.metrics.enabled:
+                return self.history.load()
+            start = time.perf_counter()
+            history = self.history.load()
+            self.metrics.observe('stage_seconds', time.perf_counter() - start, stage='history_read')
+            return history
         except Exception:
-            pass
-        return []
+            return []
 
     def save_history(self, history):
-        """Save training history to file"""
-        with open(self.history_file, 'w') as f:
-            json.dump(history, f)
+        """Replace the stored training history"""
+        with self._locked(self._training_lock, 'training'), self._locked(self.history_lock, 'history'):
+            self.history.replace(history)
+            self._history_offset = 0
+            self.buffer.clear()
+            self.buffer.extend_entries(history)
+            self._samples_recorded += len(history)
+            self._online_offset = None
 
-    def process_sensor_data(self, sensor_data):
-        """Process sensor data and return recommended actions"""
-        # Convert input data to features
-        input_data = np.array([[
+    def close(self):
+        """Flush and close the history store"""
+        self.history.close()
+        self.buffer.flush()
+
+    def process_sensor_data(self, sensor_data, timestamp=None):
+        """Process sensor data and return recommended actions
+
+        timestamp (epoch seconds, default now) is stored with the history entry.
+        """
+        cache = self.decision_cache
+        if cache is None:
+            features, actions = self._decide(sensor_data)
+            self._record(sensor_data, features, actions, timestamp)
+            return actions
+
+        actions = self._cached_decision(sensor_data)
+        if actions is not None:
+            return actions
+        features, actions = self._decide(sensor_data)
+        self._record(sensor_data, features, actions, timestamp)
+        return actions
+
+    def decide(self, sensor_data):
+        """Return recommended actions without recording the reading"""
+        return self.decide_cached(sensor_data)[0]
+
+    def decide_cached(self, sensor_data):
+        """Return (actions, hit) without recording the reading
+
+        hit is True when the decision cache served the reading; callers that
+        record() separately skip the write then, as process_sensor_data does.
+        """
+        if self.decision_cache is not None:
+            actions = self._cached_decision(sensor_data)
+            if actions is not None:
+                return actions, True
+        return self._decide(sensor_data)[1], False
+
+    def _cached_decision(self, sensor_data):
+        """Actions from the rules and a cached model prediction, or None on a cache miss
+
+        Only the prediction is cached: the threshold rules and the energy
+        saving override are evaluated on the exact reading every time.
+        """
+        cache = self.decision_cache
+        serving = self._serving
+        version = serving.version if serving is not None else self.model_version
+        prediction = cache.get(cache.key(self._features(sensor_data)), version)
+        if prediction is None:
+            return None
+        actions = self._rule_actions(sensor_data)
+        self._apply_prediction(actions, prediction)
+        return self._energy_override(sensor_data, actions)
+
+    def record(self, sensor_data, actions, timestamp=None):
+        """Append a reading and the actions decided for it to the history"""
+        self._record(sensor_data, self._features(sensor_data), actions, timestamp)
+
+    def _features(self, sensor_data):
+        return [
             sensor_data['temperature'],
             sensor_data['humidity'],
             1.0 if sensor_data['door_status'] else 0.0,
             sensor_data['air_quality'],
             1.0 if sensor_data['presence'] else 0.0
-        ]])
+        ]
+
+    def _decide(self, sensor_data):
+        metrics = self.metrics
+        timed = metrics.enabled
+        if timed:
+            start = time.perf_counter()
+
+        # Convert input data to features
+        features = self._features(sensor_data)
+        if timed:
+            now = time.perf_counter()
+            metrics.observe('stage_seconds', now - start, stage='features')
+            start = now
 
         # Initialize actions with explicit rules
+        actions = self._rule_actions(sensor_data)
+        if timed:
+            metrics.observe('stage_seconds', time.perf_counter() - start, stage='rules')
+
+        # Apply learned patterns if we have enough data. Training only runs
+        # when a retrain is due; otherwise the last published model is used.
+        self._maybe_retrain()
+        serving = self._serving  # read the reference once so a concurrent swap can't split this call
+        cache = self.decision_cache
+        if serving is not None:
+            if timed:
+                start = time.perf_counter()
+            try:
+                if serving.compiled is not None:
+                    prediction = serving.compiled.predict_one(features)
+                else:
+                    prediction = serving.model.predict(np.array([features]))[0]
+                prediction = tuple(bool(value) for value in prediction)
+                # Combine predictions with explicit rules using logical OR
+                self._apply_prediction(actions, prediction)
+                if cache is not None:
+                    cache.put(cache.key(features), serving.version, prediction)
+            except Exception:
+                # Fall back to explicit rules if prediction fails
+                metrics.increment('prediction_errors_total')
+            if timed:
+                metrics.observe('stage_seconds', time.perf_counter() - start, stage='predict')
+        elif cache is not None:
+            # No model yet: the rules alone decide
+            cache.put(cache.key(features), self.model_version, NO_PREDICTION)
+
+        return features, self._energy_override(sensor_data, actions)
+
+    @staticmethod
+    def _rule_actions(sensor_data):
         actions = {
             'ventilation': False,
             'hvac': False,
@@ -55,93 +373,226 @@ class SmartHomeAI:
 
         if sensor_data['air_quality'] < 90.0:
             actions['ventilation'] = True
+        return actions
 
-        # Apply learned patterns if we have enough data
-        history = self.load_history()
-        if len(history) >= 10:
-            self.train_model()  # No argument needed
-            try:
-                predictions = self.model.predict(input_data)
-                # Combine predictions with explicit rules using logical OR
-                actions['ventilation'] = actions['ventilation'] or bool(predictions[0][0])
-                actions['hvac'] = actions['hvac'] or bool(predictions[0][1])
-                actions['lighting'] = actions['lighting'] or bool(predictions[0][2])
-                actions['security'] = actions['security'] or bool(predictions[0][3])
-                actions['energy_saving'] = actions['energy_saving'] or bool(predictions[0][4])
-            except Exception as e:
-                print(f"Prediction failed: {e}")  # For debugging
-                pass  # Fall back to explicit rules if prediction fails
+    @staticmethod
+    def _apply_prediction(actions, prediction):
+        for key, predicted in zip(ACTION_KEYS, prediction):
+            actions[key] = actions[key] or predicted
 
+    @staticmethod
+    def _energy_override(sensor_data, actions):
         # Override with energy saving logic
         if actions['energy_saving']:
             actions['lighting'] = False
             if 18 <= sensor_data['temperature'] <= 26 and sensor_data['air_quality'] >= 90:
                 actions['hvac'] = False
                 actions['ventilation'] = False
+        return actions
 
+    def _record(self, sensor_data, features, actions, timestamp):
         # Save to history for future training
-        history.append({
+        if timestamp is None:
+            timestamp = time.time()
+        entry = {
+            'timestamp': timestamp,
             'input': sensor_data,
             'output': actions
-        })
-        self.save_history(history)
+        }
+        labels = [actions[key] for key in ACTION_KEYS]
+        metrics = self.metrics
+        with self._locked(self.history_lock, 'history'):
+            if metrics.enabled:
+                start = time.perf_counter()
+                self.history.append(entry)
+                metrics.observe('stage_seconds', time.perf_counter() - start, stage='history_write')
+            else:
+                self.history.append(entry)
+            self.buffer.append(features, labels, timestamp)
+            self._samples_since_training += 1
+            self._samples_recorded += 1
 
-        return actions
+    def decide_batch(self, X):
+        """Return the (n, 5) bool action matrix for an (n, 5) feature matrix
+
+        Rules are evaluated as NumPy masks and the model is called once for
+        the whole batch.
+        """
+        actions = apply_explicit_rules(X)
+        serving = self._serving
+        if serving is not None and len(X):
+            try:
+                actions |= np.asarray(serving.model.predict(X)) != 0
+            except Exception:
+                self.metrics.increment('prediction_errors_total')
+        return apply_energy_saving_override(X, actions)
+
+    def process_batch(self, readings, record=False, timestamps=None):
+        """Process many readings (list of sensor dicts or an (n, 5) array) in one call
+
+        Returns one action dict per reading. With record=True the readings
+        and decisions are appended to the history, e.g. when backfilling.
+        """
+        X = readings_to_features(readings)
+        if record:
+            self._maybe_retrain()
+        actions = self.decide_batch(X)
+        if record:
+            self._record_batch(X, actions, timestamps)
+        return [dict(zip(ACTION_KEYS, row)) for row in actions.tolist()]
+
+    def _record_batch(self, X, actions, timestamps):
+        n = len(X)
+        if timestamps is None:
+            timestamps = np.full(n, time.time())
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        entries = rows_to_entries(X.tolist(), actions.tolist(), timestamps.tolist())
+        metrics = self.metrics
+        with self._locked(self.history_lock, 'history'):
+            if metrics.enabled:
+                start = time.perf_counter()
+                self.history.extend(entries)
+                metrics.observe('stage_seconds', time.perf_counter() - start, stage='history_write')
+            else:
+                self.history.extend(entries)
+            self.buffer.extend(X, actions, timestamps)
+            self._samples_since_training += n
+            self._samples_recorded += n
 
     def train_model(self):
-        """Train the decision tree model on historical data"""
-        history = self.load_history()
-        if not history:
+        """Train a new model on historical data and publish it
+
+        The training data is copied out of the buffer under the short
+        history lock and the fit runs without it, so readings keep flowing.
+        The new model is swapped in with a single reference assignment, so
+        readers see either the old or the new model. The online learner is
+        updated copy-on-write with unseen samples only.
+        """
+        with self._locked(self._training_lock, 'training'):
+            if self.metrics.enabled:
+                start = time.perf_counter()
+                self._train_model()
+                self.metrics.observe('stage_seconds', time.perf_counter() - start, stage='train')
+            else:
+                self._train_model()
+
+    def _train_model(self):
+        with self._locked(self.history_lock, 'history'):
+            self._samples_since_training = 0
+            self._apply_retention()
+            sample_count = self._samples_recorded
+            start = 0
+            if self.learner == 'online' and self._online_offset is not None:
+                start = self._online_offset
+            end = len(self.buffer)
+            # A worker process can map a file-backed buffer itself; rows below
+            # `end` stay put until the next compaction, which needs the
+            # training lock we hold
+            shared_buffer = (self.learner == 'tree' and self.buffer.path is not None
+                             and hasattr(self.trainer, 'fit_buffer'))
+            if not shared_buffer:
+                X, y, timestamps = self.buffer.snapshot(start)
+
+        if self.learner == 'online':
+            self._update_online_model(X, y, timestamps, start, sample_count)
+            return
+
+        if end == 0:
+            return
+        if shared_buffer:
+            model = self.trainer.fit_buffer(self.buffer.path, end, self.retention)
+            self._publish(model, sample_count, end)
             return
 
-        # Prepare training data
-        X = []
-        y = []
-        for entry in history:
-            X.append([
-                entry['input']['temperature'],
-                entry['input']['humidity'],
-                1.0 if entry['input']['door_status'] else 0.0,
-                entry['input']['air_quality'],
-                1.0 if entry['input']['presence'] else 0.0
-            ])
-            y.append([
-                1.0 if entry['output']['ventilation'] else 0.0,
-                1.0 if entry['output']['hvac'] else 0.0,
-                1.0 if entry['output']['lighting'] else 0.0,
-                1.0 if entry['output']['security'] else 0.0,
-                1.0 if entry['output']['energy_saving'] else 0.0
-            ])
-
-        # Convert to numpy arrays
-        X = np.array(X)
-        y = np.array(y)
+        sample_weight = None
+        if self.retention is not None:
+            X, y, sample_weight = self.retention.prepare(X, y, timestamps)
 
         # Train the model
         if len(X) > 0:
-            self.model.fit(X, y)
+            trainer = self.trainer
+            if trainer is not None:
+                model = trainer.fit(X, y, sample_weight)
+            else:
+                model = fit_tree(X, y, sample_weight)
+            self._publish(model, sample_count, end)
+
+    def _publish(self, model, sample_count, history_size=None):
+        """Make a fitted model the serving model
+
+        history_size is the number of buffer rows it was trained on, stored
+        with the snapshot when model_dir is set.
+        """
+        compiled = CompiledTree.from_estimator(model) if hasattr(model, 'tree_') else None
+        version = self.model_version + 1
+        trained_at = time.time()
+        self._serving = ServingModel(model, compiled, version, trained_at, sample_count)
+        self.model = model
+        self.model_version = version
+        if self.model_store is not None and compiled is not None and history_size is not None:
+            try:
+                self.model_store.save(compiled, version, history_size, trained_at)
+            except OSError:
+                # Still served from memory, just not warm-started after a restart
+                self.metrics.increment('snapshot_save_errors_total')
+        self.metrics.increment('model_publishes_total')
+        self.metrics.set_gauge('model_version', version)
+        self.metrics.set_gauge('model_sample_count', sample_count)
+
+    def _apply_retention(self):
+        """Drop expired history from the buffer and the store once enough has accumulated"""
+        if self.retention is None:
+            return
+        total = len(self.buffer)
+        start = self.retention.window_start(self.buffer.timestamps)
+        if not self.retention.should_compact(total, start):
+            return
+        self.buffer.drop_front(start)
+        self.history.drop_front(self._history_offset + start)
+        self._history_offset = 0
+        if self._online_offset is not None:
+            self._online_offset = max(0, self._online_offset - start)
+
+    def _update_online_model(self, X, y, timestamps, start, sample_count):
+        """Learn the buffer rows from start onwards (X, y, timestamps hold only those rows)"""
+        if not len(X):
+            return
+        current = _new_model('online') if self._online_offset is None else self.model
+        sample_weight = None
+        if self.retention is not None:
+            sample_weight = self.retention.sample_weights(timestamps)
+            if self.retention.deduplicate:
+                X, y, sample_weight = collapse_duplicates(X, y, sample_weight)
+        model = copy.deepcopy(current)
+        model.partial_fit(X, y, sample_weight=sample_weight)
+        self._online_offset = start + len(timestamps)
+        self._publish(model, sample_count)
 
     def get_learned_rules(self):
-        """Extract rules from the decision tree"""
-        if not hasattr(self.model, 'tree_'):
+        """Extract rules from the decision tree (or the online model's linear boundaries)"""
+        model = self.model
+        if isinstance(model, OnlineActionModel):
+            return model.get_rules(FEATURE_NAMES, ACTION_NAMES)
+        if not _is_fitted(model):
             return []
+        # A warm-started CompiledTree has the same node arrays as tree_
+        tree = model if isinstance(model, CompiledTree) else model.tree_
 
-        feature_names = ['Temperature', 'Humidity', 'Door Status', 'Air Quality', 'Presence']
-        action_names = ['Ventilation', 'HVAC', 'Lighting', 'Security', 'Energy Saving']
+        feature_names = FEATURE_NAMES
         rules = []
 
         def recurse(node, depth, path):
-            if self.model.tree_.feature[node] != -2:  # Not a leaf
-                feature = feature_names[self.model.tree_.feature[node]]
-                threshold = self.model.tree_.threshold[node]
+            if tree.feature[node] != -2:  # Not a leaf
+                feature = feature_names[tree.feature[node]]
+                threshold = tree.threshold[node]
                 rules.append(f"If {feature} <= {threshold:.1f}: {path}")
 
 
                 left_path = path + f" AND {feature} <= {threshold:.1f}"
                 right_path = path + f" AND {feature} > {threshold:.1f}"
 
-                recurse(self.model.tree_.children_left[node], depth + 1, left_path)
-                recurse(self.model.tree_.children_right[node], depth + 1, right_path)
+                recurse(tree.children_left[node], depth + 1, left_path)
+                recurse(tree.children_right[node], depth + 1, right_path)
 
         recurse(0, 0, "")
         return rules
@@ -0,0 +1,155 @@
+"""
+Asyncio Smart Home Pipeline
+Async counterparts of SensorManager, AIEngine and ActionExecutor so a single
+event loop can serve many homes and sensors without a thread per device.
+Blocking work (hardware reads, inference, history writes, device commands)
+is handed to executors.
+"""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .actions import Action, ActionExecutor
+from .ai_engine import AIEngine
+from .sensors import BaseSensor, SensorData, SensorManager
+
+
+async def read_sensor(sensor: BaseSensor, executor: Optional[Executor] = None) -> SensorData:
+    """Read a sensor natively if it has async_get_reading(), otherwise in an executor."""
+    async_reader = getattr(sensor, 'async_get_reading', None)
+    if async_reader is not None:
+        return await async_reader()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, sensor.get_reading)
+
+
+class AsyncSensorManager:
+    def __init__(self, sensor_manager: Optional[SensorManager] = None,
+                 executor: Optional[Executor] = None):
+        self.sensor_manager = sensor_manager or SensorManager()
+        self.executor = executor
+
+    def register_sensor(self, sensor: BaseSensor) -> None:
+        self.sensor_manager.register_sensor(sensor)
+
+    async def get_sensor_data(self, sensor_id: str) -> Optional[SensorData]:
+        sensor = self.sensor_manager.sensors.get(sensor_id)
+        if sensor is None:
+            return None
+        return await read_sensor(sensor, self.executor)
+
+    async def get_all_sensor_data(self) -> Dict[str, SensorData]:
+        """Read every registered sensor concurrently."""
+        sensors = list(self.sensor_manager.sensors.items())
+        readings = await asyncio.gather(*(read_sensor(sensor, self.executor) for _, sensor in sensors))
+        return {sensor_id: reading for (sensor_id, _), reading in zip(sensors, readings)}
+
+
+def _decide_cached(controller, sensor_dict: Dict):
+    """(actions, hit); hit means a decision cache served the reading and it isn't recorded again."""
+    decide_cached = getattr(controller, 'decide_cached', None)
+    if decide_cached is not None:
+        return decide_cached(sensor_dict)
+    return controller.decide(sensor_dict), False
+
+
+class AsyncAIEngine:
+    """Async wrapper around one home's AIEngine.
+
+    Inference runs in `executor` and the caller gets its actions as soon as
+    the decision is made; the history write is queued on `history_executor`
+    (single-threaded by default, so a home's history stays in order).
+    Readings for the same home are decided in arrival order, and the
+    wrapped engine's coalescing settings apply as they do synchronously.
+    """
+
+    def __init__(self, engine: Optional[AIEngine] = None, executor: Optional[Executor] = None,
+                 history_executor: Optional[Executor] = None):
+        """An engine or history_executor created here is shut down by aclose()."""
+        self._owns_engine = engine is None
+        self._owns_history_executor = history_executor is None
+        self.engine = engine or AIEngine()
+        self.executor = executor
+        self.history_executor = history_executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='history-writer')
+        self._lock = asyncio.Lock()
+        self._pending_writes = set()
+
+    async def process_sensor_data(self, sensor_data: SensorData) -> List[Action]:
+        """Decide on a reading; while coalescing, [] until the window closes."""
+        async with self._lock:
+            if self.engine.coalescing:
+                if not self.engine.add_pending(sensor_data):
+                    return []
+                self.engine.take_pending()
+                return await self._decide(self.engine.sensor_dict())
+            return await self._decide(self.engine.update_state(sensor_data))
+
+    async def process_readings(self, readings: List[SensorData]) -> List[Action]:
+        """Apply one time step's readings and run a single decision for them."""
+        async with self._lock:
+            for sensor_data in readings:
+                self.engine.update_state(sensor_data)
+            self.engine.take_pending()
+            return await self._decide(self.engine.sensor_dict())
+
+    async def flush_pending(self) -> List[Action]:
+        """Run the decision for coalesced updates still pending, if any."""
+        async with self._lock:
+            if not self.engine.take_pending():
+                return []
+            return await self._decide(self.engine.sensor_dict())
+
+    async def _decide(self, sensor_dict: Dict) -> List[Action]:
+        # Called with self._lock held, so decisions and their writes stay in order
+        loop = asyncio.get_running_loop()
+        controller = self.engine.ai_controller
+        system_actions, hit = await loop.run_in_executor(self.executor, _decide_cached,
+                                                         controller, sensor_dict)
+        if not hit:
+            self._queue_write(controller.record, sensor_dict, system_actions)
+        return self.engine.build_actions(system_actions)
+
+    def _queue_write(self, record, sensor_dict: Dict, system_actions: Dict) -> None:
+        loop = asyncio.get_running_loop()
+        write = loop.run_in_executor(self.history_executor, record, sensor_dict, system_actions)
+        self._pending_writes.add(write)
+        write.add_done_callback(self._pending_writes.discard)
+
+    async def flush(self) -> None:
+        """Wait for queued history writes to finish."""
+        if self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes))
+
+    async def aclose(self) -> None:
+        """Wait for queued history writes, then shut down what this wrapper created."""
+        await self.flush()
+        if self._owns_history_executor:
+            self.history_executor.shutdown(wait=True)
+        if self._owns_engine:
+            self.engine.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    def get_learned_rules(self):
+        return self.engine.get_learned_rules()
+
+
+class AsyncActionExecutor:
+    def __init__(self, executor: Optional[ActionExecutor] = None,
+                 thread_pool: Optional[Executor] = None):
+        self.executor = executor or ActionExecutor()
+        self.thread_pool = thread_pool
+
+    async def execute_action(self, action: Action) -> bool:
+        """Send one device command without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.thread_pool, self.executor.execute_action, action)
+
+    async def execute_actions(self, actions: List[Action]) -> List[bool]:
+        """Send commands for different devices concurrently."""
+        return list(await asyncio.gather(*(self.execute_action(action) for action in actions)))
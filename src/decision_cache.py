@@ -0,0 +1,73 @@
+"""
+Decision Cache
+Memoizes SmartHomeAI model predictions keyed on a quantized feature vector
+so a repeated (or nearly repeated) state skips inference and the history
+write. The explicit threshold rules are cheap and always evaluated on the
+exact reading, so quantization never changes what they decide. Entries are
+dropped whenever a new model version is published.
+"""
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+# Quantization step per feature: (temperature, humidity, door, air quality,
+# presence). Readings in the same step (floored, so the rule thresholds
+# 18/26 °C and AQI 90 fall on bucket edges) share one prediction.
+DEFAULT_RESOLUTION = (0.1, 1.0, 1.0, 0.5, 1.0)
+
+
+class DecisionCache:
+    def __init__(self, max_entries: Optional[int] = 1024,
+                 resolution: Sequence[float] = DEFAULT_RESOLUTION):
+        """max_entries bounds the cache (least recently used first out); None is unbounded."""
+        self.max_entries = max_entries
+        self.resolution = tuple(resolution)
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[int, ...], Tuple[bool, ...]]' = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def key(self, features: Sequence[float]) -> Tuple[int, ...]:
+        return tuple(math.floor(value / step) for value, step in zip(features, self.resolution))
+
+    def get(self, key: Tuple[int, ...], version: int) -> Optional[Tuple[bool, ...]]:
+        """Cached prediction for key under model `version`, or None on a miss."""
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            prediction = self._entries.get(key)
+            if prediction is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prediction
+
+    def put(self, key: Tuple[int, ...], version: int, prediction: Tuple[bool, ...]) -> None:
+        with self._lock:
+            # A decision made by a model that has since been replaced is stale
+            if version != self._version:
+                return
+            self._entries[key] = tuple(prediction)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hit_rate, 'size': len(self._entries)}
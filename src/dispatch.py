@@ -0,0 +1,126 @@
+"""
+Action Dispatch
+Sits between AIEngine and ActionExecutor. Keeps a table of the state each
+device was last commanded into and only sends a command when that state
+changes, instead of repeating it on every decision. HVAC modes are held
+inside hysteresis bands so temperatures hovering at a threshold don't make
+the actuator flap, and commands are batched to one per device per tick.
+"""
+import math
+import time
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+from .actions import Action, ActionExecutor
+from .metrics import NULL_METRICS
+
+DEVICE_FOR_ACTION = {
+    "ACTIVATE_COOLING": "hvac",
+    "ACTIVATE_HEATING": "hvac",
+    "ACTIVATE_DEHUMIDIFIER": "humidity",
+    "ACTIVATE_HUMIDIFIER": "humidity",
+    "ACTIVATE_VENTILATION": "ventilation",
+    "ADJUST_ENVIRONMENT": "environment",
+    "ENERGY_SAVING": "environment",
+    "DOOR_NOTIFICATION": "security"
+}
+
+
+class HysteresisBand(NamedTuple):
+    engage: float   # temperature at which the rules ask for the mode
+    release: float  # once running, the mode is held until the temperature gets back past this
+
+
+# Cooling is asked for from 26 °C and held down to 24 °C; heating below 18 °C is held up to 20 °C
+HVAC_BANDS = {
+    "ACTIVATE_COOLING": HysteresisBand(26.0, 24.0),
+    "ACTIVATE_HEATING": HysteresisBand(18.0, 20.0)
+}
+
+
+class DeviceState(NamedTuple):
+    action_type: str
+    parameters: Mapping
+    expires_at: float   # commands with a duration_minutes lapse and are re-sent if still wanted
+
+
+def device_for(action: Action) -> str:
+    return DEVICE_FOR_ACTION.get(action.action_type, action.action_type)
+
+
+class ActionDispatcher:
+    def __init__(self, executor: Optional[ActionExecutor] = None, clock=time.monotonic,
+                 bands: Mapping[str, HysteresisBand] = HVAC_BANDS, metrics=None):
+        self.executor = executor or ActionExecutor()
+        self.clock = clock
+        self.bands = bands
+        self.metrics = metrics or NULL_METRICS
+        self.desired: Dict[str, DeviceState] = {}
+        self._pending: Dict[str, Action] = {}
+        self.sent = 0
+        self.suppressed = 0
+
+    def submit(self, actions: List[Action]) -> None:
+        """Queue one decision's actions for the current tick.
+
+        Within a decision the most urgent action per device wins; a later
+        decision in the same tick replaces an earlier one's.
+        """
+        decided: Dict[str, Action] = {}
+        for action in actions:
+            device = device_for(action)
+            current = decided.get(device)
+            if current is None or action.priority < current.priority:
+                decided[device] = action
+        self._pending.update(decided)
+
+    def flush(self, temperature: Optional[float] = None, now: Optional[float] = None) -> List[Action]:
+        """Send the tick's commands, one per device whose state changes; returns them.
+
+        Devices nothing asked for this tick are released, except an HVAC mode
+        still inside its hysteresis band at `temperature`.
+        """
+        now = self.clock() if now is None else now
+        pending, self._pending = self._pending, {}
+
+        for device in list(self.desired):
+            if device not in pending and not self._held(self.desired[device], temperature, now):
+                del self.desired[device]
+
+        sent = []
+        for device, action in pending.items():
+            state = self.desired.get(device)
+            if (state is not None and now < state.expires_at and state.action_type == action.action_type
+                    and state.parameters == action.parameters):
+                self.suppressed += 1
+                self.metrics.increment('actions_suppressed_total', device=device)
+                continue
+            if self.executor.execute_action(action):
+                duration = action.parameters.get('duration_minutes')
+                expires_at = math.inf if duration is None else now + duration * 60
+                self.desired[device] = DeviceState(action.action_type, action.parameters, expires_at)
+                self.sent += 1
+                self.metrics.increment('commands_total', device=device)
+                sent.append(action)
+            else:
+                # Unknown state after a failed command: retry next tick
+                self.desired.pop(device, None)
+        return sent
+
+    def dispatch(self, actions: List[Action], temperature: Optional[float] = None,
+                 now: Optional[float] = None) -> List[Action]:
+        """submit() and flush() in one call, for a tick of a single decision."""
+        self.submit(actions)
+        return self.flush(temperature, now)
+
+    def _held(self, state: DeviceState, temperature: Optional[float], now: float) -> bool:
+        band = self.bands.get(state.action_type)
+        if band is None or temperature is None or now >= state.expires_at:
+            return False
+        if band.engage > band.release:
+            return temperature > band.release
+        return temperature < band.release
+
+    def reset(self) -> None:
+        """Forget every device's state so the next tick re-sends all commands."""
+        self.desired.clear()
+        self._pending.clear()
@@ -0,0 +1,293 @@
+"""
+Smart Home History Storage
+Persists the sensor input / action output history used to train the AI model.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Column order of the model inputs and outputs stored in each history entry
+FEATURE_KEYS = ('temperature', 'humidity', 'door_status', 'air_quality', 'presence')
+ACTION_KEYS = ('ventilation', 'hvac', 'lighting', 'security', 'energy_saving')
+
+
+def rows_to_entries(features: Iterable, actions: Iterable, timestamps: Iterable) -> List[Dict]:
+    """History entries from feature rows, action rows and epoch timestamps."""
+    return [
+        {
+            'timestamp': ts,
+            'input': {'temperature': row[0], 'humidity': row[1], 'door_status': bool(row[2]),
+                      'air_quality': row[3], 'presence': bool(row[4])},
+            'output': {key: bool(value) for key, value in zip(ACTION_KEYS, out)}
+        }
+        for ts, row, out in zip(timestamps, features, actions)
+    ]
+
+
+class SyncPolicy(Enum):
+    ALWAYS = "always"  # flush and fsync after every append
+    BATCH = "batch"    # flush and fsync every batch_size appends or batch_interval seconds (checked on write)
+    NONE = "none"      # leave buffering to Python/the OS, flush on read and close
+
+
+class HistoryStore:
+    """Base interface for history backends."""
+
+    def append(self, entry: Dict) -> None:
+        raise NotImplementedError("Subclasses must implement append()")
+
+    def extend(self, entries: Iterable[Dict]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Stream stored entries in insertion order."""
+        raise NotImplementedError("Subclasses must implement iter_entries()")
+
+    def iter_from(self, offset: int) -> Iterator[Dict]:
+        """Stream entries from position offset onwards."""
+        return itertools.islice(self.iter_entries(), offset, None)
+
+    def load(self) -> List[Dict]:
+        return list(self.iter_entries())
+
+    def replace(self, entries: Iterable[Dict]) -> None:
+        """Replace the whole history with the given entries."""
+        raise NotImplementedError("Subclasses must implement replace()")
+
+    def drop_front(self, count: int) -> None:
+        """Delete the oldest count entries."""
+        self.replace(self.iter_from(count))
+
+    def window_offset(self, max_samples: Optional[int] = None,
+                      max_age_seconds: Optional[float] = None) -> Optional[int]:
+        """Position of the first entry inside a retention window, or None if the
+        store can't tell without reading everything."""
+        return None
+
+    def import_json(self, json_path: str) -> int:
+        """Append the entries of a legacy sensor_history.json file; returns the count imported.
+
+        Legacy entries carry no timestamp, so they are stamped with the
+        file's modification time.
+        """
+        entries = JSONHistoryStore(json_path).load()
+        mtime = os.path.getmtime(json_path)
+        for entry in entries:
+            entry.setdefault('timestamp', mtime)
+        self.extend(entries)
+        self.flush()
+        return len(entries)
+
+    def flush(self) -> None:
+        pass
+
+    def release(self) -> None:
+        """Give back OS resources (open files) until the store is next used."""
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        raise NotImplementedError("Subclasses must implement __len__()")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONHistoryStore(HistoryStore):
+    """Legacy format: the whole history as one JSON array, rewritten on every append."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._size = len(self.load())
+
+    def append(self, entry: Dict) -> None:
+        self.extend([entry])
+
+    def extend(self, entries: Iterable[Dict]) -> None:
+        history = self.load()
+        history.extend(entries)
+        self.replace(history)
+
+    def iter_entries(self) -> Iterator[Dict]:
+        return iter(self.load())
+
+    def load(self) -> List[Dict]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return []
+
+    def replace(self, entries: Iterable[Dict]) -> None:
+        history = list(entries)
+        with open(self.path, 'w') as f:
+            json.dump(history, f)
+        self._size = len(history)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class JSONLinesHistoryStore(HistoryStore):
+    """Append-only JSON Lines log: one entry per line, O(1) appends.
+
+    The append handle is opened on the first write and can be closed again
+    with release(), so many idle stores don't each hold a file descriptor.
+    Under SyncPolicy.BATCH, batch_interval is checked when an entry is
+    written: after a burst followed by silence the tail stays buffered until
+    the next write, read, flush() or close().
+    """
+
+    def __init__(self, path: str, sync_policy: SyncPolicy = SyncPolicy.BATCH,
+                 batch_size: int = 100, batch_interval: float = 1.0):
+        self.path = path
+        self.sync_policy = SyncPolicy(sync_policy)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        # Reentrant: replace() holds it while reading entries that may come from this store
+        self._lock = threading.RLock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._size = self._recover()
+        self._file = None
+
+    def _recover(self) -> int:
+        """Count complete lines, dropping a trailing partial write left by a crash."""
+        if not os.path.exists(self.path):
+            return 0
+        count = 0
+        last_newline = -1
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                count += chunk.count(b'\n')
+                pos = chunk.rfind(b'\n')
+                if pos != -1:
+                    last_newline = offset + pos
+                offset += len(chunk)
+        if last_newline + 1 != offset:
+            with open(self.path, 'r+b') as f:
+                f.truncate(last_newline + 1)
+        return count
+
+    @staticmethod
+    def _encode(entry: Dict) -> bytes:
+        return json.dumps(entry, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    def _handle(self):
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        return self._file
+
+    def append(self, entry: Dict) -> None:
+        line = self._encode(entry)
+        with self._lock:
+            self._handle().write(line)
+            self._size += 1
+            self._unsynced += 1
+            self._maybe_sync()
+
+    def extend(self, entries: Iterable[Dict]) -> None:
+        data = b''.join(self._encode(entry) for entry in entries)
+        with self._lock:
+            self._handle().write(data)
+            written = data.count(b'\n')
+            self._size += written
+            self._unsynced += written
+            self._maybe_sync()
+
+    def _maybe_sync(self) -> None:
+        if self.sync_policy is SyncPolicy.ALWAYS:
+            self._sync()
+        elif self.sync_policy is SyncPolicy.BATCH:
+            if (self._unsynced >= self.batch_size
+                    or time.monotonic() - self._last_sync >= self.batch_interval):
+                self._sync()
+
+    def _sync(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.sync_policy is not SyncPolicy.NONE:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def iter_entries(self) -> Iterator[Dict]:
+        # Make buffered appends visible to the reader before streaming
+        self.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def replace(self, entries: Iterable[Dict]) -> None:
+        tmp_path = self.path + '.tmp'
+        count = 0
+        # Held from reading the entries to the rename, so no append in between is lost
+        with self._lock:
+            with open(tmp_path, 'wb') as f:
+                for entry in entries:
+                    f.write(self._encode(entry))
+                    count += 1
+                f.flush()
+                os.fsync(f.fileno())
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.replace(tmp_path, self.path)
+            self._size = count
+            self._unsynced = 0
+
+    def close(self) -> None:
+        self.release()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def open_history_store(path: str, import_from: Optional[str] = None, **kwargs) -> HistoryStore:
+    """Open the store matching the file extension (.jsonl, .db/.sqlite or legacy .json).
+
+    When a new JSON Lines or SQLite store is created and import_from points
+    at an existing legacy JSON history, its entries are imported once.
+    """
+    is_new = not os.path.exists(path)
+    if path.endswith(SQLITE_EXTENSIONS):
+        from .sqlite_history import SQLiteHistoryStore
+        store = SQLiteHistoryStore(path, **kwargs)
+    elif path.endswith('.jsonl'):
+        store = JSONLinesHistoryStore(path, **kwargs)
+    else:
+        return JSONHistoryStore(path)
+    if is_new and import_from and os.path.exists(import_from):
+        store.import_json(import_from)
+    return store
@@ -0,0 +1,179 @@
+"""
+Columnar History Buffer
+Keeps the model's training data as preallocated NumPy arrays so training can
+use zero-copy views instead of rebuilding lists from history dicts.
+"""
+import os
+import time
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .history import ACTION_KEYS, FEATURE_KEYS
+
+N_FEATURES = len(FEATURE_KEYS)
+N_ACTIONS = len(ACTION_KEYS)
+
+
+def entry_to_row(entry: Dict):
+    """Convert a history entry to (features, labels, timestamp); undated entries get the current time."""
+    inputs = entry['input']
+    outputs = entry['output']
+    features = tuple(float(inputs[key]) for key in FEATURE_KEYS)
+    labels = tuple(1 if outputs[key] else 0 for key in ACTION_KEYS)
+    return features, labels, entry.get('timestamp', time.time())
+
+
+def load_buffer_arrays(path: str, end: int, mmap_mode: str = 'r'):
+    """Map the first `end` rows of a buffer directory read-only, e.g. from another process."""
+    return tuple(
+        np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)[:end]
+        for name in ('features', 'labels', 'timestamps')
+    )
+
+
+class HistoryBuffer:
+    """Growable float32 feature / uint8 label arrays, optionally memory-mapped.
+
+    A float64 timestamp column (epoch seconds) backs the retention policies.
+    With a path, the arrays live in features.npy, labels.npy, timestamps.npy
+    and size.npy inside that directory and are reopened in place on restart.
+    """
+
+    def __init__(self, capacity: int = 1024, path: Optional[str] = None):
+        self.path = path
+        if path is None:
+            self._features = np.zeros((capacity, N_FEATURES), dtype=np.float32)
+            self._labels = np.zeros((capacity, N_ACTIONS), dtype=np.uint8)
+            self._timestamps = np.zeros(capacity, dtype=np.float64)
+            self._size_cell = np.zeros(1, dtype=np.int64)
+        else:
+            os.makedirs(path, exist_ok=True)
+            size_file = os.path.join(path, 'size.npy')
+            if os.path.exists(size_file):
+                self._features = np.load(self._file('features'), mmap_mode='r+')
+                self._labels = np.load(self._file('labels'), mmap_mode='r+')
+                self._size_cell = np.load(size_file, mmap_mode='r+')
+                if os.path.exists(self._file('timestamps')):
+                    self._timestamps = np.load(self._file('timestamps'), mmap_mode='r+')
+                else:
+                    # Buffer written before timestamps were tracked
+                    self._timestamps = self._create_map('timestamps', (self.capacity,), np.float64)
+            else:
+                self._features = self._create_map('features', (capacity, N_FEATURES), np.float32)
+                self._labels = self._create_map('labels', (capacity, N_ACTIONS), np.uint8)
+                self._timestamps = self._create_map('timestamps', (capacity,), np.float64)
+                self._size_cell = self._create_map('size', (1,), np.int64)
+        self._size = int(self._size_cell[0])
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name + '.npy')
+
+    def _create_map(self, name: str, shape, dtype):
+        return np.lib.format.open_memmap(self._file(name), mode='w+', dtype=dtype, shape=shape)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._features.shape[0]
+
+    @property
+    def features(self) -> np.ndarray:
+        """View of the filled feature rows (no copy)."""
+        return self._features[:self._size]
+
+    @property
+    def labels(self) -> np.ndarray:
+        """View of the filled label rows (no copy)."""
+        return self._labels[:self._size]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """View of the filled timestamps (no copy)."""
+        return self._timestamps[:self._size]
+
+    def snapshot(self, start: int = 0):
+        """Copies of the filled rows from start, safe to use while appends continue."""
+        end = self._size
+        return (self._features[start:end].copy(), self._labels[start:end].copy(),
+                self._timestamps[start:end].copy())
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._features = self._resized('features', self._features, capacity)
+        self._labels = self._resized('labels', self._labels, capacity)
+        self._timestamps = self._resized('timestamps', self._timestamps, capacity)
+
+    def _resized(self, name: str, array: np.ndarray, capacity: int) -> np.ndarray:
+        shape = (capacity,) + array.shape[1:]
+        if self.path is None:
+            grown = np.zeros(shape, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+        tmp_name = name + '.grow'
+        grown = self._create_map(tmp_name, shape, array.dtype)
+        grown[:self._size] = array[:self._size]
+        grown.flush()
+        os.replace(self._file(tmp_name), self._file(name))
+        return grown
+
+    def _set_size(self, size: int) -> None:
+        self._size = size
+        self._size_cell[0] = size
+
+    def append(self, features: Sequence[float], labels: Sequence[int],
+               timestamp: Optional[float] = None) -> None:
+        """Write one row in place, growing the arrays when full."""
+        n = self._size
+        if n == self.capacity:
+            self._grow(n + 1)
+        self._features[n] = features
+        self._labels[n] = labels
+        self._timestamps[n] = time.time() if timestamp is None else timestamp
+        self._set_size(n + 1)
+
+    def append_entry(self, entry: Dict) -> None:
+        self.append(*entry_to_row(entry))
+
+    def extend(self, features: np.ndarray, labels: np.ndarray,
+               timestamps: Optional[np.ndarray] = None) -> None:
+        """Append many rows from (n, 5) arrays."""
+        count = len(features)
+        n = self._size
+        self._grow(n + count)
+        self._features[n:n + count] = features
+        self._labels[n:n + count] = labels
+        self._timestamps[n:n + count] = time.time() if timestamps is None else timestamps
+        self._set_size(n + count)
+
+    def drop_front(self, count: int) -> None:
+        """Discard the oldest rows, shifting the rest down in place."""
+        count = min(count, self._size)
+        if count <= 0:
+            return
+        remaining = self._size - count
+        self._features[:remaining] = self._features[count:self._size]
+        self._labels[:remaining] = self._labels[count:self._size]
+        self._timestamps[:remaining] = self._timestamps[count:self._size]
+        self._set_size(remaining)
+
+    def extend_entries(self, entries: Iterable[Dict]) -> None:
+        for entry in entries:
+            self.append_entry(entry)
+
+    def clear(self) -> None:
+        self._set_size(0)
+
+    def flush(self) -> None:
+        """Write memory-mapped pages back to disk."""
+        if self.path is not None:
+            self._features.flush()
+            self._labels.flush()
+            self._timestamps.flush()
+            self._size_cell.flush()
@@ -0,0 +1,162 @@
+"""
+Metrics
+Pluggable sink for hot-path instrumentation: timing histograms, counters and
+gauges. NullMetrics is the default and callers skip timing entirely when a
+sink isn't enabled; InMemoryMetrics aggregates in process and can be
+rendered in the Prometheus text exposition format.
+"""
+import bisect
+import math
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+# Upper bounds (seconds) of the timing histogram buckets, 10us to 10s
+DEFAULT_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+                   1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class NullMetrics:
+    """Discards everything; `enabled` lets callers skip measuring altogether."""
+    enabled = False
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        pass
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        pass
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the q-quantile (inf past the last bucket)."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+
+class InMemoryMetrics(NullMetrics):
+    enabled = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bucket_bounds = tuple(buckets)
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.gauges: Dict[Tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.bucket_bounds)
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self.gauges[(name, _labels(labels))] = value
+
+    def counter(self, name: str, **labels) -> float:
+        return self.counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self.histograms.get((name, _labels(labels)))
+
+    def snapshot(self) -> Dict:
+        """Plain-dict view: counts, sums and approximate p50/p99 per histogram."""
+        with self._lock:
+            return {
+                'counters': {_series(name, labels): value
+                             for (name, labels), value in self.counters.items()},
+                'gauges': {_series(name, labels): value
+                           for (name, labels), value in self.gauges.items()},
+                'histograms': {
+                    _series(name, labels): {'count': h.count, 'sum': h.sum,
+                                            'p50': h.quantile(0.5), 'p99': h.quantile(0.99)}
+                    for (name, labels), h in self.histograms.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = 'smart_home_') -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, series in (('counter', self.counters), ('gauge', self.gauges)):
+                for name in sorted({name for name, _ in series}):
+                    lines.append(f"# TYPE {prefix}{name} {kind}")
+                    for (series_name, labels), value in sorted(series.items()):
+                        if series_name == name:
+                            lines.append(f"{_series(prefix + name, labels)} {value:g}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for (series_name, labels), h in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if series_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(h.buckets + (math.inf,), h.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == math.inf else f"{bound:g}"
+                        lines.append(f"{_series(prefix + name + '_bucket', labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{_series(prefix + name + '_sum', labels)} {h.sum:g}")
+                    lines.append(f"{_series(prefix + name + '_count', labels)} {h.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _series(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    rendered = ','.join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+class TimedLock:
+    """Acquires `lock` recording the wait as lock_wait_seconds{lock=name}."""
+
+    def __init__(self, lock, metrics, name: str):
+        self.lock = lock
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        start = time.perf_counter()
+        self.lock.acquire()
+        self.metrics.observe('lock_wait_seconds', time.perf_counter() - start, lock=self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.lock.release()
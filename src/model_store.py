@@ -0,0 +1,129 @@
+"""
+Model Snapshots
+Versioned on-disk snapshots of the compiled decision tree so a restarted
+SmartHomeAI serves its last model immediately instead of refitting on the
+whole history. Each snapshot is an .npz of the flat tree arrays plus JSON
+metadata; a schema hash of the feature/action layout guards against loading
+a model trained on different inputs.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .history import ACTION_KEYS, FEATURE_KEYS
+from .metrics import NULL_METRICS
+from .tree_compiler import CompiledTree
+
+SNAPSHOT_FORMAT = 1
+# Booleans (door_status, presence) are encoded as 0.0/1.0 features
+FEATURE_ENCODING = 'float:temperature,humidity,air_quality;bool01:door_status,presence'
+SNAPSHOT_PATTERN = re.compile(r'model-(\d+)\.npz$')
+
+
+def schema_hash(feature_keys=FEATURE_KEYS, action_keys=ACTION_KEYS) -> str:
+    """Fingerprint of the model's input/output layout."""
+    layout = json.dumps({'features': list(feature_keys), 'actions': list(action_keys),
+                         'encoding': FEATURE_ENCODING, 'format': SNAPSHOT_FORMAT})
+    return hashlib.sha256(layout.encode('utf-8')).hexdigest()[:16]
+
+
+class Snapshot(NamedTuple):
+    compiled: CompiledTree
+    version: int
+    trained_at: float
+    history_size: int     # history rows the model was trained on
+    path: str
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class ModelStore:
+    def __init__(self, directory: str, keep: int = 3, metrics=None):
+        """Snapshots live in directory as model-<version>.npz; the newest `keep` are kept."""
+        self.directory = directory
+        self.keep = keep
+        self.metrics = metrics or NULL_METRICS
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, version: int) -> str:
+        return os.path.join(self.directory, f'model-{version:08d}.npz')
+
+    def versions(self):
+        found = []
+        for path in glob.glob(os.path.join(self.directory, 'model-*.npz')):
+            match = SNAPSHOT_PATTERN.search(path)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def save(self, compiled: CompiledTree, version: int, history_size: int,
+             trained_at: Optional[float] = None) -> str:
+        """Write a snapshot atomically and prune old ones; returns its path."""
+        metadata = {
+            'format': SNAPSHOT_FORMAT,
+            'schema_hash': schema_hash(),
+            'version': version,
+            'trained_at': time.time() if trained_at is None else trained_at,
+            'history_size': history_size,
+        }
+        path = self._path(version)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f,
+                     feature=np.asarray(compiled.feature, dtype=np.int64),
+                     threshold=np.asarray(compiled.threshold, dtype=np.float64),
+                     children_left=np.asarray(compiled.children_left, dtype=np.int64),
+                     children_right=np.asarray(compiled.children_right, dtype=np.int64),
+                     leaf_values=compiled.leaf_values,
+                     max_depth=np.int64(compiled.max_depth),
+                     metadata=np.array(json.dumps(metadata)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        for version in self.versions()[:-self.keep]:
+            try:
+                os.remove(self._path(version))
+            except OSError:
+                pass
+
+    def load(self, path: str) -> Snapshot:
+        """Load and validate one snapshot; raises SnapshotError if it can't be used."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metadata = json.loads(str(data['metadata']))
+                arrays = {key: data[key] for key in ('feature', 'threshold', 'children_left',
+                                                     'children_right', 'leaf_values', 'max_depth')}
+        except (OSError, KeyError, ValueError) as e:
+            raise SnapshotError(f"Unreadable model snapshot {path}: {e}")
+        if metadata.get('format') != SNAPSHOT_FORMAT or metadata.get('schema_hash') != schema_hash():
+            raise SnapshotError(f"Model snapshot {path} doesn't match the current feature layout")
+        leaf_values = arrays['leaf_values']
+        if (leaf_values.ndim != 2 or leaf_values.shape[1] != len(ACTION_KEYS)
+                or arrays['feature'].max(initial=-1) >= len(FEATURE_KEYS)):
+            raise SnapshotError(f"Model snapshot {path} has inconsistent tree arrays")
+        compiled = CompiledTree(arrays['feature'].tolist(), arrays['threshold'].tolist(),
+                                arrays['children_left'].tolist(), arrays['children_right'].tolist(),
+                                leaf_values, int(arrays['max_depth']))
+        return Snapshot(compiled, int(metadata['version']), float(metadata['trained_at']),
+                        int(metadata['history_size']), path)
+
+    def load_latest(self) -> Optional[Snapshot]:
+        """The newest usable snapshot, skipping (and counting) unusable ones."""
+        for version in reversed(self.versions()):
+            try:
+                return self.load(self._path(version))
+            except SnapshotError:
+                self.metrics.increment('snapshots_rejected_total')
+        return None
@@ -0,0 +1,237 @@
+"""
+Multi-Home Engine
+Serves many homes from one process: sensor state, history and models are
+kept per home ID, retrains for every home go through one shared worker pool
+instead of a training thread per controller, and idle homes can be evicted
+from memory (their history stays on disk and is reloaded on next use).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .ai_engine import Action, AIEngine
+from .ai_model import SmartHomeAI
+from .sensors import SensorData
+
+# Loaded homes whose history files are kept open; the rest reopen on their next write
+DEFAULT_MAX_OPEN_HISTORIES = 256
+
+
+class MultiHomeEngine:
+    def __init__(self, base_dir: str, max_loaded_homes: Optional[int] = None,
+                 idle_seconds: Optional[float] = None, training_workers: int = 1,
+                 trainer=None, clock: Callable[[], float] = time.monotonic,
+                 snapshot_models: bool = True,
+                 max_open_histories: Optional[int] = DEFAULT_MAX_OPEN_HISTORIES, **ai_kwargs):
+        """Create the engine.
+
+        Each home's history lives in base_dir/<home_id>/history.jsonl.
+        max_loaded_homes keeps at most that many homes in memory, evicting
+        the least recently used; idle_seconds lets evict_idle() drop homes
+        that haven't seen a reading for that long. Retrains run on a pool of
+        training_workers threads; trainer (e.g. a ProcessTrainingWorker) is
+        shared by every home to fit out of process. With snapshot_models each
+        home's model is also saved under base_dir/<home_id>/models, so a
+        home reloaded after eviction serves its last model at once.
+        max_open_histories bounds the open history file handles: beyond it
+        the least recently used loaded homes release theirs, so thousands of
+        loaded homes fit under the usual open-file limit. Other keyword
+        arguments are passed to each home's SmartHomeAI.
+        """
+        self.base_dir = base_dir
+        self.max_loaded_homes = max_loaded_homes
+        self.idle_seconds = idle_seconds
+        self.trainer = trainer
+        self.snapshot_models = snapshot_models
+        self.max_open_histories = max_open_histories
+        self.ai_kwargs = ai_kwargs
+        self._clock = clock
+        self._homes: 'OrderedDict[str, AIEngine]' = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._open_histories: 'OrderedDict[str, None]' = OrderedDict()
+        self._training: set = set()
+        # Homes in use by a caller (pin counts) are never evicted
+        self._pins: Dict[str, int] = {}
+        # Homes being loaded outside _lock; other callers for the same home wait on the event
+        self._loading: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=training_workers,
+                                        thread_name_prefix='home-trainer')
+
+    def _home_dir(self, home_id: str) -> str:
+        if not home_id or home_id in ('.', '..') or os.sep in home_id or '/' in home_id:
+            raise ValueError(f"Invalid home ID {home_id!r}")
+        return os.path.join(self.base_dir, home_id)
+
+    def _load(self, home_id: str) -> AIEngine:
+        home_dir = self._home_dir(home_id)
+        os.makedirs(home_dir, exist_ok=True)
+        model_dir = os.path.join(home_dir, 'models') if self.snapshot_models else None
+        ai = SmartHomeAI(history_file=os.path.join(home_dir, 'history.jsonl'),
+                         trainer=self.trainer, model_dir=model_dir, **self.ai_kwargs)
+        ai.on_retrain_due = lambda: self._schedule_training(home_id, ai)
+        return AIEngine(ai_controller=ai)
+
+    def home(self, home_id: str) -> AIEngine:
+        """The engine for home_id, loading it (and evicting others) if needed.
+
+        The engine isn't pinned: another home's load can evict it. Use
+        using() to keep it loaded while working with it.
+        """
+        with self.using(home_id) as engine:
+            return engine
+
+    @contextmanager
+    def using(self, home_id: str) -> Iterator[AIEngine]:
+        """The engine for home_id, kept loaded until the block exits."""
+        engine = self._pin(home_id)
+        try:
+            yield engine
+        finally:
+            self._unpin(home_id)
+
+    def _pin(self, home_id: str) -> AIEngine:
+        while True:
+            with self._lock:
+                engine = self._homes.get(home_id)
+                if engine is not None:
+                    self._homes.move_to_end(home_id)
+                    return self._pinned(home_id, engine)
+                loading = self._loading.get(home_id)
+                if loading is None:
+                    loading = self._loading[home_id] = threading.Event()
+                    break
+            # Another thread is loading this home
+            loading.wait()
+
+        # File reads, legacy imports and warm starts don't hold up other homes
+        try:
+            engine = self._load(home_id)
+        except BaseException:
+            with self._lock:
+                del self._loading[home_id]
+            loading.set()
+            raise
+        with self._lock:
+            self._homes[home_id] = engine
+            del self._loading[home_id]
+            engine = self._pinned(home_id, engine)
+            self._evict_over_capacity()
+        loading.set()
+        return engine
+
+    def _pinned(self, home_id: str, engine: AIEngine) -> AIEngine:
+        self._pins[home_id] = self._pins.get(home_id, 0) + 1
+        self._last_used[home_id] = self._clock()
+        self._release_histories(home_id)
+        return engine
+
+    def _unpin(self, home_id: str) -> None:
+        with self._lock:
+            pins = self._pins[home_id] - 1
+            if pins:
+                self._pins[home_id] = pins
+            else:
+                del self._pins[home_id]
+            if home_id in self._homes:
+                # The home just wrote, so its history is open again
+                self._release_histories(home_id)
+                self._evict_over_capacity()
+
+    def _release_histories(self, home_id: str) -> None:
+        """Mark home_id's history as in use and close the least recently used ones over the bound."""
+        if self.max_open_histories is None:
+            return
+        self._open_histories[home_id] = None
+        self._open_histories.move_to_end(home_id)
+        while len(self._open_histories) > self.max_open_histories:
+            released, _ = self._open_histories.popitem(last=False)
+            engine = self._homes.get(released)
+            if engine is not None:
+                ai = engine.ai_controller
+                with ai.history_lock:
+                    ai.history.release()
+
+    def process_sensor_data(self, home_id: str, sensor_data: SensorData) -> List[Action]:
+        with self.using(home_id) as engine:
+            return engine.process_sensor_data(sensor_data)
+
+    def process_readings(self, home_id: str, readings: Iterable[SensorData]) -> List[Action]:
+        """Apply one time step's readings for a home and run a single decision."""
+        with self.using(home_id) as engine:
+            return engine.process_readings(readings)
+
+    def get_learned_rules(self, home_id: str):
+        with self.using(home_id) as engine:
+            return engine.get_learned_rules()
+
+    @property
+    def loaded_homes(self) -> List[str]:
+        return list(self._homes)
+
+    def _schedule_training(self, home_id: str, ai: SmartHomeAI) -> None:
+        # One queued fit per home; more readings arriving meanwhile are
+        # picked up by that fit's snapshot or the next one
+        with self._lock:
+            if home_id in self._training:
+                return
+            self._training.add(home_id)
+        self._pool.submit(self._train, home_id, ai)
+
+    def _train(self, home_id: str, ai: SmartHomeAI) -> None:
+        try:
+            ai.train_model()
+        except Exception:
+            ai.metrics.increment('retrain_errors_total', home=home_id)
+        finally:
+            with self._lock:
+                self._training.discard(home_id)
+                # Homes kept loaded only because of this fit can go now
+                self._evict_over_capacity()
+
+    def evict(self, home_id: str) -> bool:
+        """Drop a home's model and state from memory, flushing its history."""
+        with self._lock:
+            return self._evict(home_id)
+
+    def _evict(self, home_id: str) -> bool:
+        # A home in use, or with a fit in flight, stays until it's done
+        if home_id in self._pins or home_id in self._training or home_id not in self._homes:
+            return False
+        engine = self._homes.pop(home_id)
+        self._last_used.pop(home_id, None)
+        self._open_histories.pop(home_id, None)
+        engine.ai_controller.close()
+        return True
+
+    def _evict_over_capacity(self) -> None:
+        if self.max_loaded_homes is None:
+            return
+        # Never the most recently used home, which the caller is about to use
+        for home_id in list(self._homes)[:-1]:
+            if len(self._homes) <= self.max_loaded_homes:
+                break
+            self._evict(home_id)
+
+    def evict_idle(self) -> List[str]:
+        """Evict homes idle for longer than idle_seconds; returns their IDs."""
+        if self.idle_seconds is None:
+            return []
+        with self._lock:
+            cutoff = self._clock() - self.idle_seconds
+            idle = [home_id for home_id, used in self._last_used.items() if used <= cutoff]
+            return [home_id for home_id in idle if self._evict(home_id)]
+
+    def close(self) -> None:
+        """Wait for queued fits and flush every loaded home."""
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            for engine in self._homes.values():
+                engine.ai_controller.close()
+            self._homes.clear()
+            self._last_used.clear()
+            self._open_histories.clear()
@@ -0,0 +1,68 @@
+"""
+Online Action Model
+Incremental alternative to the decision tree: one logistic-regression
+classifier per action, updated with partial_fit so each retrain only costs
+the samples added since the previous one.
+"""
+from typing import List, Sequence
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+# Fixed scaling keeps coefficients comparable across updates without a
+# running normalizer: (temperature, humidity, door, air quality, presence)
+FEATURE_CENTER = np.array([22.0, 50.0, 0.5, 90.0, 0.5])
+FEATURE_SCALE = np.array([5.0, 20.0, 0.5, 10.0, 0.5])
+
+# Coefficients smaller than this (in scaled units) are left out of rules
+RULE_COEF_EPSILON = 1e-3
+
+
+class OnlineActionModel:
+    def __init__(self, n_actions: int = 5, random_state: int = 42):
+        self.classifiers = [
+            SGDClassifier(loss='log_loss', random_state=random_state)
+            for _ in range(n_actions)
+        ]
+        self.n_samples_seen = 0
+
+    def is_fitted(self) -> bool:
+        return self.n_samples_seen > 0
+
+    def _scale(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - FEATURE_CENTER) / FEATURE_SCALE
+
+    def partial_fit(self, X, y, sample_weight=None) -> None:
+        """Update every action classifier with a batch of new samples."""
+        if len(X) == 0:
+            return
+        X_scaled = self._scale(X)
+        y = np.asarray(y)
+        for i, clf in enumerate(self.classifiers):
+            clf.partial_fit(X_scaled, y[:, i], classes=[0, 1], sample_weight=sample_weight)
+        self.n_samples_seen += len(X)
+
+    def predict(self, X) -> np.ndarray:
+        """Return an (n_samples, n_actions) array of 0/1 predictions."""
+        X_scaled = self._scale(X)
+        return np.column_stack([clf.predict(X_scaled) for clf in self.classifiers])
+
+    def get_rules(self, feature_names: Sequence[str], action_names: Sequence[str]) -> List[str]:
+        """Describe each action's decision boundary in original sensor units."""
+        if not self.is_fitted():
+            return []
+        rules = []
+        for name, clf in zip(action_names, self.classifiers):
+            coef = clf.coef_[0] / FEATURE_SCALE
+            threshold = float(np.dot(clf.coef_[0], FEATURE_CENTER / FEATURE_SCALE) - clf.intercept_[0])
+            terms = [
+                f"{weight:+.2f}*{feature}"
+                for feature, weight, raw in zip(feature_names, coef, clf.coef_[0])
+                if abs(raw) > RULE_COEF_EPSILON
+            ]
+            if not terms:
+                always = clf.intercept_[0] > 0
+                rules.append(f"{name}: always {'on' if always else 'off'}")
+                continue
+            rules.append(f"If {' '.join(terms)} > {threshold:.2f}: {name}")
+        return rules
@@ -0,0 +1,191 @@
+"""
+Sensor Polling
+Reads each sensor at its own rate instead of snapshotting all of them at
+once. A heap of next-due times drives a scheduler thread, blocking
+get_reading() calls run on a thread pool, and a read that overruns its
+timeout is abandoned so one slow sensor can't hold up the others. Readings
+are delivered as a stream through a queue.
+"""
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .metrics import NULL_METRICS
+from .sensors import BaseSensor, SensorData, SensorManager, SensorType
+
+# Seconds between reads: climate sensors change slowly, door and presence need sub-second reads
+DEFAULT_INTERVALS = {
+    SensorType.TEMPERATURE: 60.0,
+    SensorType.HUMIDITY: 60.0,
+    SensorType.AIR_QUALITY: 30.0,
+    SensorType.DOOR: 0.5,
+    SensorType.PRESENCE: 0.5
+}
+DEFAULT_INTERVAL = 10.0
+# Longest the scheduler sleeps, so sensors registered while it runs are picked up
+MAX_IDLE_WAIT = 1.0
+
+
+class SensorPoller:
+    def __init__(self, sensor_manager: SensorManager,
+                 intervals: Optional[Mapping[Union[str, SensorType], float]] = None,
+                 timeout: float = 5.0, max_workers: int = 8, max_queued: int = 10_000,
+                 clock=time.monotonic, metrics=None):
+        """intervals override DEFAULT_INTERVALS per sensor id or per SensorType."""
+        self.sensor_manager = sensor_manager
+        self.intervals: Dict[Union[str, SensorType], float] = dict(DEFAULT_INTERVALS)
+        self.intervals.update(intervals or {})
+        self.timeout = timeout
+        self.readings: queue.Queue = queue.Queue(max_queued)
+        self.clock = clock
+        self.metrics = metrics or NULL_METRICS
+        self.timeouts = 0
+        self.errors = 0
+        self.dropped = 0
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        self._schedule: List[Tuple[float, int, str]] = []   # (due, tiebreak, sensor_id) heap
+        self._scheduled = set()
+        self._sequence = itertools.count()
+        self._in_flight: Dict[str, Tuple[Future, float]] = {}
+        self._timed_out = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sensor-poll')
+
+    def interval(self, sensor: BaseSensor) -> float:
+        return self.intervals.get(sensor.sensor_id,
+                                  self.intervals.get(sensor.sensor_type, DEFAULT_INTERVAL))
+
+    def _push(self, due: float, sensor_id: str) -> None:
+        heapq.heappush(self._schedule, (due, next(self._sequence), sensor_id))
+
+    def run_due(self, now: float) -> float:
+        """Start every read due at `now` and expire overrunning ones; returns the next wake time."""
+        for sensor_id in self.sensor_manager.sensors.keys() - self._scheduled:
+            self._scheduled.add(sensor_id)
+            self._push(now, sensor_id)
+        self._expire(now)
+
+        while self._schedule and self._schedule[0][0] <= now:
+            due, _, sensor_id = heapq.heappop(self._schedule)
+            sensor = self.sensor_manager.sensors.get(sensor_id)
+            if sensor is None:
+                self._scheduled.discard(sensor_id)
+                continue
+            # Keep to the sensor's own cadence, skipping ahead if we fell behind
+            interval = self.interval(sensor)
+            next_due = due + interval
+            self._push(next_due if next_due > now else now + interval, sensor_id)
+            with self._lock:
+                if sensor_id in self._in_flight:
+                    # At most one read per sensor, so a hung sensor ties up one worker
+                    self.metrics.increment('polls_skipped_total', sensor=sensor_id)
+                    continue
+                future = self._executor.submit(sensor.get_reading)
+                self._in_flight[sensor_id] = (future, now + self.timeout)
+            future.add_done_callback(partial(self._deliver, sensor_id))
+
+        next_at = self._schedule[0][0] if self._schedule else now + MAX_IDLE_WAIT
+        with self._lock:
+            for sensor_id, (_, deadline) in self._in_flight.items():
+                if sensor_id not in self._timed_out:
+                    next_at = min(next_at, deadline)
+        return next_at
+
+    def _expire(self, now: float) -> None:
+        with self._lock:
+            expired = [sensor_id for sensor_id, (_, deadline) in self._in_flight.items()
+                       if deadline <= now and sensor_id not in self._timed_out]
+            self._timed_out.update(expired)
+            self.timeouts += len(expired)
+        for sensor_id in expired:
+            self.metrics.increment('sensor_timeouts_total', sensor=sensor_id)
+
+    def _deliver(self, sensor_id: str, future: Future) -> None:
+        with self._lock:
+            entry = self._in_flight.get(sensor_id)
+            if entry is None or entry[0] is not future:
+                return   # abandoned by stop()
+            del self._in_flight[sensor_id]
+            late = sensor_id in self._timed_out
+            self._timed_out.discard(sensor_id)
+        if late or future.cancelled():
+            return
+        try:
+            reading = future.result()
+        except Exception:
+            self.errors += 1
+            self.metrics.increment('sensor_errors_total', sensor=sensor_id)
+            return
+        try:
+            self.readings.put_nowait(reading)
+        except queue.Full:
+            self.dropped += 1
+            self.metrics.increment('readings_dropped_total')
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='sensor-poller')
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            next_at = self.run_due(self.clock())
+            self._wake.wait(min(MAX_IDLE_WAIT, max(0.0, next_at - self.clock())))
+            self._wake.clear()
+
+    def notify(self) -> None:
+        """Wake the scheduler, e.g. right after registering a sensor."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scheduling reads; reads still blocked in hardware are abandoned."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        with self._lock:
+            self._in_flight.clear()
+            self._timed_out.clear()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[SensorData]:
+        """Next reading, or None if none arrives within timeout."""
+        try:
+            return self.readings.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __iter__(self) -> Iterator[SensorData]:
+        """Readings as they arrive; ends once the poller is stopped and drained."""
+        while True:
+            try:
+                yield self.readings.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
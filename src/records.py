@@ -0,0 +1,163 @@
+"""
+Compact Records
+Slotted, immutable counterparts of SensorData and Action for high-volume
+paths. They hold enum types, integer epoch-millisecond timestamps, interned
+sensor ids and, for actions, one shared read-only parameter template per
+action type. ReadingPacker encodes readings as fixed-size binary rows for
+bulk transport and storage.
+"""
+import struct
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .actions import Action
+from .sensors import SensorData, SensorType
+
+
+def epoch_ms(timestamp: datetime) -> int:
+    return round(timestamp.timestamp() * 1000)
+
+
+@dataclass(frozen=True, slots=True)
+class Reading:
+    timestamp_ms: int
+    sensor_id: str
+    sensor_type: SensorType
+    value: float
+    unit: Optional[str] = None
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ms / 1000)
+
+    @classmethod
+    def from_sensor_data(cls, sensor_data: SensorData) -> 'Reading':
+        unit = sensor_data.unit
+        return cls(epoch_ms(sensor_data.timestamp), sys.intern(sensor_data.sensor_id),
+                   sensor_data.sensor_type, sensor_data.value,
+                   None if unit is None else sys.intern(unit))
+
+    def to_sensor_data(self) -> SensorData:
+        return SensorData(self.timestamp, self.sensor_id, self.sensor_type, self.value, self.unit)
+
+
+class ActionType(str, Enum):
+    """Action types; members compare equal to the strings ActionExecutor dispatches on."""
+    COOLING = "ACTIVATE_COOLING"
+    HEATING = "ACTIVATE_HEATING"
+    DEHUMIDIFIER = "ACTIVATE_DEHUMIDIFIER"
+    HUMIDIFIER = "ACTIVATE_HUMIDIFIER"
+    DOOR_NOTIFICATION = "DOOR_NOTIFICATION"
+    VENTILATION = "ACTIVATE_VENTILATION"
+    ADJUST_ENVIRONMENT = "ADJUST_ENVIRONMENT"
+    ENERGY_SAVING = "ENERGY_SAVING"
+
+
+# Parameters, priority and id prefix of the actions AIEngine.build_actions emits
+ACTION_TEMPLATES: Dict[ActionType, Tuple[Mapping, int, str]] = {
+    ActionType.VENTILATION: (MappingProxyType({"speed": "auto", "duration_minutes": 15}), 2, "ventilation"),
+    ActionType.COOLING: (MappingProxyType({"target_temp": 23}), 2, "cooling"),
+    ActionType.HEATING: (MappingProxyType({"target_temp": 21}), 2, "heating"),
+    ActionType.ADJUST_ENVIRONMENT: (MappingProxyType({"lights": "on", "optimize_hvac": True}), 3, "lighting"),
+    ActionType.DOOR_NOTIFICATION: (MappingProxyType({"status": "check", "duration_minutes": 5}), 1, "security"),
+    ActionType.ENERGY_SAVING: (MappingProxyType({"lights": "off", "reduce_hvac": True}), 2, "energy"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ActionRecord:
+    action_type: ActionType
+    timestamp_ms: int
+    priority: int
+    parameters: Mapping = field(hash=False)  # read-only, usually a shared template
+
+    @classmethod
+    def create(cls, action_type: ActionType, timestamp_ms: int) -> 'ActionRecord':
+        """A record sharing the type's parameter template instead of copying it."""
+        parameters, priority, _ = ACTION_TEMPLATES[action_type]
+        return cls(action_type, timestamp_ms, priority, parameters)
+
+    @property
+    def action_id(self) -> str:
+        """Formatted on demand rather than stored with every record."""
+        template = ACTION_TEMPLATES.get(self.action_type)
+        prefix = template[2] if template else self.action_type.value.lower()
+        return f"{prefix}_{self.timestamp_ms / 1000}"
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ms / 1000)
+
+    @classmethod
+    def from_action(cls, action: Action) -> 'ActionRecord':
+        action_type = ActionType(action.action_type)
+        template = ACTION_TEMPLATES.get(action_type)
+        if template is not None and template[0] == action.parameters:
+            parameters = template[0]
+        else:
+            parameters = MappingProxyType(dict(action.parameters))
+        return cls(action_type, epoch_ms(action.timestamp), action.priority, parameters)
+
+    def to_action(self) -> Action:
+        return Action(self.action_id, self.action_type.value, dict(self.parameters),
+                      self.priority, self.timestamp)
+
+
+# One packed reading: epoch ms, value, index into the packer's sensor table
+READING_STRUCT = struct.Struct('<qdH')
+READING_DTYPE = [('timestamp_ms', '<i8'), ('value', '<f8'), ('sensor', '<u2')]
+BOOLEAN_SENSORS = frozenset((SensorType.DOOR, SensorType.PRESENCE))
+
+
+class ReadingPacker:
+    def __init__(self, sensors: Sequence[Tuple[str, SensorType, Optional[str]]] = ()):
+        """Rows refer to sensors by index; pass a saved sensor_table() to decode old data."""
+        self.sensors: List[Tuple[str, SensorType, Optional[str]]] = []
+        self._index: Dict[str, int] = {}
+        for sensor_id, sensor_type, unit in sensors:
+            self.sensor_index(sensor_id, sensor_type, unit)
+
+    def sensor_index(self, sensor_id: str, sensor_type: SensorType, unit: Optional[str] = None) -> int:
+        index = self._index.get(sensor_id)
+        if index is None:
+            if len(self.sensors) > 0xFFFF:
+                raise ValueError("Too many sensors for one packer")
+            index = self._index[sensor_id] = len(self.sensors)
+            self.sensors.append((sys.intern(sensor_id), sensor_type, unit))
+        elif self.sensors[index][1] is not sensor_type:
+            raise ValueError(f"Sensor {sensor_id} is registered as {self.sensors[index][1].value}")
+        return index
+
+    def sensor_table(self) -> List[Tuple[str, SensorType, Optional[str]]]:
+        return list(self.sensors)
+
+    def pack(self, readings: Iterable) -> bytes:
+        """Encode Readings or SensorData as READING_STRUCT rows."""
+        rows = bytearray()
+        pack = READING_STRUCT.pack
+        for reading in readings:
+            timestamp_ms = getattr(reading, 'timestamp_ms', None)
+            if timestamp_ms is None:
+                timestamp_ms = epoch_ms(reading.timestamp)
+            index = self.sensor_index(reading.sensor_id, reading.sensor_type, reading.unit)
+            rows += pack(timestamp_ms, float(reading.value), index)
+        return bytes(rows)
+
+    def unpack(self, data: bytes) -> List[Reading]:
+        readings = []
+        for timestamp_ms, value, index in READING_STRUCT.iter_unpack(data):
+            sensor_id, sensor_type, unit = self.sensors[index]
+            if sensor_type in BOOLEAN_SENSORS:
+                value = value != 0.0
+            readings.append(Reading(timestamp_ms, sensor_id, sensor_type, value, unit))
+        return readings
+
+    @staticmethod
+    def to_array(data: bytes):
+        """Zero-copy NumPy structured view of packed rows."""
+        import numpy as np
+        return np.frombuffer(data, dtype=np.dtype(READING_DTYPE))
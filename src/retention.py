@@ -0,0 +1,65 @@
+"""
+History Retention Policies
+Bound the training history with sliding windows, time-decay sample weights
+and collapsing of identical input/output rows into weighted samples.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class RetentionPolicy:
+    max_samples: Optional[int] = None         # sliding count window
+    max_age_seconds: Optional[float] = None   # sliding time window, relative to the newest sample
+    half_life_seconds: Optional[float] = None # exponential time decay of sample weights
+    deduplicate: bool = False                 # collapse identical rows into one weighted sample
+    compact_factor: float = 2.0               # compact storage once it holds this many times the window
+
+    def window_start(self, timestamps: np.ndarray) -> int:
+        """Index of the first row inside the retention window (rows are in time order)."""
+        n = len(timestamps)
+        start = 0
+        if self.max_samples is not None:
+            start = max(start, n - self.max_samples)
+        if self.max_age_seconds is not None and n:
+            cutoff = timestamps[-1] - self.max_age_seconds
+            start = max(start, int(np.searchsorted(timestamps, cutoff, side='left')))
+        return start
+
+    def should_compact(self, total: int, start: int) -> bool:
+        return start > 0 and total >= self.compact_factor * (total - start)
+
+    def sample_weights(self, timestamps: np.ndarray) -> Optional[np.ndarray]:
+        if self.half_life_seconds is None or not len(timestamps):
+            return None
+        age = timestamps[-1] - timestamps
+        return np.exp2(-age / self.half_life_seconds)
+
+    def prepare(self, X: np.ndarray, y: np.ndarray,
+                timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Return (X, y, sample_weight) for fit() over the rows inside the window."""
+        start = self.window_start(timestamps)
+        X, y, timestamps = X[start:], y[start:], timestamps[start:]
+        weights = self.sample_weights(timestamps)
+        if self.deduplicate and len(X):
+            X, y, weights = collapse_duplicates(X, y, weights)
+        return X, y, weights
+
+
+def collapse_duplicates(X: np.ndarray, y: np.ndarray,
+                        weights: Optional[np.ndarray] = None):
+    """Merge identical (input, output) rows, summing their weights.
+
+    Training on the result with sample_weight is equivalent to training on
+    the repeated rows.
+    """
+    rows = np.concatenate([X.astype(np.float32), y.astype(np.float32)], axis=1)
+    unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    merged = np.bincount(inverse, weights=weights, minlength=len(unique_rows))
+    n_features = X.shape[1]
+    return (np.ascontiguousarray(unique_rows[:, :n_features], dtype=X.dtype),
+            np.ascontiguousarray(unique_rows[:, n_features:], dtype=y.dtype),
+            merged)
@@ -0,0 +1,133 @@
+"""
+Retraining Scheduler
+Decides when SmartHomeAI should retrain instead of refitting on a fixed
+timer: after enough new samples, or earlier when the serving model drifts
+from the explicit rules or the incoming feature distribution shifts away
+from the training data. Checks back off while nothing changes, and the
+loop can be stopped.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .ai_model import MIN_TRAINING_SAMPLES, apply_energy_saving_override, apply_explicit_rules
+
+
+@dataclass
+class RetrainPolicy:
+    min_new_samples: int = 50        # retrain after this many readings regardless of drift
+    min_drift_samples: int = 10      # readings needed before drift is measured
+    min_agreement: float = 0.9       # retrain when model/rule agreement on new readings drops below
+    max_feature_shift: float = 1.0   # retrain when a feature mean moves this many training stds
+    drift_window: int = 500          # training rows used as the reference distribution
+    check_interval: float = 5.0      # seconds between checks after activity
+    max_interval: float = 300.0      # backoff ceiling while nothing changes
+    backoff_factor: float = 2.0
+
+
+def rule_agreement(model, X: np.ndarray) -> float:
+    """Fraction of action values where the model matches the explicit rules on X."""
+    rules = apply_energy_saving_override(X, apply_explicit_rules(X))
+    predictions = np.asarray(model.predict(X)).reshape(rules.shape).astype(bool)
+    return float(np.mean(predictions == rules))
+
+
+def feature_shift(reference: np.ndarray, recent: np.ndarray) -> float:
+    """Largest per-feature change of the mean, in reference standard deviations."""
+    # Binary features with a constant reference get a unit scale
+    scale = reference.std(axis=0)
+    scale[scale < 1e-6] = 1.0
+    return float(np.max(np.abs(recent.mean(axis=0) - reference.mean(axis=0)) / scale))
+
+
+class RetrainScheduler:
+    def __init__(self, ai, policy: Optional[RetrainPolicy] = None):
+        self.ai = ai
+        self.policy = policy or RetrainPolicy()
+        self.interval = self.policy.check_interval
+        self.last_reason: Optional[str] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_samples_behind = None
+
+    def check(self) -> Optional[str]:
+        """Why the model should be retrained now ('initial', 'samples', 'drift'), or None."""
+        ai = self.ai
+        serving = ai._serving
+        if serving is None:
+            return 'initial' if len(ai.history) >= MIN_TRAINING_SAMPLES else None
+        samples_behind = ai.model_staleness()['samples_behind']
+        if samples_behind >= self.policy.min_new_samples:
+            return 'samples'
+        if samples_behind >= self.policy.min_drift_samples and self._drifted(serving, samples_behind):
+            return 'drift'
+        return None
+
+    def _drifted(self, serving, samples_behind: int) -> bool:
+        with self.ai._locked(self.ai.history_lock, 'history'):
+            features = self.ai.buffer.features
+            trained_end = max(0, len(features) - samples_behind)
+            reference = np.array(features[max(0, trained_end - self.policy.drift_window):trained_end],
+                                 dtype=np.float64)
+            recent = np.array(features[trained_end:], dtype=np.float64)
+        if not len(recent):
+            return False
+        model = serving.compiled if serving.compiled is not None else serving.model
+        if rule_agreement(model, recent) < self.policy.min_agreement:
+            return True
+        return len(reference) > 1 and feature_shift(reference, recent) > self.policy.max_feature_shift
+
+    def run_once(self) -> Optional[str]:
+        """Check once, retrain if needed, and adjust the interval until the next check."""
+        reason = self.check()
+        if reason is not None:
+            self.ai.metrics.increment('retrains_total', reason=reason)
+            self.ai.train_model()
+            self.interval = self.policy.check_interval
+        else:
+            samples_behind = self.ai.model_staleness()['samples_behind']
+            if samples_behind != self._last_samples_behind:
+                # New readings arrived: keep checking at the base rate
+                self.interval = self.policy.check_interval
+            else:
+                self.interval = min(self.interval * self.policy.backoff_factor,
+                                    self.policy.max_interval)
+            self._last_samples_behind = samples_behind
+        self.last_reason = reason
+        return reason
+
+    def notify(self) -> None:
+        """Wake the loop for an immediate check (e.g. from SmartHomeAI.on_retrain_due)."""
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='retrain-scheduler')
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # Keep the loop alive; the next tick tries again
+                self.ai.metrics.increment('retrain_errors_total')
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the loop, waiting for a retrain in progress to finish."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,310 @@
+"""
+SQLite History Storage
+Embedded time-series backend for SmartHomeAI history. Timestamped rows are
+kept in a WAL-mode SQLite database, indexed by home and time, in the
+system_state and sensor_data tables of docs/system_architecture.md. Range
+queries and min/avg/max downsampling run inside SQLite, so callers read only
+the window they need. Several homes can share one database file; a store
+instance sees the rows of its own home_id.
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .history import ACTION_KEYS, FEATURE_KEYS, HistoryStore, SyncPolicy
+from .sensors import SensorData, SensorType
+
+# A history entry is one system_state row: the model's inputs and the actions taken
+STATE_COLUMNS = FEATURE_KEYS + ACTION_KEYS
+BOOLEAN_FEATURES = ('door_status', 'presence')
+BOOLEAN_SENSORS = (SensorType.DOOR, SensorType.PRESENCE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS system_state (
+    id INTEGER PRIMARY KEY,
+    home_id TEXT NOT NULL,
+    timestamp REAL,
+    temperature REAL,
+    humidity REAL,
+    door_status INTEGER,
+    air_quality REAL,
+    presence INTEGER,
+    ventilation INTEGER,
+    hvac INTEGER,
+    lighting INTEGER,
+    security INTEGER,
+    energy_saving INTEGER
+);
+CREATE INDEX IF NOT EXISTS system_state_home_time ON system_state (home_id, timestamp);
+CREATE TABLE IF NOT EXISTS sensor_data (
+    id INTEGER PRIMARY KEY,
+    home_id TEXT NOT NULL,
+    sensor_id TEXT NOT NULL,
+    sensor_type TEXT NOT NULL,
+    value REAL,
+    timestamp REAL NOT NULL,
+    unit TEXT
+);
+CREATE INDEX IF NOT EXISTS sensor_data_home_sensor_time ON sensor_data (home_id, sensor_id, timestamp);
+CREATE INDEX IF NOT EXISTS sensor_data_home_time ON sensor_data (home_id, timestamp);
+"""
+
+INSERT_STATE = (f"INSERT INTO system_state (home_id, timestamp, {', '.join(STATE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(STATE_COLUMNS) + 2))})")
+SELECT_STATE = f"SELECT id, timestamp, {', '.join(STATE_COLUMNS)} FROM system_state"
+INSERT_READING = ("INSERT INTO sensor_data (home_id, sensor_id, sensor_type, value, timestamp, unit) "
+                  "VALUES (?, ?, ?, ?, ?, ?)")
+
+# PRAGMA synchronous per SyncPolicy; NORMAL is durable per checkpoint in WAL mode
+SYNCHRONOUS = {SyncPolicy.ALWAYS: 'FULL', SyncPolicy.BATCH: 'NORMAL', SyncPolicy.NONE: 'OFF'}
+READ_CHUNK = 10_000
+
+Timestamp = Union[float, datetime]
+
+
+def _epoch(value: Optional[Timestamp]) -> Optional[float]:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+def _state_row(home_id: str, entry: Dict) -> tuple:
+    inputs, outputs = entry['input'], entry['output']
+    return (home_id, entry.get('timestamp'),
+            float(inputs['temperature']), float(inputs['humidity']), int(bool(inputs['door_status'])),
+            float(inputs['air_quality']), int(bool(inputs['presence'])),
+            *(int(bool(outputs[key])) for key in ACTION_KEYS))
+
+
+def _entry(row: Sequence) -> Dict:
+    timestamp, values = row[1], row[2:]
+    inputs = dict(zip(FEATURE_KEYS, values))
+    for key in BOOLEAN_FEATURES:
+        inputs[key] = bool(inputs[key])
+    entry = {'input': inputs,
+             'output': {key: bool(value) for key, value in zip(ACTION_KEYS, values[len(FEATURE_KEYS):])}}
+    if timestamp is not None:
+        entry = {'timestamp': timestamp, **entry}
+    return entry
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """History in SQLite: batched transactional writes, indexed range reads."""
+
+    def __init__(self, path: str, home_id: str = 'default', sync_policy: SyncPolicy = SyncPolicy.BATCH,
+                 batch_size: int = 100, batch_interval: float = 1.0):
+        """Single appends are committed per sync_policy: each one (ALWAYS) or in
+        transactions of batch_size rows / batch_interval seconds (BATCH, NONE)."""
+        self.path = path
+        self.home_id = home_id
+        self.sync_policy = SyncPolicy(sync_policy)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._lock = threading.RLock()
+        self._pending: List[tuple] = []
+        self._last_sync = time.monotonic()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(f'PRAGMA synchronous={SYNCHRONOUS[self.sync_policy]}')
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+        self._size = self._conn.execute('SELECT COUNT(*) FROM system_state WHERE home_id = ?',
+                                        (home_id,)).fetchone()[0]
+
+    def append(self, entry: Dict) -> None:
+        row = _state_row(self.home_id, entry)
+        with self._lock:
+            self._pending.append(row)
+            self._size += 1
+            if (self.sync_policy is SyncPolicy.ALWAYS or len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_sync >= self.batch_interval):
+                self._write_pending()
+
+    def extend(self, entries: Iterable[Dict]) -> None:
+        rows = [_state_row(self.home_id, entry) for entry in entries]
+        with self._lock:
+            self._pending.extend(rows)
+            self._size += len(rows)
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        if self._pending:
+            with self._conn:
+                self._conn.executemany(INSERT_STATE, self._pending)
+            self._pending.clear()
+        self._last_sync = time.monotonic()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def _range(self, start: Optional[Timestamp], end: Optional[Timestamp], **equal):
+        """WHERE clause and parameters for this home and start <= timestamp < end."""
+        clauses, params = ['home_id = ?'], [self.home_id]
+        for column, value in equal.items():
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if start is not None:
+            clauses.append('timestamp >= ?')
+            params.append(_epoch(start))
+        if end is not None:
+            clauses.append('timestamp < ?')
+            params.append(_epoch(end))
+        return ' AND '.join(clauses), params
+
+    def iter_entries(self) -> Iterator[Dict]:
+        return self.iter_from(0)
+
+    def iter_from(self, offset: int) -> Iterator[Dict]:
+        # Keyset pagination by id, so writers aren't blocked for the whole scan
+        with self._lock:
+            self._write_pending()
+            first = self._conn.execute(
+                'SELECT id FROM system_state WHERE home_id = ? ORDER BY id LIMIT 1 OFFSET ?',
+                (self.home_id, offset)).fetchone()
+        if first is None:
+            return
+        last_id = first[0] - 1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(f"{SELECT_STATE} WHERE home_id = ? AND id > ? ORDER BY id LIMIT ?",
+                                          (self.home_id, last_id, READ_CHUNK)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _entry(row)
+            last_id = rows[-1][0]
+
+    def window_offset(self, max_samples: Optional[int] = None,
+                      max_age_seconds: Optional[float] = None) -> Optional[int]:
+        """Rows before the newest max_samples / the last max_age_seconds, from the time index."""
+        with self._lock:
+            self._write_pending()
+            offset = 0
+            if max_samples is not None:
+                offset = max(offset, self._size - max_samples)
+            if max_age_seconds is not None:
+                newest = self._conn.execute('SELECT MAX(timestamp) FROM system_state WHERE home_id = ?',
+                                            (self.home_id,)).fetchone()[0]
+                if newest is not None:
+                    where, params = self._range(None, newest - max_age_seconds)
+                    older = self._conn.execute(f'SELECT COUNT(*) FROM system_state WHERE {where}',
+                                               params).fetchone()[0]
+                    offset = max(offset, older)
+            return offset
+
+    def query(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """Entries with start <= timestamp < end, in time order."""
+        where, params = self._range(start, end)
+        sql = f"{SELECT_STATE} WHERE {where} ORDER BY timestamp, id"
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            self._write_pending()
+            return [_entry(row) for row in self._conn.execute(sql, params)]
+
+    def downsample(self, bucket_seconds: float, start: Optional[Timestamp] = None,
+                   end: Optional[Timestamp] = None,
+                   columns: Sequence[str] = ('temperature', 'humidity', 'air_quality')) -> List[Dict]:
+        """Per time bucket: start timestamp, row count and min/avg/max of each column."""
+        unknown = set(columns) - set(STATE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns {sorted(unknown)}, expected some of {STATE_COLUMNS}")
+        where, params = self._range(start, end)
+        aggregates = ', '.join(f'MIN({c}), AVG({c}), MAX({c})' for c in columns)
+        sql = (f"SELECT CAST(timestamp / ? AS INTEGER) AS bucket, COUNT(*), {aggregates} "
+               f"FROM system_state WHERE {where} AND timestamp IS NOT NULL GROUP BY bucket ORDER BY bucket")
+        with self._lock:
+            self._write_pending()
+            rows = self._conn.execute(sql, [bucket_seconds] + params).fetchall()
+        buckets = []
+        for row in rows:
+            bucket = {'timestamp': row[0] * bucket_seconds, 'count': row[1]}
+            for i, column in enumerate(columns):
+                low, mean, high = row[2 + 3 * i:5 + 3 * i]
+                bucket[column] = {'min': low, 'avg': mean, 'max': high}
+            buckets.append(bucket)
+        return buckets
+
+    def replace(self, entries: Iterable[Dict]) -> None:
+        rows = [_state_row(self.home_id, entry) for entry in entries]
+        with self._lock:
+            self._pending.clear()
+            with self._conn:
+                self._conn.execute('DELETE FROM system_state WHERE home_id = ?', (self.home_id,))
+                self._conn.executemany(INSERT_STATE, rows)
+            self._size = len(rows)
+
+    def drop_front(self, count: int) -> None:
+        with self._lock:
+            self._write_pending()
+            with self._conn:
+                deleted = self._conn.execute(
+                    'DELETE FROM system_state WHERE id IN '
+                    '(SELECT id FROM system_state WHERE home_id = ? ORDER BY id LIMIT ?)',
+                    (self.home_id, count)).rowcount
+            self._size -= deleted
+
+    def delete_before(self, timestamp: Timestamp) -> int:
+        """Delete entries older than timestamp; returns how many were removed."""
+        with self._lock:
+            self._write_pending()
+            with self._conn:
+                deleted = self._conn.execute(
+                    'DELETE FROM system_state WHERE home_id = ? AND timestamp < ?',
+                    (self.home_id, _epoch(timestamp))).rowcount
+            self._size -= deleted
+        return deleted
+
+    def append_readings(self, readings: Iterable) -> None:
+        """Store raw sensor readings (SensorData or records.Reading) in one transaction."""
+        rows = []
+        for reading in readings:
+            timestamp_ms = getattr(reading, 'timestamp_ms', None)
+            timestamp = reading.timestamp.timestamp() if timestamp_ms is None else timestamp_ms / 1000
+            rows.append((self.home_id, reading.sensor_id, reading.sensor_type.value,
+                         float(reading.value), timestamp, reading.unit))
+        with self._lock, self._conn:
+            self._conn.executemany(INSERT_READING, rows)
+
+    def query_readings(self, sensor_id: Optional[str] = None, start: Optional[Timestamp] = None,
+                       end: Optional[Timestamp] = None) -> List[SensorData]:
+        """Raw readings with start <= timestamp < end, optionally for one sensor."""
+        where, params = self._range(start, end, sensor_id=sensor_id)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT sensor_id, sensor_type, value, timestamp, unit FROM sensor_data "
+                f"WHERE {where} ORDER BY timestamp, id", params).fetchall()
+        readings = []
+        for sensor_id, sensor_type, value, timestamp, unit in rows:
+            sensor_type = SensorType(sensor_type)
+            if sensor_type in BOOLEAN_SENSORS:
+                value = bool(value)
+            readings.append(SensorData(datetime.fromtimestamp(timestamp), sensor_id, sensor_type, value, unit))
+        return readings
+
+    def downsample_readings(self, sensor_id: str, bucket_seconds: float,
+                            start: Optional[Timestamp] = None,
+                            end: Optional[Timestamp] = None) -> List[Dict]:
+        """Per time bucket: start timestamp, count and min/avg/max of one sensor's values."""
+        where, params = self._range(start, end, sensor_id=sensor_id)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT CAST(timestamp / ? AS INTEGER) AS bucket, COUNT(*), MIN(value), AVG(value), "
+                f"MAX(value) FROM sensor_data WHERE {where} GROUP BY bucket ORDER BY bucket",
+                [bucket_seconds] + params).fetchall()
+        return [{'timestamp': bucket * bucket_seconds, 'count': count, 'min': low, 'avg': mean, 'max': high}
+                for bucket, count, low, mean, high in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._write_pending()
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,145 @@
+"""
+Bulk Synthetic Sensor Data
+NumPy version of SmartHomeSimulator's per-step sensor models that produces
+N steps (optionally for many independent homes) of all five sensor streams
+at once. Stateful streams use cumulative operations: the door state is the
+parity of its toggle count, and air quality is a clipped random walk
+evaluated as a prefix composition of per-step clip maps.
+"""
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from .ai_model import apply_energy_saving_override, apply_explicit_rules
+from .history import rows_to_entries
+
+# Same constants as the scalar models in simulate_smart_home.py
+ACTIVE_HOURS = (7, 22)          # inclusive range with frequent door use
+DOOR_TOGGLE_ACTIVE = 0.1
+DOOR_TOGGLE_NIGHT = 0.01
+PRESENCE_ACTIVE = 0.9
+PRESENCE_NIGHT = 0.95
+AIR_DECAY_MAX = 2.0             # per-step loss with the door closed
+AIR_RECOVERY_MAX = 5.0          # per-step gain with the door open
+
+
+class SensorState(NamedTuple):
+    """State carried between steps; (n_homes,) arrays when generating several homes."""
+    door_open: Union[bool, np.ndarray] = False
+    air_quality: Union[float, np.ndarray] = 95.0
+
+
+class SyntheticData(NamedTuple):
+    features: np.ndarray    # (n_steps, 5), or (n_homes, n_steps, 5)
+    timestamps: np.ndarray  # (n_steps,) epoch seconds
+    final_state: SensorState
+
+
+def step_hours(start_time: datetime, n_steps: int, time_step_minutes: float) -> np.ndarray:
+    """Hour of day of every step, advancing from start_time."""
+    start = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+    return ((start + np.arange(n_steps) * time_step_minutes * 60) // 3600 % 24).astype(np.int64)
+
+
+def clipped_walk(start, steps: np.ndarray, low: float, high: float) -> np.ndarray:
+    """x[t] = clip(x[t-1] + steps[t], low, high) along the last axis, vectorized.
+
+    Each step is the map x -> min(H, max(L, x + c)); these maps compose into
+    the same form, so a log-depth prefix scan yields every x[t] at once.
+    """
+    c = np.array(steps, dtype=np.float64)
+    lo = np.full_like(c, low)
+    hi = np.full_like(c, high)
+    n = c.shape[-1]
+    shift = 1
+    while shift < n:
+        # Compose the map ending `shift` steps earlier before the current one
+        c_prev, lo_prev, hi_prev = c[..., :-shift], lo[..., :-shift], hi[..., :-shift]
+        c_cur, lo_cur, hi_cur = c[..., shift:], lo[..., shift:], hi[..., shift:]
+        new_lo = np.clip(lo_prev + c_cur, lo_cur, hi_cur)
+        new_hi = np.clip(hi_prev + c_cur, lo_cur, hi_cur)
+        c[..., shift:] = c_prev + c_cur
+        lo[..., shift:] = new_lo
+        hi[..., shift:] = new_hi
+        shift *= 2
+    start = np.asarray(start, dtype=np.float64)[..., None]
+    return np.clip(start + c, lo, hi)
+
+
+def generate(n_steps: int, n_homes: Optional[int] = None, start_time: Optional[datetime] = None,
+             time_step_minutes: float = 5, state: SensorState = SensorState(),
+             seed=None) -> SyntheticData:
+    """Generate n_steps of readings, for one home or n_homes independent homes.
+
+    Statistically equivalent to calling the simulator's simulate_* methods
+    once per step; state gives the door and air quality at the start, shared
+    by every home or per home. final_state continues the series.
+    """
+    rng = np.random.default_rng(seed)
+    if start_time is None:
+        start_time = datetime.now()
+    shape = (n_steps,) if n_homes is None else (n_homes, n_steps)
+    hours = step_hours(start_time, n_steps, time_step_minutes)
+    active = (hours >= ACTIVE_HOURS[0]) & (hours <= ACTIVE_HOURS[1])
+
+    # Temperature: daily sine curve plus uniform noise; humidity follows it
+    temperature = 20 + 5 * np.sin(np.pi * (hours - 6) / 12) + rng.uniform(-1, 1, shape)
+    humidity = np.clip(60 - (temperature - 20) + rng.uniform(-5, 5, shape), 30, 70)
+
+    # Door: toggles at an hour-dependent rate; the state is the toggle parity
+    toggles = rng.random(shape) < np.where(active, DOOR_TOGGLE_ACTIVE, DOOR_TOGGLE_NIGHT)
+    start_open = np.asarray(state.door_open, dtype=bool)[..., None]
+    door_open = (np.cumsum(toggles, axis=-1) % 2).astype(bool) ^ start_open
+
+    # Air quality: decays while the door is closed, recovers while it's open
+    change = np.where(door_open, rng.uniform(0, AIR_RECOVERY_MAX, shape),
+                      -rng.uniform(0, AIR_DECAY_MAX, shape))
+    air_quality = clipped_walk(state.air_quality, change, 0.0, 100.0)
+
+    presence = rng.random(shape) < np.where(active, PRESENCE_ACTIVE, PRESENCE_NIGHT)
+
+    features = np.stack([temperature, humidity, door_open, air_quality, presence], axis=-1)
+    timestamps = start_time.timestamp() + np.arange(n_steps) * time_step_minutes * 60.0
+    if not n_steps:
+        final_state = state
+    elif n_homes is None:
+        final_state = SensorState(bool(door_open[-1]), float(air_quality[-1]))
+    else:
+        final_state = SensorState(door_open[:, -1].copy(), air_quality[:, -1].copy())
+    return SyntheticData(features, timestamps, final_state)
+
+
+def rule_labels(features: np.ndarray) -> np.ndarray:
+    """Actions the explicit rules (no model) take for an (n, 5) feature matrix."""
+    return apply_energy_saving_override(features, apply_explicit_rules(features))
+
+
+def iter_chunks(n_steps: int, chunk_size: int = 100_000, start_time: Optional[datetime] = None,
+                time_step_minutes: float = 5, state: SensorState = SensorState(),
+                seed=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield (features, timestamps) chunks of one continuous series, bounding memory."""
+    rng = np.random.default_rng(seed)
+    if start_time is None:
+        start_time = datetime.now()
+    for offset in range(0, n_steps, chunk_size):
+        count = min(chunk_size, n_steps - offset)
+        chunk_start = start_time + timedelta(minutes=time_step_minutes * offset)
+        data = generate(count, start_time=chunk_start, time_step_minutes=time_step_minutes,
+                        state=state, seed=rng)
+        state = data.final_state
+        yield data.features, data.timestamps
+
+
+def write_buffer(buffer, features: np.ndarray, timestamps: np.ndarray) -> None:
+    """Append generated rows, labelled by the explicit rules, to a HistoryBuffer."""
+    buffer.extend(features, rule_labels(features), timestamps)
+
+
+def write_store(store, features: np.ndarray, timestamps: np.ndarray,
+                chunk_size: int = 10_000) -> None:
+    """Append generated rows, labelled by the explicit rules, to a HistoryStore."""
+    for offset in range(0, len(features), chunk_size):
+        X = features[offset:offset + chunk_size]
+        store.extend(rows_to_entries(X.tolist(), rule_labels(X).tolist(),
+                                     timestamps[offset:offset + chunk_size].tolist()))
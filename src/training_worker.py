@@ -0,0 +1,57 @@
+"""
+Process-Pool Training Worker
+Fits the decision tree in a separate process so a retrain doesn't compete
+with request handling for the GIL. The fitted model is pickled back to the
+caller, which publishes it as usual.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+
+from .history_buffer import load_buffer_arrays
+from .retention import RetentionPolicy
+
+# Same estimator settings as SmartHomeAI's in-process tree
+TREE_PARAMS = {'max_depth': 5, 'random_state': 42}
+
+
+def fit_tree(X: np.ndarray, y: np.ndarray,
+             sample_weight: Optional[np.ndarray] = None) -> DecisionTreeClassifier:
+    model = DecisionTreeClassifier(**TREE_PARAMS)
+    model.fit(X, y, sample_weight=sample_weight)
+    return model
+
+
+def fit_tree_from_buffer(buffer_path: str, end: int,
+                         retention: Optional[RetentionPolicy] = None) -> DecisionTreeClassifier:
+    """Fit on the first `end` rows of a memory-mapped HistoryBuffer, read in the worker."""
+    X, y, timestamps = load_buffer_arrays(buffer_path, end)
+    sample_weight = None
+    if retention is not None:
+        X, y, sample_weight = retention.prepare(X, y, timestamps)
+    return fit_tree(X, y, sample_weight)
+
+
+class ProcessTrainingWorker:
+    """Runs tree fits in a worker process; usable as SmartHomeAI.trainer."""
+
+    def __init__(self, max_workers: int = 1):
+        # spawn rather than fork: the parent has sensor/training threads running
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def fit(self, X: np.ndarray, y: np.ndarray,
+            sample_weight: Optional[np.ndarray] = None) -> DecisionTreeClassifier:
+        """Ship the training arrays to the worker and wait for the fitted model."""
+        return self._executor.submit(fit_tree, X, y, sample_weight).result()
+
+    def fit_buffer(self, buffer_path: str, end: int,
+                   retention: Optional[RetentionPolicy] = None) -> DecisionTreeClassifier:
+        """Let the worker map the shared buffer files itself instead of pickling arrays."""
+        return self._executor.submit(fit_tree_from_buffer, buffer_path, end, retention).result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
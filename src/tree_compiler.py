@@ -0,0 +1,74 @@
+"""
+Decision Tree Compiler
+Flattens a fitted DecisionTreeClassifier into plain arrays so single
+readings can be classified without sklearn's per-call validation overhead.
+"""
+from array import array
+from typing import Sequence, Tuple
+
+import numpy as np
+
+LEAF = -1  # children_left/right value marking a leaf (sklearn's TREE_LEAF)
+
+
+class CompiledTree:
+    def __init__(self, feature, threshold, children_left, children_right,
+                 leaf_values: np.ndarray, max_depth: int):
+        # Python lists for the scalar walk, arrays for the vectorized one
+        self.feature = list(feature)
+        self.threshold = list(threshold)
+        self.children_left = list(children_left)
+        self.children_right = list(children_right)
+        self.leaf_values = leaf_values
+        self.leaf_tuples = [tuple(row) for row in leaf_values.tolist()]
+        self.max_depth = max_depth
+        self._feature_array = np.asarray(feature, dtype=np.intp)
+        self._threshold_array = np.asarray(threshold, dtype=np.float64)
+        self._left_array = np.asarray(children_left, dtype=np.intp)
+        self._right_array = np.asarray(children_right, dtype=np.intp)
+
+    @classmethod
+    def from_estimator(cls, model) -> 'CompiledTree':
+        """Compile a fitted (multi-output) DecisionTreeClassifier."""
+        tree = model.tree_
+        classes = model.classes_ if model.n_outputs_ > 1 else [model.classes_]
+        # Same reduction as DecisionTreeClassifier.predict: per output, the
+        # class with the highest (first on ties) leaf value
+        leaf_values = np.column_stack([
+            np.asarray(classes[k]).take(np.argmax(tree.value[:, k, :], axis=1), axis=0)
+            for k in range(model.n_outputs_)
+        ])
+        return cls(tree.feature, tree.threshold, tree.children_left,
+                   tree.children_right, leaf_values, tree.max_depth)
+
+    def predict_one(self, x: Sequence[float]) -> Tuple:
+        """Classify a single feature vector, returning one value per output."""
+        # sklearn compares float32 inputs against float64 thresholds
+        x = array('f', x)
+        feature = self.feature
+        threshold = self.threshold
+        left = self.children_left
+        right = self.children_right
+        node = 0
+        while left[node] != LEAF:
+            if x[feature[node]] <= threshold[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        return self.leaf_tuples[node]
+
+    def predict(self, X) -> np.ndarray:
+        """Vectorized walk over an (n, n_features) matrix; matches model.predict."""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))
+        node = np.zeros(len(X), dtype=np.intp)
+        for _ in range(self.max_depth):
+            left = self._left_array[node]
+            internal = left != LEAF
+            if not internal.any():
+                break
+            go_left = X[rows, self._feature_array[node]] <= self._threshold_array[node]
+            child = np.where(go_left, left, self._right_array[node])
+            node = np.where(internal, child, node)
+        values = self.leaf_values[node]
+        return values if values.shape[1] > 1 else values[:, 0]
@@ -3,6 +3,11 @@ import numpy as np
 from datetime import datetime
 import sys
 import os
+import tempfile
+import threading
+import time
+from unittest import mock
+from sklearn.tree import DecisionTreeClassifier
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -109,5 +114,216 @@ class TestSmartHomeAI(unittest.TestCase):
                 self.assertEqual(actions[system], expected,
                     f"Failed to learn combination: {combo['input']}, expected {system} to be {expected}")
 
+class TestPredictOnlyHotPath(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        history_file = os.path.join(self.tmpdir.name, 'history.jsonl')
+        self.ai = SmartHomeAI(history_file=history_file, retrain_threshold=None)
+        self.reading = {'temperature': 27.0, 'humidity': 60.0, 'door_status': False,
+                        'air_quality': 80.0, 'presence': True}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_first_fit_once_enough_history(self):
+        for _ in range(10):
+            self.ai.process_sensor_data(self.reading)
+        self.assertFalse(self.ai.is_trained())
+        self.ai.process_sensor_data(self.reading)
+        self.assertTrue(self.ai.is_trained())
+        self.assertEqual(self.ai.model_version, 1)
+
+    def test_readings_do_not_refit(self):
+        for _ in range(11):
+            self.ai.process_sensor_data(self.reading)
+        model = self.ai.model
+        for _ in range(20):
+            self.ai.process_sensor_data(self.reading)
+        self.assertIs(self.ai.model, model)
+        self.assertEqual(self.ai.model_version, 1)
+
+    def test_explicit_train_swaps_model(self):
+        for _ in range(11):
+            self.ai.process_sensor_data(self.reading)
+        model = self.ai.model
+        self.ai.train_model()
+        self.assertIsNot(self.ai.model, model)
+        self.assertEqual(self.ai.model_version, 2)
+
+    def test_retrain_threshold(self):
+        self.ai.retrain_threshold = 5
+        # The reading that triggers the first fit counts towards the next one
+        for _ in range(11 + 4):
+            self.ai.process_sensor_data(self.reading)
+        self.assertEqual(self.ai.model_version, 1)
+        self.ai.process_sensor_data(self.reading)
+        self.assertEqual(self.ai.model_version, 2)
+
+    def test_restart_reuses_mapped_buffer(self):
+        history_file = os.path.join(self.tmpdir.name, 'mapped.jsonl')
+        buffer_path = os.path.join(self.tmpdir.name, 'buffer')
+        ai = SmartHomeAI(history_file=history_file, buffer_path=buffer_path)
+        for _ in range(12):
+            ai.process_sensor_data(self.reading)
+        ai.close()
+
+        restarted = SmartHomeAI(history_file=history_file, buffer_path=buffer_path)
+        self.assertEqual(len(restarted.buffer), 12)
+        restarted.train_model()
+        self.assertTrue(restarted.is_trained())
+        restarted.close()
+
+class TestBatchInference(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ai = self.make_ai('history.jsonl')
+        rng = np.random.default_rng(1)
+        self.readings = [
+            {'temperature': float(t), 'humidity': float(h), 'door_status': bool(d),
+             'air_quality': float(a), 'presence': bool(p)}
+            for t, h, d, a, p in zip(rng.uniform(15, 30, 200), rng.uniform(30, 70, 200),
+                                     rng.integers(0, 2, 200), rng.uniform(70, 100, 200),
+                                     rng.integers(0, 2, 200))
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_ai(self, name):
+        return SmartHomeAI(history_file=os.path.join(self.tmpdir.name, name),
+                           retrain_threshold=None)
+
+    def assert_matches_scalar(self, batch, ai=None, readings=None):
+        ai = ai or self.ai
+        for reading, actions in zip(readings or self.readings, batch):
+            expected = {k: bool(v) for k, v in ai.process_sensor_data(reading).items()}
+            self.assertEqual(actions, expected)
+
+    def test_rules_match_scalar_path(self):
+        # Fresh instances per chunk so the scalar path never reaches its first fit
+        for start in range(0, len(self.readings), 10):
+            chunk = self.readings[start:start + 10]
+            ai = self.make_ai(f'rules_{start}.jsonl')
+            self.assert_matches_scalar(ai.process_batch(chunk), ai=ai, readings=chunk)
+            self.assertFalse(ai.is_trained())
+
+    def test_model_predictions_match_scalar_path(self):
+        self.ai.process_batch(self.readings[:50], record=True)
+        self.ai.train_model()
+        self.assert_matches_scalar(self.ai.process_batch(self.readings))
+
+    def test_array_input_and_recording(self):
+        X = np.array([[27.0, 60.0, 0.0, 80.0, 1.0], [22.0, 50.0, 0.0, 95.0, 0.0]])
+        actions = self.ai.process_batch(X, record=True, timestamps=[10.0, 20.0])
+        self.assertTrue(actions[0]['ventilation'])
+        self.assertTrue(actions[1]['energy_saving'])
+        self.assertEqual(len(self.ai.history), 2)
+        self.assertEqual(len(self.ai.buffer), 2)
+        entries = self.ai.load_history()
+        self.assertEqual(entries[1]['timestamp'], 20.0)
+        self.assertFalse(entries[1]['input']['presence'])
+
+class BlockingTree(DecisionTreeClassifier):
+    """Decision tree whose fit blocks until the test releases it"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def fit(self, X, y, sample_weight=None, check_input=True):
+        BlockingTree.started.set()
+        BlockingTree.release.wait(10)
+        return super().fit(X, y, sample_weight=sample_weight, check_input=check_input)
+
+
+class TestConcurrentServing(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        history_file = os.path.join(self.tmpdir.name, 'history.jsonl')
+        self.ai = SmartHomeAI(history_file=history_file, retrain_threshold=None)
+        self.reading = {'temperature': 27.0, 'humidity': 60.0, 'door_status': False,
+                        'air_quality': 80.0, 'presence': True}
+        for _ in range(20):
+            self.ai.process_sensor_data(self.reading)
+        BlockingTree.started.clear()
+        BlockingTree.release.clear()
+
+    def tearDown(self):
+        BlockingTree.release.set()
+        self.ai.close()
+        self.tmpdir.cleanup()
+
+    def test_readings_do_not_wait_for_a_fit(self):
+        serving = self.ai._serving
+        def blocking_fit(X, y, sample_weight=None):
+            return BlockingTree(max_depth=5, random_state=42).fit(X, y, sample_weight=sample_weight)
+
+        with mock.patch('src.ai_model.fit_tree', blocking_fit):
+            trainer = threading.Thread(target=self.ai.train_model)
+            trainer.start()
+            self.assertTrue(BlockingTree.started.wait(5))
+
+            start = time.perf_counter()
+            for _ in range(5):
+                actions = self.ai.process_sensor_data(self.reading)
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertTrue(actions['ventilation'])
+            self.assertEqual(self.ai.get_learned_rules(), self.ai.get_learned_rules())
+            self.assertIs(self.ai._serving, serving)
+            self.assertEqual(self.ai.model_staleness()['samples_behind'], 15)
+
+            BlockingTree.release.set()
+            trainer.join(5)
+        self.assertEqual(self.ai.model_version, 2)
+        # The fit saw the 20 readings present at snapshot time
+        self.assertEqual(self.ai.model_staleness()['samples_behind'], 5)
+        self.assertEqual(len(self.ai.buffer), 25)
+
+    def test_staleness_without_model(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ai = SmartHomeAI(history_file=os.path.join(tmpdir, 'h.jsonl'))
+            staleness = ai.model_staleness()
+            self.assertEqual(staleness['version'], 0)
+            self.assertIsNone(staleness['age_seconds'])
+            ai.close()
+
+class TestOnlineLearner(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        history_file = os.path.join(self.tmpdir.name, 'history.jsonl')
+        self.ai = SmartHomeAI(history_file=history_file, retrain_threshold=None,
+                              learner='online')
+        self.patterns = [
+            {'temperature': 27.0, 'humidity': 60.0, 'door_status': False, 'air_quality': 80.0, 'presence': True},
+            {'temperature': 17.0, 'humidity': 45.0, 'door_status': True, 'air_quality': 98.0, 'presence': True},
+            {'temperature': 22.0, 'humidity': 50.0, 'door_status': False, 'air_quality': 95.0, 'presence': False},
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_updates_only_with_new_samples(self):
+        for pattern in self.patterns * 4:
+            self.ai.process_sensor_data(pattern)
+        self.assertTrue(self.ai.is_trained())
+        self.assertEqual(self.ai.model.n_samples_seen, 10)
+
+        self.ai.train_model()
+        self.assertEqual(self.ai.model.n_samples_seen, 12)
+        version = self.ai.model_version
+        self.ai.train_model()  # nothing new to learn
+        self.assertEqual(self.ai.model_version, version)
+
+    def test_rules_are_readable(self):
+        for pattern in self.patterns * 10:
+            self.ai.process_sensor_data(pattern)
+        self.ai.train_model()
+        rules = self.ai.get_learned_rules()
+        self.assertEqual(len(rules), 5)
+        for rule in rules:
+            self.assertIsInstance(rule, str)
+
+    def test_unknown_learner(self):
+        with self.assertRaises(ValueError):
+            SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'x.jsonl'), learner='forest')
+
 if __name__ == '__main__':
     unittest.main()
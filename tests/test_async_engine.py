@@ -0,0 +1,156 @@
+"""
+Tests for the asyncio sensor / engine / executor pipeline
+"""
+import sys
+import os
+import asyncio
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_controller import AIController
+from src.ai_engine import AIEngine
+from src.ai_model import SmartHomeAI
+from src.async_engine import AsyncAIEngine, AsyncActionExecutor, AsyncSensorManager
+from src.decision_cache import DecisionCache
+from src.sensors import (
+    SensorData, SensorType, TemperatureSensor, HumiditySensor,
+    DoorSensor, AirQualitySensor, PresenceSensor
+)
+
+
+class SlowTemperatureSensor(TemperatureSensor):
+    def get_reading(self) -> SensorData:
+        time.sleep(0.2)  # blocking hardware read
+        return super().get_reading()
+
+
+class AsyncPresenceSensor(PresenceSensor):
+    async def async_get_reading(self) -> SensorData:
+        await asyncio.sleep(0.2)
+        return self.get_reading()
+
+
+class TestAsyncPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'))
+        self.controller = AIController(ai=ai)
+        self.engine = AIEngine(ai_controller=self.controller)
+
+    def tearDown(self):
+        self.controller.close()
+        self.tmpdir.cleanup()
+
+    def test_sensors_are_read_concurrently(self):
+        manager = AsyncSensorManager()
+        for i in range(4):
+            manager.register_sensor(SlowTemperatureSensor(f"temp_{i}"))
+        manager.register_sensor(AsyncPresenceSensor("pres_001"))
+
+        start = time.perf_counter()
+        readings = asyncio.run(manager.get_all_sensor_data())
+        self.assertEqual(len(readings), 5)
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertIsNone(asyncio.run(manager.get_sensor_data("missing")))
+
+    def test_engine_decides_and_records(self):
+        async_engine = AsyncAIEngine(self.engine)
+        sensors = [TemperatureSensor("temp_001"), HumiditySensor("hum_001"), DoorSensor("door_001"),
+                   AirQualitySensor("air_001"), PresenceSensor("pres_001")]
+
+        async def run():
+            results = []
+            for sensor in sensors:
+                results.append(await async_engine.process_sensor_data(sensor.get_reading()))
+            hot = SensorData(datetime.now(), "temp_001", SensorType.TEMPERATURE, 28.0, "°C")
+            results.append(await async_engine.process_sensor_data(hot))
+            await async_engine.flush()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 6)
+        self.assertIn("ACTIVATE_COOLING", [a.action_type for a in results[-1]])
+        self.assertEqual(len(self.engine.ai_controller.ai.history), 6)
+
+    def test_cache_hits_are_not_recorded(self):
+        ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'cached.jsonl'),
+                         decision_cache=DecisionCache())
+        with AIController(ai=ai) as controller:
+            async_engine = AsyncAIEngine(AIEngine(ai_controller=controller))
+            now = datetime.now()
+            readings = [SensorData(now, "temp_001", SensorType.TEMPERATURE, 24.0, "°C"),
+                        SensorData(now, "air_001", SensorType.AIR_QUALITY, 95.0, "%")]
+
+            async def run():
+                for _ in range(10):
+                    await async_engine.process_readings(readings)
+                    await async_engine.process_sensor_data(readings[0])
+                await async_engine.flush()
+
+            asyncio.run(run())
+            # As with AIEngine, a reading served from the cache isn't written again
+            self.assertEqual(ai.decision_cache.hits, 19)
+            self.assertEqual(len(ai.history), 1)
+
+    def test_coalescing_settings_apply(self):
+        async_engine = AsyncAIEngine(AIEngine(ai_controller=self.controller,
+                                              coalesce_until_complete=True))
+        now = datetime.now()
+        readings = [SensorData(now, "temp_001", SensorType.TEMPERATURE, 28.0, "°C"),
+                    SensorData(now, "hum_001", SensorType.HUMIDITY, 50.0, "%"),
+                    SensorData(now, "door_001", SensorType.DOOR, False),
+                    SensorData(now, "air_001", SensorType.AIR_QUALITY, 95.0, "%"),
+                    SensorData(now, "pres_001", SensorType.PRESENCE, True)]
+
+        async def run():
+            results = [await async_engine.process_sensor_data(reading) for reading in readings]
+            # A partial window stays pending until flushed
+            results.append(await async_engine.process_sensor_data(readings[0]))
+            results.append(await async_engine.flush_pending())
+            results.append(await async_engine.flush_pending())
+            await async_engine.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(results[:4], [[]] * 4)
+        self.assertIn("ACTIVATE_COOLING", [a.action_type for a in results[4]])
+        self.assertEqual(results[5], [])
+        self.assertTrue(results[6])
+        self.assertEqual(results[7], [])
+        self.assertEqual(len(self.controller.ai.history), 2)
+
+    def test_aclose_shuts_down_owned_executor(self):
+        async_engine = AsyncAIEngine(self.engine)
+        reading = SensorData(datetime.now(), "temp_001", SensorType.TEMPERATURE, 28.0, "°C")
+
+        async def run():
+            async with async_engine:
+                await async_engine.process_sensor_data(reading)
+
+        asyncio.run(run())
+        # Queued writes finished before the executor was shut down; the engine is the caller's
+        self.assertEqual(len(self.controller.ai.history), 1)
+        with self.assertRaises(RuntimeError):
+            async_engine.history_executor.submit(print)
+        self.assertTrue(self.controller.scheduler.running)
+
+    def test_executor_runs_actions(self):
+        async_engine = AsyncAIEngine(self.engine)
+        executor = AsyncActionExecutor()
+        reading = SensorData(datetime.now(), "door_001", SensorType.DOOR, True)
+
+        async def run():
+            actions = await async_engine.process_sensor_data(reading)
+            await async_engine.flush()
+            return await executor.execute_actions(actions)
+
+        results = asyncio.run(run())
+        self.assertTrue(results)
+        self.assertTrue(all(results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for coalescing per-sensor updates into one decision
+"""
+import sys
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_controller import AIController
+from src.ai_engine import AIEngine
+from src.ai_model import SmartHomeAI
+from src.sensors import SensorData, SensorType
+
+
+def step_readings(temperature=28.0):
+    now = datetime.now()
+    return [
+        SensorData(now, "temp_001", SensorType.TEMPERATURE, temperature, "°C"),
+        SensorData(now, "hum_001", SensorType.HUMIDITY, 50.0, "%"),
+        SensorData(now, "door_001", SensorType.DOOR, False),
+        SensorData(now, "air_001", SensorType.AIR_QUALITY, 95.0, "%"),
+        SensorData(now, "pres_001", SensorType.PRESENCE, True),
+    ]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.controllers = []
+
+    def tearDown(self):
+        for controller in self.controllers:
+            controller.close()
+        self.tmpdir.cleanup()
+
+    def make_controller(self, name='history.jsonl'):
+        controller = AIController(ai=SmartHomeAI(history_file=os.path.join(self.tmpdir.name, name)))
+        self.controllers.append(controller)
+        return controller
+
+    def make_engine(self, **kwargs):
+        return AIEngine(clock=self.clock, ai_controller=self.make_controller(), **kwargs)
+
+    def history_size(self, engine):
+        return len(engine.ai_controller.ai.history)
+
+    def test_until_complete_decides_once_per_step(self):
+        engine = self.make_engine(coalesce_until_complete=True)
+        results = [engine.process_sensor_data(reading) for reading in step_readings()]
+
+        self.assertEqual(results[:-1], [[]] * 4)
+        self.assertIn("ACTIVATE_COOLING", [a.action_type for a in results[-1]])
+        self.assertEqual(self.history_size(engine), 1)
+
+    def test_window_closes_on_late_reading(self):
+        engine = self.make_engine(coalesce_window=1.0)
+        readings = step_readings()
+        self.assertEqual(engine.process_sensor_data(readings[0]), [])
+        self.clock.now = 0.5
+        self.assertEqual(engine.process_sensor_data(readings[1]), [])
+        self.clock.now = 1.0
+        self.assertTrue(engine.process_sensor_data(readings[2]))
+        self.assertEqual(self.history_size(engine), 1)
+
+        # The next window starts with the next reading
+        self.clock.now = 1.2
+        self.assertEqual(engine.process_sensor_data(readings[3]), [])
+        self.assertTrue(engine.flush())
+        self.assertEqual(engine.flush(), [])
+        self.assertEqual(self.history_size(engine), 2)
+
+    def test_process_readings_matches_uncoalesced_state(self):
+        coalesced = self.make_engine()
+        actions = coalesced.process_readings(step_readings())
+        self.assertEqual(self.history_size(coalesced), 1)
+
+        per_reading = AIEngine(ai_controller=self.make_controller('other.jsonl'))
+        for reading in step_readings():
+            last = per_reading.process_sensor_data(reading)
+
+        self.assertEqual([(a.action_type, a.parameters) for a in actions],
+                         [(a.action_type, a.parameters) for a in last])
+
+if __name__ == '__main__':
+    unittest.main()
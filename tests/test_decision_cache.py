@@ -0,0 +1,93 @@
+"""
+Tests for the memoizing decision cache
+"""
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_model import SmartHomeAI
+from src.decision_cache import DecisionCache
+
+
+def reading(temperature=22.0, air_quality=95.0, presence=True):
+    return {'temperature': temperature, 'humidity': 50.0, 'door_status': False,
+            'air_quality': air_quality, 'presence': presence}
+
+
+class TestDecisionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = DecisionCache(max_entries=3)
+        self.ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'),
+                              decision_cache=self.cache)
+
+    def tearDown(self):
+        self.ai.close()
+        self.tmpdir.cleanup()
+
+    def test_repeated_state_hits_and_skips_history(self):
+        first = self.ai.process_sensor_data(reading())
+        second = self.ai.process_sensor_data(reading(temperature=22.02))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.ai.history), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+        # Cached dicts are copies
+        second['lighting'] = not second['lighting']
+        self.assertEqual(self.ai.process_sensor_data(reading()), first)
+
+    def test_matches_uncached_decisions(self):
+        plain = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'plain.jsonl'))
+        for temperature in (17.0, 22.0, 27.0):
+            for presence in (True, False):
+                self.assertEqual(self.ai.decide(reading(temperature, presence=presence)),
+                                 plain.decide(reading(temperature, presence=presence)))
+        plain.close()
+
+    def test_rule_thresholds_are_exact(self):
+        plain = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'plain.jsonl'))
+        cache = DecisionCache()
+        self.ai.decision_cache = cache
+        pairs = [reading(air_quality=90.2), reading(air_quality=89.8),
+                 reading(temperature=26.04), reading(temperature=25.96),
+                 reading(temperature=18.04), reading(temperature=17.96)]
+        for presence in (True, False):
+            for first, second in zip(pairs[::2], pairs[1::2]):
+                first, second = dict(first, presence=presence), dict(second, presence=presence)
+                for r in (first, second, first, second):
+                    self.assertEqual(self.ai.process_sensor_data(r), plain.decide(r), r)
+        self.assertGreater(cache.hits, 0)
+        self.assertTrue(self.ai.decide(reading(air_quality=89.8))['ventilation'])
+        self.assertFalse(self.ai.decide(reading(temperature=25.96, presence=False))['hvac'])
+        plain.close()
+
+    def test_lru_bound(self):
+        for temperature in (20.0, 21.0, 22.0):
+            self.ai.process_sensor_data(reading(temperature))
+        self.ai.process_sensor_data(reading(20.0))  # refresh 20.0
+        self.ai.process_sensor_data(reading(23.0))  # evicts 21.0
+        self.assertEqual(len(self.cache), 3)
+        self.ai.process_sensor_data(reading(21.0))
+        self.assertEqual(self.cache.misses, 5)
+
+    def test_new_model_version_invalidates(self):
+        for i in range(12):
+            self.ai.process_sensor_data(reading(15.0 + i))
+        self.assertTrue(self.ai.is_trained())
+        version = self.ai.model_version
+        self.ai.process_sensor_data(reading(30.0))
+        self.assertGreater(len(self.cache), 1)
+
+        self.ai.train_model()
+        self.assertGreater(self.ai.model_version, version)
+        recorded = len(self.ai.history)
+        self.ai.process_sensor_data(reading(30.0))
+        self.assertEqual(len(self.ai.history), recorded + 1)
+        self.assertEqual(len(self.cache), 1)
+
+if __name__ == '__main__':
+    unittest.main()
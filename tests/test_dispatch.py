@@ -0,0 +1,100 @@
+"""
+Tests for deduplicated, hysteresis-held and batched action dispatch
+"""
+import sys
+import os
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.actions import Action
+from src.dispatch import ActionDispatcher
+from src.metrics import InMemoryMetrics
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.executed = []
+        self.fail = False
+
+    def execute_action(self, action):
+        if self.fail:
+            return False
+        self.executed.append(action.action_type)
+        return True
+
+
+def action(action_type, parameters=None, priority=2):
+    return Action(f"{action_type}_id", action_type, parameters or {}, priority, datetime.now())
+
+
+VENTILATION = {"speed": "auto", "duration_minutes": 15}
+
+
+class TestActionDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.executor = RecordingExecutor()
+        self.metrics = InMemoryMetrics()
+        self.dispatcher = ActionDispatcher(self.executor, clock=lambda: 0.0, metrics=self.metrics)
+
+    def test_repeated_action_is_suppressed(self):
+        for _ in range(100):
+            self.dispatcher.dispatch([action("ENERGY_SAVING", {"lights": "off"})])
+        self.assertEqual(self.executor.executed, ["ENERGY_SAVING"])
+        self.assertEqual(self.dispatcher.suppressed, 99)
+        self.assertEqual(self.metrics.counter('commands_total', device='environment'), 1)
+
+    def test_state_change_and_release_resend(self):
+        self.dispatcher.dispatch([action("ENERGY_SAVING", {"lights": "off"})])
+        self.dispatcher.dispatch([action("ADJUST_ENVIRONMENT", {"lights": "on"}, priority=3)])
+        self.dispatcher.dispatch([])
+        self.dispatcher.dispatch([action("ADJUST_ENVIRONMENT", {"lights": "on"}, priority=3)])
+        self.assertEqual(self.executor.executed,
+                         ["ENERGY_SAVING", "ADJUST_ENVIRONMENT", "ADJUST_ENVIRONMENT"])
+
+    def test_duration_lapses(self):
+        self.dispatcher.dispatch([action("ACTIVATE_VENTILATION", VENTILATION)], now=0.0)
+        self.dispatcher.dispatch([action("ACTIVATE_VENTILATION", VENTILATION)], now=600.0)
+        self.dispatcher.dispatch([action("ACTIVATE_VENTILATION", VENTILATION)], now=900.0)
+        self.assertEqual(self.executor.executed, ["ACTIVATE_VENTILATION"] * 2)
+
+    def test_cooling_held_inside_band(self):
+        cooling = action("ACTIVATE_COOLING", {"target_temp": 23})
+        # The rules ask for cooling at 26, drop it below, and ask again at 26
+        for temperature, actions in ((26.5, [cooling]), (25.5, []), (26.0, [cooling]),
+                                     (24.5, []), (26.1, [cooling])):
+            self.dispatcher.dispatch(actions, temperature=temperature)
+        self.assertEqual(self.executor.executed, ["ACTIVATE_COOLING"])
+
+        self.dispatcher.dispatch([], temperature=24.0)
+        self.assertNotIn('hvac', self.dispatcher.desired)
+        self.dispatcher.dispatch([cooling], temperature=26.0)
+        self.assertEqual(self.executor.executed, ["ACTIVATE_COOLING"] * 2)
+
+    def test_heating_held_inside_band(self):
+        heating = action("ACTIVATE_HEATING", {"target_temp": 21})
+        self.dispatcher.dispatch([heating], temperature=17.5)
+        self.dispatcher.dispatch([], temperature=19.5)
+        self.assertIn('hvac', self.dispatcher.desired)
+        self.dispatcher.dispatch([], temperature=20.0)
+        self.assertNotIn('hvac', self.dispatcher.desired)
+
+    def test_batches_one_command_per_device_per_tick(self):
+        self.dispatcher.submit([action("ADJUST_ENVIRONMENT", {"lights": "on"}, priority=3),
+                                action("ENERGY_SAVING", {"lights": "off"}, priority=2)])
+        self.dispatcher.submit([action("ACTIVATE_VENTILATION", VENTILATION)])
+        self.dispatcher.submit([action("ACTIVATE_VENTILATION", VENTILATION)])
+        sent = self.dispatcher.flush()
+        self.assertEqual([a.action_type for a in sent], ["ENERGY_SAVING", "ACTIVATE_VENTILATION"])
+
+    def test_failed_command_is_retried(self):
+        self.executor.fail = True
+        self.dispatcher.dispatch([action("DOOR_NOTIFICATION", {"status": "check"}, priority=1)])
+        self.executor.fail = False
+        self.dispatcher.dispatch([action("DOOR_NOTIFICATION", {"status": "check"}, priority=1)])
+        self.assertEqual(self.executor.executed, ["DOOR_NOTIFICATION"])
+
+
+if __name__ == '__main__':
+    unittest.main()
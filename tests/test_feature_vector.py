@@ -0,0 +1,80 @@
+"""
+Tests for AIEngine's incrementally maintained feature vector
+"""
+import sys
+import os
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_engine import AIEngine, FEATURE_SLOTS
+from src.history import ACTION_KEYS, FEATURE_KEYS
+from src.sensors import SensorData, SensorType
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingController:
+    def __init__(self):
+        self.calls = []
+
+    def process_sensor_data(self, sensor_data, timestamp=None):
+        self.calls.append(sensor_data)
+        return {key: False for key in ACTION_KEYS}
+
+
+def reading(sensor_type, value):
+    return SensorData(datetime.now(), "sensor", sensor_type, value)
+
+
+class TestFeatureVector(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.engine = AIEngine(clock=self.clock, ai_controller=RecordingController())
+
+    def test_slots_follow_feature_order(self):
+        keys = {SensorType.TEMPERATURE: 'temperature', SensorType.HUMIDITY: 'humidity',
+                SensorType.DOOR: 'door_status', SensorType.AIR_QUALITY: 'air_quality',
+                SensorType.PRESENCE: 'presence'}
+        for sensor_type, slot in FEATURE_SLOTS.items():
+            self.assertEqual(FEATURE_KEYS[slot], keys[sensor_type])
+
+    def test_defaults_before_any_reading(self):
+        self.assertEqual(self.engine.sensor_dict(), {
+            'temperature': 22.0, 'humidity': 45.0, 'door_status': False,
+            'air_quality': 95.0, 'presence': True
+        })
+
+    def test_reading_updates_only_its_slot(self):
+        self.engine.process_sensor_data(reading(SensorType.HUMIDITY, 61.5))
+        self.engine.process_sensor_data(reading(SensorType.DOOR, True))
+        self.assertEqual(list(self.engine.features), [22.0, 61.5, 1.0, 95.0, 1.0])
+        decided = self.engine.ai_controller.calls[-1]
+        self.assertEqual(decided['humidity'], 61.5)
+        self.assertIs(decided['door_status'], True)
+        self.assertIs(decided['presence'], True)
+
+    def test_reading_age_and_stale_sensors(self):
+        self.assertIsNone(self.engine.reading_age(SensorType.TEMPERATURE))
+        self.clock.now = 10.0
+        self.engine.process_sensor_data(reading(SensorType.TEMPERATURE, 24.0))
+        self.clock.now = 40.0
+        self.engine.process_sensor_data(reading(SensorType.PRESENCE, False))
+        self.clock.now = 45.0
+
+        self.assertEqual(self.engine.reading_age(SensorType.TEMPERATURE), 35.0)
+        self.assertEqual(self.engine.reading_age(SensorType.PRESENCE), 5.0)
+        self.assertEqual(self.engine.stale_sensors(30.0),
+                         [SensorType.TEMPERATURE, SensorType.HUMIDITY,
+                          SensorType.DOOR, SensorType.AIR_QUALITY])
+
+
+if __name__ == '__main__':
+    unittest.main()
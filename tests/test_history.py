@@ -0,0 +1,145 @@
+"""
+Tests for the history storage backends
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.history import (
+    JSONHistoryStore, JSONLinesHistoryStore, SyncPolicy, open_history_store
+)
+from src.history_buffer import HistoryBuffer
+
+
+def make_entry(temperature):
+    return {
+        'input': {'temperature': temperature, 'humidity': 50.0, 'door_status': False,
+                  'air_quality': 95.0, 'presence': True},
+        'output': {'ventilation': False, 'hvac': False, 'lighting': True,
+                   'security': False, 'energy_saving': False}
+    }
+
+
+class TestJSONLinesHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'history.jsonl')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append_and_stream(self):
+        with JSONLinesHistoryStore(self.path, sync_policy=SyncPolicy.NONE) as store:
+            for i in range(25):
+                store.append(make_entry(20.0 + i))
+            self.assertEqual(len(store), 25)
+            temps = [e['input']['temperature'] for e in store.iter_entries()]
+        self.assertEqual(temps, [20.0 + i for i in range(25)])
+
+    def test_reopen_counts_entries(self):
+        with JSONLinesHistoryStore(self.path, sync_policy=SyncPolicy.ALWAYS) as store:
+            store.extend(make_entry(t) for t in (21.0, 22.0, 23.0))
+        with JSONLinesHistoryStore(self.path) as store:
+            self.assertEqual(len(store), 3)
+            store.append(make_entry(24.0))
+            self.assertEqual(len(store.load()), 4)
+
+    def test_batch_policy_flushes_every_batch(self):
+        store = JSONLinesHistoryStore(self.path, sync_policy=SyncPolicy.BATCH,
+                                      batch_size=5, batch_interval=3600)
+        for i in range(5):
+            store.append(make_entry(20.0))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read().count(b'\n'), 5)
+        store.close()
+
+    def test_recovers_from_torn_write(self):
+        with open(self.path, 'wb') as f:
+            f.write(json.dumps(make_entry(22.0)).encode() + b'\n')
+            f.write(b'{"input": {"tempera')
+        with JSONLinesHistoryStore(self.path) as store:
+            self.assertEqual(len(store), 1)
+            store.append(make_entry(23.0))
+            self.assertEqual([e['input']['temperature'] for e in store.iter_entries()],
+                             [22.0, 23.0])
+
+    def test_import_legacy_json(self):
+        legacy = os.path.join(self.tmpdir.name, 'sensor_history.json')
+        JSONHistoryStore(legacy).replace([make_entry(25.0), make_entry(26.0)])
+        store = open_history_store(self.path, import_from=legacy)
+        self.assertEqual(len(store), 2)
+        store.close()
+        # Import only happens when the log is first created
+        store = open_history_store(self.path, import_from=legacy)
+        self.assertEqual(len(store), 2)
+        store.close()
+
+    def test_replace(self):
+        with JSONLinesHistoryStore(self.path) as store:
+            store.extend(make_entry(t) for t in (20.0, 21.0, 22.0))
+            store.replace([make_entry(30.0)])
+            store.append(make_entry(31.0))
+            self.assertEqual(len(store), 2)
+            self.assertEqual([e['input']['temperature'] for e in store.iter_entries()],
+                             [30.0, 31.0])
+
+    def test_append_during_replace_is_kept(self):
+        with JSONLinesHistoryStore(self.path) as store:
+            store.extend(make_entry(t) for t in (20.0, 21.0, 22.0))
+            writer = threading.Thread(target=store.append, args=(make_entry(40.0),))
+
+            def kept():
+                for entry in store.iter_from(1):
+                    yield entry
+                    if writer.ident is None:
+                        writer.start()
+                        writer.join(0.2)
+
+            store.replace(kept())
+            writer.join()
+            self.assertEqual([e['input']['temperature'] for e in store.iter_entries()],
+                             [21.0, 22.0, 40.0])
+            self.assertEqual(len(store), 3)
+
+class TestHistoryBuffer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append_entry_and_views(self):
+        buffer = HistoryBuffer(capacity=4)
+        for i in range(10):
+            buffer.append_entry(make_entry(20.0 + i))
+        self.assertEqual(len(buffer), 10)
+        self.assertGreaterEqual(buffer.capacity, 10)
+        self.assertEqual(buffer.features.dtype, np.float32)
+        self.assertEqual(buffer.labels.dtype, np.uint8)
+        np.testing.assert_array_equal(buffer.features[:, 0], np.arange(20.0, 30.0))
+        np.testing.assert_array_equal(buffer.labels[0], [0, 0, 1, 0, 0])
+        self.assertTrue(np.shares_memory(buffer.features, buffer._features))
+
+    def test_memory_mapped_reopen(self):
+        path = os.path.join(self.tmpdir.name, 'buffer')
+        buffer = HistoryBuffer(capacity=2, path=path)
+        for i in range(5):
+            buffer.append_entry(make_entry(20.0 + i))
+        buffer.flush()
+        del buffer
+
+        reopened = HistoryBuffer(path=path)
+        self.assertEqual(len(reopened), 5)
+        np.testing.assert_array_equal(reopened.features[:, 0], np.arange(20.0, 25.0))
+        reopened.append_entry(make_entry(30.0))
+        self.assertEqual(len(reopened), 6)
+
+if __name__ == '__main__':
+    unittest.main()
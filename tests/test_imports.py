@@ -0,0 +1,37 @@
+"""
+Tests that sensor- and executor-side modules import without the model stack
+"""
+import sys
+import os
+import subprocess
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def loaded_after_import(statement):
+    probe = f"import sys\n{statement}\nprint('numpy' in sys.modules, 'sklearn' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_light_modules_skip_numpy_and_sklearn(self):
+        for statement in ("import src", "import src.sensors", "from src import ActionExecutor",
+                          "from src.ai_engine import Action, ActionExecutor",
+                          "import src.records", "import src.dispatch", "import src.polling",
+                          "from src.async_engine import AsyncActionExecutor"):
+            self.assertEqual(loaded_after_import(statement), ['False', 'False'], statement)
+
+    def test_model_loads_on_attribute_access(self):
+        self.assertEqual(loaded_after_import("import src; src.SmartHomeAI"), ['True', 'True'])
+
+    def test_unknown_attribute(self):
+        import src
+        with self.assertRaises(AttributeError):
+            src.NotAThing
+
+if __name__ == '__main__':
+    unittest.main()
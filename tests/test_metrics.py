@@ -0,0 +1,77 @@
+"""
+Tests for hot-path metrics and exporters
+"""
+import sys
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_engine import AIEngine
+from src.ai_model import SmartHomeAI
+from src.metrics import InMemoryMetrics, NULL_METRICS
+from src.sensors import SensorData, SensorType
+
+
+def reading(temperature=22.0):
+    return {'temperature': temperature, 'humidity': 50.0, 'door_status': False,
+            'air_quality': 95.0, 'presence': True}
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.metrics = InMemoryMetrics()
+        self.ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'),
+                              metrics=self.metrics)
+
+    def tearDown(self):
+        self.ai.close()
+        self.tmpdir.cleanup()
+
+    def test_stage_timings_and_model_counters(self):
+        for i in range(12):
+            self.ai.process_sensor_data(reading(18.0 + i))
+        self.ai.load_history()
+
+        for stage in ('features', 'rules', 'history_write', 'train', 'history_read'):
+            self.assertIsNotNone(self.metrics.histogram('stage_seconds', stage=stage), stage)
+        self.assertEqual(self.metrics.histogram('stage_seconds', stage='features').count, 12)
+        # The first model is fitted on the 11th reading, so two readings were predicted
+        self.assertEqual(self.metrics.histogram('stage_seconds', stage='predict').count, 2)
+        self.assertEqual(self.metrics.counter('model_publishes_total'), 1)
+        self.assertEqual(self.metrics.gauges[('model_version', ())], 1)
+        self.assertEqual(self.metrics.histogram('lock_wait_seconds', lock='history').count, 13)
+
+    def test_prediction_errors_are_counted(self):
+        for i in range(11):
+            self.ai.process_sensor_data(reading(18.0 + i))
+        self.ai._serving = self.ai._serving._replace(compiled=None, model=None)
+        self.ai.process_sensor_data(reading())
+        self.assertEqual(self.metrics.counter('prediction_errors_total'), 1)
+
+    def test_action_counters_and_prometheus_text(self):
+        engine = AIEngine(ai_controller=self.ai, metrics=self.metrics)
+        engine.process_sensor_data(SensorData(datetime.now(), "temp_001", SensorType.TEMPERATURE, 28.0, "°C"))
+        self.assertEqual(self.metrics.counter('actions_total', type='ACTIVATE_COOLING'), 1)
+
+        text = self.metrics.to_prometheus()
+        self.assertIn('# TYPE smart_home_actions_total counter', text)
+        self.assertIn('smart_home_actions_total{type="ACTIVATE_COOLING"} 1', text)
+        self.assertIn('# TYPE smart_home_stage_seconds histogram', text)
+        self.assertIn('smart_home_stage_seconds_bucket{stage="rules",le="+Inf"} 1', text)
+        self.assertIn('smart_home_stage_seconds_count{stage="rules"} 1', text)
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['histograms']['stage_seconds{stage="rules"}']['count'], 1)
+
+    def test_disabled_by_default(self):
+        ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'plain.jsonl'))
+        self.assertIs(ai.metrics, NULL_METRICS)
+        self.assertIs(ai._locked(ai.history_lock, 'history'), ai.history_lock)
+        ai.close()
+
+if __name__ == '__main__':
+    unittest.main()
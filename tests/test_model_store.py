@@ -0,0 +1,121 @@
+"""
+Tests for model snapshots and warm start
+"""
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.ai_model import SmartHomeAI
+from src.metrics import InMemoryMetrics
+from src.model_store import ModelStore
+from src.tree_compiler import CompiledTree
+
+
+def reading(temperature, presence=True):
+    return {'temperature': temperature, 'humidity': 50.0, 'door_status': False,
+            'air_quality': 95.0, 'presence': presence}
+
+
+class TestModelStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.history_file = os.path.join(self.tmpdir.name, 'history.jsonl')
+        self.model_dir = os.path.join(self.tmpdir.name, 'models')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def new_ai(self, **kwargs):
+        return SmartHomeAI(history_file=self.history_file, model_dir=self.model_dir, **kwargs)
+
+    def train(self, ai, count=30):
+        for i in range(count):
+            ai.process_sensor_data(reading(15.0 + i % 15, presence=i % 3 != 0))
+        ai.train_model()
+
+    def test_restart_serves_snapshot_without_fitting(self):
+        ai = self.new_ai()
+        self.train(ai)
+        version = ai.model_version
+        X = np.array([[t, 50.0, d, a, p] for t in (16.0, 22.0, 29.0) for d in (0, 1)
+                      for a in (85.0, 95.0) for p in (0, 1)])
+        expected = ai.decide_batch(X)
+        rules = ai.get_learned_rules()
+        ai.close()
+
+        with mock.patch('src.ai_model.fit_tree') as fit:
+            restarted = self.new_ai()
+            self.assertTrue(restarted.is_trained())
+            self.assertIsInstance(restarted.model, CompiledTree)
+            self.assertEqual(restarted.model_version, version)
+            np.testing.assert_array_equal(restarted.decide_batch(X), expected)
+            for x, row in zip(X, expected):
+                actions = restarted.decide(dict(zip(
+                    ('temperature', 'humidity', 'door_status', 'air_quality', 'presence'),
+                    (x[0], x[1], bool(x[2]), x[3], bool(x[4])))))
+                self.assertEqual(list(actions.values()), row.tolist())
+            self.assertEqual(restarted.get_learned_rules(), rules)
+            self.assertEqual(restarted.model_staleness()['samples_behind'], 0)
+            fit.assert_not_called()
+        restarted.close()
+
+    def test_versions_are_pruned(self):
+        ai = self.new_ai()
+        for _ in range(5):
+            self.train(ai, 12)
+        store = ModelStore(self.model_dir)
+        self.assertEqual(len(store.versions()), 3)
+        self.assertEqual(store.versions()[-1], ai.model_version)
+        ai.close()
+
+    def test_mismatched_schema_is_rejected(self):
+        ai = self.new_ai()
+        self.train(ai)
+        ai.close()
+        metrics = InMemoryMetrics()
+        with mock.patch('src.model_store.schema_hash', return_value='different'):
+            restarted = self.new_ai(metrics=metrics)
+        self.assertFalse(restarted.is_trained())
+        self.assertEqual(metrics.counter('snapshots_rejected_total'),
+                         len(ModelStore(self.model_dir).versions()))
+        restarted.close()
+
+    def test_snapshots_after_rejection_survive_pruning(self):
+        ai = self.new_ai()
+        for _ in range(3):
+            self.train(ai, 12)
+        ai.close()
+        stale = ModelStore(self.model_dir).versions()
+        with mock.patch('src.model_store.schema_hash', return_value='different'):
+            retrained = self.new_ai()
+            self.train(retrained, 12)
+            retrained.close()
+            self.assertEqual(ModelStore(self.model_dir).versions()[-1], retrained.model_version)
+            self.assertGreater(retrained.model_version, stale[-1])
+
+            restarted = self.new_ai()
+            self.assertTrue(restarted.is_trained())
+            self.assertEqual(restarted.model_version, retrained.model_version)
+            restarted.close()
+
+    def test_corrupt_snapshot_falls_back_to_older(self):
+        ai = self.new_ai()
+        self.train(ai)
+        self.train(ai)
+        ai.close()
+        store = ModelStore(self.model_dir)
+        latest = store.versions()[-1]
+        with open(store._path(latest), 'wb') as f:
+            f.write(b'not a snapshot')
+        restarted = self.new_ai()
+        self.assertEqual(restarted.model_version, latest - 1)
+        restarted.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for the multi-home engine
+"""
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.multi_home import MultiHomeEngine
+from src.sensors import SensorData, SensorType
+
+
+def step_readings(temperature):
+    now = datetime.now()
+    return [
+        SensorData(now, "temp_001", SensorType.TEMPERATURE, temperature, "°C"),
+        SensorData(now, "hum_001", SensorType.HUMIDITY, 50.0, "%"),
+        SensorData(now, "door_001", SensorType.DOOR, False),
+        SensorData(now, "air_001", SensorType.AIR_QUALITY, 95.0, "%"),
+        SensorData(now, "pres_001", SensorType.PRESENCE, True),
+    ]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMultiHomeEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_engine(self, **kwargs):
+        return MultiHomeEngine(self.tmpdir.name, clock=self.clock, **kwargs)
+
+    def test_state_and_history_are_per_home(self):
+        engine = self.make_engine()
+        hot = engine.process_readings("a", step_readings(28.0))
+        cold = engine.process_readings("b", step_readings(15.0))
+        self.assertIn("ACTIVATE_COOLING", [a.action_type for a in hot])
+        self.assertIn("ACTIVATE_HEATING", [a.action_type for a in cold])
+        self.assertEqual(len(engine.home("a").ai_controller.history), 1)
+        engine.close()
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, "a", "history.jsonl")))
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, "b", "history.jsonl")))
+
+    def test_shared_pool_trains_each_home(self):
+        engine = self.make_engine()
+        for i in range(12):
+            for home_id in ("a", "b"):
+                engine.process_readings(home_id, step_readings(15.0 + i))
+        engine._pool.shutdown(wait=True)
+        self.assertTrue(engine.home("a").ai_controller.is_trained())
+        self.assertTrue(engine.home("b").ai_controller.is_trained())
+
+    def test_lru_eviction_and_reload(self):
+        engine = self.make_engine(max_loaded_homes=2)
+        for home_id in ("a", "b", "c"):
+            engine.process_readings(home_id, step_readings(22.0))
+        self.assertEqual(engine.loaded_homes, ["b", "c"])
+
+        # The evicted home's history is reloaded from disk
+        engine.process_readings("a", step_readings(22.0))
+        self.assertEqual(len(engine.home("a").ai_controller.history), 2)
+        self.assertEqual(engine.loaded_homes, ["c", "a"])
+        engine.close()
+
+    def test_open_history_files_are_bounded(self):
+        engine = self.make_engine(max_open_histories=2)
+        histories = {}
+        for home_id in ("a", "b", "c", "d"):
+            engine.process_readings(home_id, step_readings(22.0))
+            histories[home_id] = engine.home(home_id).ai_controller.history
+        self.assertEqual([h for h, store in histories.items() if store._file is not None], ["c", "d"])
+
+        # A released home reopens its file on the next write
+        engine.process_readings("a", step_readings(22.0))
+        self.assertEqual(len(histories["a"]), 2)
+        self.assertEqual(len(histories["a"].load()), 2)
+        engine.close()
+
+    def test_home_in_use_is_not_evicted(self):
+        engine = self.make_engine(max_loaded_homes=1)
+        with engine.using("a") as home:
+            engine.process_readings("b", step_readings(22.0))
+            engine.process_readings("c", step_readings(22.0))
+            self.assertIn("a", engine.loaded_homes)
+            home.process_readings(step_readings(22.0))
+            self.assertIsNotNone(home.ai_controller.history._file)
+        self.assertNotIn("a", engine.loaded_homes)
+        self.assertEqual(len(engine.home("a").ai_controller.history), 1)
+        engine.close()
+
+    def test_slow_load_does_not_block_other_homes(self):
+        engine = self.make_engine()
+        load = engine._load
+        started, proceed = threading.Event(), threading.Event()
+
+        def slow_load(home_id):
+            if home_id == "slow":
+                started.set()
+                proceed.wait(5)
+            return load(home_id)
+
+        engine._load = slow_load
+        loader = threading.Thread(target=engine.process_readings, args=("slow", step_readings(22.0)))
+        loader.start()
+        self.assertTrue(started.wait(5))
+        # Loaded and decided while "slow" is still loading
+        self.assertTrue(engine.process_readings("fast", step_readings(22.0)))
+        waiter = threading.Thread(target=engine.process_readings, args=("slow", step_readings(22.0)))
+        waiter.start()
+        proceed.set()
+        loader.join(5)
+        waiter.join(5)
+        # Both callers got the one loaded engine
+        self.assertEqual(len(engine.home("slow").ai_controller.history), 2)
+        engine.close()
+
+    def test_evict_idle(self):
+        engine = self.make_engine(idle_seconds=60)
+        engine.process_readings("a", step_readings(22.0))
+        self.clock.now = 30.0
+        engine.process_readings("b", step_readings(22.0))
+        self.clock.now = 70.0
+        self.assertEqual(engine.evict_idle(), ["a"])
+        self.assertEqual(engine.loaded_homes, ["b"])
+        engine.close()
+
+    def test_invalid_home_id(self):
+        engine = self.make_engine()
+        with self.assertRaises(ValueError):
+            engine.home("../elsewhere")
+        engine.close()
+
+if __name__ == '__main__':
+    unittest.main()
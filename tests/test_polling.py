@@ -0,0 +1,116 @@
+"""
+Tests for the per-sensor-interval polling scheduler
+"""
+import sys
+import os
+import threading
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.polling import SensorPoller
+from src.sensors import BaseSensor, SensorData, SensorManager, SensorType
+
+
+class CountingSensor(BaseSensor):
+    def __init__(self, sensor_id, sensor_type, block=None, fail=False):
+        super().__init__(sensor_id, sensor_type)
+        self.reads = 0
+        self.block = block
+        self.fail = fail
+
+    def get_reading(self):
+        self.reads += 1
+        if self.block is not None:
+            self.block.wait()
+        if self.fail:
+            raise IOError("bus error")
+        return SensorData(datetime.now(), self.sensor_id, self.sensor_type, 1.0)
+
+
+def drain(poller, timeout=1.0):
+    readings = []
+    reading = poller.get(timeout)
+    while reading is not None:
+        readings.append(reading)
+        reading = poller.get(0.05)
+    return readings
+
+
+class TestSensorPoller(unittest.TestCase):
+    def setUp(self):
+        self.manager = SensorManager()
+        self.pollers = []
+
+    def tearDown(self):
+        for poller in self.pollers:
+            poller.stop()
+
+    def make_poller(self, **kwargs):
+        poller = SensorPoller(self.manager, **kwargs)
+        self.pollers.append(poller)
+        return poller
+
+    def register(self, *sensors):
+        for sensor in sensors:
+            self.manager.register_sensor(sensor)
+        return sensors
+
+    def test_per_sensor_intervals(self):
+        temperature, door = self.register(CountingSensor("temp", SensorType.TEMPERATURE),
+                                          CountingSensor("door", SensorType.DOOR))
+        poller = self.make_poller()
+        for now in (0.0, 0.5, 1.0, 1.5, 2.0):
+            poller.run_due(now)
+            drain(poller)
+        self.assertEqual(temperature.reads, 1)
+        self.assertEqual(door.reads, 5)
+        self.assertEqual(poller.run_due(2.2), 2.5)
+
+    def test_interval_overrides(self):
+        temperature, = self.register(CountingSensor("temp", SensorType.TEMPERATURE))
+        poller = self.make_poller(intervals={"temp": 0.25})
+        self.assertEqual(poller.interval(temperature), 0.25)
+
+    def test_slow_sensor_times_out_without_stalling_others(self):
+        release = threading.Event()
+        slow, door = self.register(CountingSensor("slow", SensorType.AIR_QUALITY, block=release),
+                                   CountingSensor("door", SensorType.DOOR))
+        poller = self.make_poller(timeout=1.0, intervals={"slow": 0.5})
+        poller.run_due(0.0)
+        self.assertEqual([r.sensor_id for r in drain(poller)], ["door"])
+
+        poller.run_due(0.5)
+        self.assertEqual([r.sensor_id for r in drain(poller)], ["door"])
+        self.assertEqual(slow.reads, 1)   # still in flight: not read again
+        poller.run_due(1.0)
+        self.assertEqual(poller.timeouts, 1)
+
+        release.set()
+        self.assertEqual([r.sensor_id for r in drain(poller)], ["door"])  # late result dropped
+        poller.run_due(1.5)
+        self.assertEqual(sorted(r.sensor_id for r in drain(poller)), ["door", "slow"])
+
+    def test_read_errors_are_counted(self):
+        self.register(CountingSensor("broken", SensorType.DOOR, fail=True))
+        poller = self.make_poller()
+        poller.run_due(0.0)
+        self.assertEqual(drain(poller, timeout=0.2), [])
+        self.assertEqual(poller.errors, 1)
+
+    def test_stream(self):
+        self.register(CountingSensor("door", SensorType.DOOR), CountingSensor("pres", SensorType.PRESENCE))
+        poller = self.make_poller(intervals={SensorType.DOOR: 0.01, SensorType.PRESENCE: 0.01})
+        seen = set()
+        with poller:
+            for reading in poller:
+                seen.add(reading.sensor_id)
+                if len(seen) == 2:
+                    break
+        self.assertEqual(seen, {"door", "pres"})
+        self.assertFalse(poller.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
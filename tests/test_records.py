@@ -0,0 +1,91 @@
+"""
+Tests for the compact reading/action records and packed readings
+"""
+import sys
+import os
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.actions import Action, ActionExecutor
+from src.ai_engine import AIEngine
+from src.records import (ActionRecord, ActionType, Reading, ReadingPacker, READING_STRUCT,
+                         epoch_ms)
+from src.sensors import SensorData, SensorType
+
+
+def sensor_readings():
+    now = datetime(2024, 1, 1, 12, 0, 0, 250000)
+    return [
+        SensorData(now, "temp_001", SensorType.TEMPERATURE, 28.5, "°C"),
+        SensorData(now, "door_001", SensorType.DOOR, True),
+        SensorData(now, "pres_001", SensorType.PRESENCE, False),
+    ]
+
+
+class TestReading(unittest.TestCase):
+    def test_round_trip(self):
+        for sensor_data in sensor_readings():
+            reading = Reading.from_sensor_data(sensor_data)
+            self.assertEqual(reading.timestamp_ms, epoch_ms(sensor_data.timestamp))
+            self.assertEqual(reading.to_sensor_data(), sensor_data)
+
+    def test_slotted_and_frozen(self):
+        reading = Reading.from_sensor_data(sensor_readings()[0])
+        self.assertFalse(hasattr(reading, '__dict__'))
+        with self.assertRaises(AttributeError):
+            reading.value = 1.0
+
+    def test_engine_accepts_readings(self):
+        engine = AIEngine(ai_controller=object())
+        engine.update_state(Reading.from_sensor_data(sensor_readings()[0]))
+        self.assertEqual(engine.sensor_dict()['temperature'], 28.5)
+
+
+class TestActionRecord(unittest.TestCase):
+    def test_create_shares_template(self):
+        first = ActionRecord.create(ActionType.COOLING, 1000)
+        second = ActionRecord.create(ActionType.COOLING, 2000)
+        self.assertIs(first.parameters, second.parameters)
+        self.assertEqual(first.priority, 2)
+        self.assertEqual(first.action_id, "cooling_1.0")
+        with self.assertRaises(TypeError):
+            first.parameters['target_temp'] = 30
+
+    def test_action_round_trip(self):
+        action = Action("security_1.5", "DOOR_NOTIFICATION", {"status": "check", "duration_minutes": 5},
+                        1, datetime.fromtimestamp(1.5))
+        record = ActionRecord.from_action(action)
+        self.assertIs(record.parameters, ActionRecord.create(ActionType.DOOR_NOTIFICATION, 0).parameters)
+        self.assertEqual(record.to_action(), action)
+
+    def test_executor_dispatches_records(self):
+        record = ActionRecord.create(ActionType.HEATING, 0)
+        self.assertTrue(ActionExecutor().execute_action(record))
+
+
+class TestReadingPacker(unittest.TestCase):
+    def test_pack_unpack(self):
+        packer = ReadingPacker()
+        data = packer.pack(sensor_readings())
+        self.assertEqual(len(data), 3 * READING_STRUCT.size)
+
+        readings = ReadingPacker(packer.sensor_table()).unpack(data)
+        self.assertEqual([r.to_sensor_data() for r in readings], sensor_readings())
+        self.assertIs(readings[1].value, True)
+
+    def test_numpy_view(self):
+        packer = ReadingPacker()
+        rows = packer.to_array(packer.pack(sensor_readings()))
+        self.assertEqual(rows['value'].tolist(), [28.5, 1.0, 0.0])
+        self.assertEqual(rows['sensor'].tolist(), [0, 1, 2])
+
+    def test_sensor_type_conflict(self):
+        packer = ReadingPacker([("temp_001", SensorType.TEMPERATURE, "°C")])
+        with self.assertRaises(ValueError):
+            packer.sensor_index("temp_001", SensorType.HUMIDITY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for history retention policies
+"""
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+
+from src.ai_model import SmartHomeAI
+from src.retention import RetentionPolicy, collapse_duplicates
+
+
+class TestRetentionPolicy(unittest.TestCase):
+    def test_count_and_time_windows(self):
+        timestamps = np.arange(100, dtype=np.float64) * 60.0
+        self.assertEqual(RetentionPolicy(max_samples=30).window_start(timestamps), 70)
+        self.assertEqual(RetentionPolicy(max_age_seconds=600).window_start(timestamps), 89)
+        both = RetentionPolicy(max_samples=5, max_age_seconds=600)
+        self.assertEqual(both.window_start(timestamps), 95)
+        self.assertEqual(RetentionPolicy().window_start(timestamps), 0)
+
+    def test_decay_weights(self):
+        policy = RetentionPolicy(half_life_seconds=3600)
+        weights = policy.sample_weights(np.array([0.0, 3600.0, 7200.0]))
+        np.testing.assert_allclose(weights, [0.25, 0.5, 1.0])
+
+    def test_collapsed_rows_train_the_same_tree(self):
+        rng = np.random.default_rng(0)
+        base_X = np.column_stack([
+            rng.choice([17.0, 22.0, 27.0], 12), rng.choice([45.0, 60.0], 12),
+            rng.integers(0, 2, 12), rng.choice([80.0, 95.0], 12), rng.integers(0, 2, 12)
+        ]).astype(np.float32)
+        base_y = np.column_stack([base_X[:, 0] > 25, base_X[:, 0] < 18, base_X[:, 4] == 1,
+                                  base_X[:, 2] == 1, base_X[:, 4] == 0]).astype(np.uint8)
+        repeats = rng.integers(1, 20, len(base_X))
+        X = np.repeat(base_X, repeats, axis=0)
+        y = np.repeat(base_y, repeats, axis=0)
+
+        X_unique, y_unique, weights = collapse_duplicates(X, y)
+        self.assertLessEqual(len(X_unique), len(base_X))
+        self.assertEqual(weights.sum(), len(X))
+
+        full = DecisionTreeClassifier(max_depth=5, random_state=42).fit(X, y)
+        collapsed = DecisionTreeClassifier(max_depth=5, random_state=42).fit(
+            X_unique, y_unique, sample_weight=weights)
+        np.testing.assert_array_equal(full.predict(X), collapsed.predict(X))
+
+
+class TestSmartHomeAIRetention(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.history_file = os.path.join(self.tmpdir.name, 'history.jsonl')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_count_window_bounds_buffer_and_store(self):
+        ai = SmartHomeAI(history_file=self.history_file, retrain_threshold=None,
+                         retention=RetentionPolicy(max_samples=20, deduplicate=True))
+        reading = {'temperature': 26.0, 'humidity': 55.0, 'door_status': False,
+                   'air_quality': 95.0, 'presence': True}
+        for i in range(60):
+            ai.process_sensor_data(reading, timestamp=1000.0 + i)
+        ai.train_model()
+        self.assertEqual(len(ai.buffer), 20)
+        self.assertEqual(len(ai.history), 20)
+        self.assertEqual(ai.buffer.timestamps[0], 1040.0)
+        self.assertTrue(ai.is_trained())
+        ai.close()
+
+    def test_online_learner_with_decay(self):
+        ai = SmartHomeAI(history_file=self.history_file, retrain_threshold=None,
+                         learner='online',
+                         retention=RetentionPolicy(max_samples=20, half_life_seconds=60))
+        reading = {'temperature': 27.0, 'humidity': 60.0, 'door_status': False,
+                   'air_quality': 80.0, 'presence': True}
+        for i in range(50):
+            ai.process_sensor_data(reading, timestamp=1000.0 + i)
+        ai.train_model()
+        self.assertEqual(len(ai.buffer), 20)
+        # 10 rows learned at the first fit, then only the 20 rows still in the
+        # window; rows that expired before being learned are skipped
+        self.assertEqual(ai.model.n_samples_seen, 30)
+        ai.close()
+
+if __name__ == '__main__':
+    unittest.main()
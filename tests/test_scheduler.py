@@ -0,0 +1,116 @@
+"""
+Tests for the retraining scheduler
+"""
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_controller import AIController
+from src.ai_model import SmartHomeAI
+from src.metrics import InMemoryMetrics
+from src.scheduler import RetrainPolicy, RetrainScheduler
+
+
+def reading(temperature=22.0, humidity=50.0, presence=True):
+    return {'temperature': temperature, 'humidity': humidity, 'door_status': False,
+            'air_quality': 95.0, 'presence': presence}
+
+
+class TestRetrainScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'),
+                              retrain_threshold=None)
+        self.ai.on_retrain_due = lambda: None
+        self.policy = RetrainPolicy(min_new_samples=100, min_drift_samples=10,
+                                    check_interval=1.0, max_interval=8.0)
+        self.scheduler = RetrainScheduler(self.ai, self.policy)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.ai.close()
+        self.tmpdir.cleanup()
+
+    def train_on(self, readings):
+        for r in readings:
+            self.ai.process_sensor_data(r)
+        self.assertEqual(self.scheduler.run_once(), 'initial')
+
+    def test_initial_and_sample_count(self):
+        self.assertIsNone(self.scheduler.run_once())
+        self.train_on([reading(20.0 + i % 4) for i in range(12)])
+        self.assertTrue(self.ai.is_trained())
+        for _ in range(100):
+            self.ai.process_sensor_data(reading(21.0))
+        self.assertEqual(self.scheduler.check(), 'samples')
+
+    def test_backoff_while_idle(self):
+        self.train_on([reading(20.0 + i % 4) for i in range(12)])
+        intervals = []
+        for _ in range(5):
+            self.scheduler.run_once()
+            intervals.append(self.scheduler.interval)
+        self.assertEqual(intervals, [1.0, 2.0, 4.0, 8.0, 8.0])
+
+        # New readings reset the interval
+        self.ai.process_sensor_data(reading(21.0))
+        self.assertIsNone(self.scheduler.run_once())
+        self.assertEqual(self.scheduler.interval, 1.0)
+
+    def test_feature_shift_triggers_drift(self):
+        self.train_on([reading(20.0 + i % 4, humidity=45.0 + i % 3) for i in range(40)])
+        for _ in range(10):
+            self.ai.process_sensor_data(reading(21.5, humidity=46.0))
+        self.assertIsNone(self.scheduler.check())
+        for _ in range(10):
+            self.ai.process_sensor_data(reading(21.0, humidity=80.0))
+        self.assertEqual(self.scheduler.check(), 'drift')
+
+    def test_rule_disagreement_triggers_drift(self):
+        # Trained only on comfortable temperatures, the model never saw the
+        # heating/cooling rules fire
+        self.train_on([reading(21.0 + i % 3) for i in range(40)])
+        for i in range(10):
+            self.ai.process_sensor_data(reading(30.0 + i % 2))
+        self.assertEqual(self.scheduler.check(), 'drift')
+
+    def test_failed_retrain_is_counted(self):
+        self.ai.metrics = InMemoryMetrics()
+        with mock.patch.object(self.ai, 'train_model', side_effect=RuntimeError('boom')):
+            for i in range(12):
+                self.ai.process_sensor_data(reading(20.0 + i % 4))
+            self.scheduler.start()
+            deadline = time.time() + 5
+            while not self.ai.metrics.counter('retrain_errors_total') and time.time() < deadline:
+                time.sleep(0.01)
+            self.scheduler.stop(timeout=5)
+        self.assertGreaterEqual(self.ai.metrics.counter('retrain_errors_total'), 1)
+
+    def test_stop_ends_thread(self):
+        self.scheduler.start()
+        self.assertTrue(self.scheduler.running)
+        self.scheduler.stop(timeout=5)
+        self.assertFalse(self.scheduler.running)
+
+
+class TestControllerShutdown(unittest.TestCase):
+    def test_close_stops_training(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ai = SmartHomeAI(history_file=os.path.join(tmpdir, 'history.jsonl'))
+            with AIController(ai=ai) as controller:
+                self.assertTrue(controller.scheduler.running)
+                for i in range(12):
+                    controller.process_sensor_data(reading(20.0 + i % 4))
+                deadline = time.time() + 5
+                while not ai.is_trained() and time.time() < deadline:
+                    time.sleep(0.01)
+                self.assertTrue(ai.is_trained())
+            self.assertFalse(controller.scheduler.running)
+
+if __name__ == '__main__':
+    unittest.main()
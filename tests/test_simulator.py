@@ -0,0 +1,103 @@
+"""
+Tests for the simulator's fast-forward mode
+"""
+import asyncio
+import sys
+import os
+import io
+import random
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulate_smart_home import SmartHomeSimulator
+from src.ai_engine import AIEngine
+from src.ai_model import SmartHomeAI
+
+
+class TestVirtualTime(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'))
+        self.engine = AIEngine(ai_controller=self.ai)
+        random.seed(1)
+
+    def tearDown(self):
+        self.ai.close()
+        self.tmpdir.cleanup()
+
+    def test_day_runs_without_sleeping(self):
+        simulator = SmartHomeSimulator(ai_engine=self.engine, quiet=True)
+        start_time = datetime(2024, 6, 1)
+        started = time.perf_counter()
+        simulator.run_simulation(duration_minutes=24 * 60, time_step_minutes=15,
+                                 virtual_time=True, start_time=start_time)
+        self.assertLess(time.perf_counter() - started, 10)
+
+        entries = self.ai.load_history()
+        self.assertEqual(len(entries), 96)
+        # History is stamped with simulated time and holds the simulated values
+        self.assertEqual(entries[0]['timestamp'], start_time.timestamp())
+        self.assertEqual(entries[-1]['timestamp'] - entries[0]['timestamp'], 95 * 15 * 60)
+        temperatures = [entry['input']['temperature'] for entry in entries]
+        self.assertGreater(max(temperatures) - min(temperatures), 6)
+
+    def test_output_goes_to_file(self):
+        output = io.StringIO()
+        simulator = SmartHomeSimulator(ai_engine=self.engine, output=output)
+        stdout = io.StringIO()
+        sys.stdout, original = stdout, sys.stdout
+        try:
+            simulator.run_simulation(duration_minutes=30, time_step_minutes=5, virtual_time=True)
+        finally:
+            sys.stdout = original
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(output.getvalue().count("AI System Response:"), 6)
+
+    def test_log_leaves_stdout_alone(self):
+        output = io.StringIO()
+        simulator = SmartHomeSimulator(ai_engine=self.engine, output=output)
+        process_readings = self.engine.process_readings
+
+        def noisy(*args, **kwargs):
+            print("from another component")
+            return process_readings(*args, **kwargs)
+
+        self.engine.process_readings = noisy
+        stdout = io.StringIO()
+        sys.stdout, original = stdout, sys.stdout
+        try:
+            simulator.run_simulation(duration_minutes=10, time_step_minutes=5, virtual_time=True)
+            SmartHomeSimulator(ai_engine=self.engine, quiet=True).step()
+        finally:
+            sys.stdout = original
+        # Other components' prints stay on stdout; a quiet run writes nothing
+        self.assertNotIn("from another component", output.getvalue())
+        self.assertEqual(stdout.getvalue().count("from another component"), 3)
+        self.assertEqual(stdout.getvalue().replace("from another component\n", ""), "")
+
+    def test_async_run_decides_on_simulated_readings(self):
+        output = io.StringIO()
+        simulator = SmartHomeSimulator(ai_engine=self.engine, output=output)
+        stdout = io.StringIO()
+        sys.stdout, original = stdout, sys.stdout
+        try:
+            asyncio.run(simulator.run_simulation_async(duration_minutes=15, time_step_minutes=5,
+                                                       step_delay=0))
+        finally:
+            sys.stdout = original
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(output.getvalue().count("AI System Response:"), 3)
+
+        entries = self.ai.load_history()
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[-1]['input']['temperature'], simulator.temperature)
+        self.assertEqual(entries[-1]['input']['air_quality'], simulator.air_quality)
+        # Commands go through the dispatcher, as in step()
+        self.assertGreater(simulator.dispatcher.sent, 0)
+
+if __name__ == '__main__':
+    unittest.main()
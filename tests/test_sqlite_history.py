@@ -0,0 +1,162 @@
+"""
+Tests for the SQLite history backend
+"""
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_model import SmartHomeAI
+from src.history import SyncPolicy, open_history_store
+from src.retention import RetentionPolicy
+from src.sensors import SensorData, SensorType
+from src.sqlite_history import SQLiteHistoryStore
+
+
+def make_entry(temperature, timestamp=None):
+    entry = {
+        'input': {'temperature': temperature, 'humidity': 50.0, 'door_status': False,
+                  'air_quality': 95.0, 'presence': True},
+        'output': {'ventilation': False, 'hvac': temperature >= 26, 'lighting': True,
+                   'security': False, 'energy_saving': False}
+    }
+    if timestamp is not None:
+        entry['timestamp'] = timestamp
+    return entry
+
+
+class TestSQLiteHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'history.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_reopen(self):
+        entries = [make_entry(20.0 + i, timestamp=1000.0 + i) for i in range(25)]
+        with SQLiteHistoryStore(self.path) as store:
+            store.extend(entries[:5])
+            for entry in entries[5:]:
+                store.append(entry)
+            self.assertEqual(store.load(), entries)
+        with SQLiteHistoryStore(self.path) as store:
+            self.assertEqual(len(store), 25)
+            self.assertEqual(list(store.iter_from(20)), entries[20:])
+
+    def test_wal_and_indexes(self):
+        SQLiteHistoryStore(self.path).close()
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn('system_state_home_time', indexes)
+        self.assertIn('sensor_data_home_sensor_time', indexes)
+        conn.close()
+
+    def test_batched_appends(self):
+        with SQLiteHistoryStore(self.path, sync_policy=SyncPolicy.BATCH, batch_size=10,
+                                batch_interval=3600) as store:
+            for i in range(15):
+                store.append(make_entry(20.0, timestamp=float(i)))
+            conn = sqlite3.connect(self.path)
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM system_state').fetchone()[0], 10)
+            self.assertEqual(len(store), 15)
+            self.assertEqual(len(store.load()), 15)
+            conn.close()
+
+    def test_homes_share_a_file(self):
+        with SQLiteHistoryStore(self.path, home_id='a') as a, SQLiteHistoryStore(self.path, home_id='b') as b:
+            a.extend([make_entry(20.0, 1.0), make_entry(21.0, 2.0)])
+            b.append(make_entry(30.0, 1.0))
+            b.replace([make_entry(31.0, 5.0)])
+            self.assertEqual([e['input']['temperature'] for e in a.load()], [20.0, 21.0])
+            self.assertEqual([e['input']['temperature'] for e in b.load()], [31.0])
+
+    def test_range_query_and_downsample(self):
+        with SQLiteHistoryStore(self.path) as store:
+            store.extend(make_entry(20.0 + i, timestamp=3600.0 * i / 4) for i in range(8))
+            self.assertEqual([e['timestamp'] for e in store.query(start=1800.0, end=5400.0)],
+                             [1800.0, 2700.0, 3600.0, 4500.0])
+            buckets = store.downsample(3600, columns=('temperature', 'hvac'))
+            self.assertEqual([b['timestamp'] for b in buckets], [0, 3600])
+            self.assertEqual(buckets[0]['count'], 4)
+            self.assertEqual(buckets[0]['temperature'], {'min': 20.0, 'avg': 21.5, 'max': 23.0})
+            self.assertEqual(buckets[1]['hvac']['max'], 1)
+            with self.assertRaises(ValueError):
+                store.downsample(60, columns=('timestamp; DROP TABLE system_state',))
+
+    def test_drop_front_and_delete_before(self):
+        with SQLiteHistoryStore(self.path) as store:
+            store.extend(make_entry(20.0 + i, timestamp=float(i)) for i in range(10))
+            store.drop_front(3)
+            self.assertEqual(store.load()[0]['timestamp'], 3.0)
+            self.assertEqual(store.delete_before(5.0), 2)
+            self.assertEqual(len(store), 5)
+
+    def test_sensor_readings(self):
+        readings = [SensorData(datetime.fromtimestamp(60.0 * i), "temp_001", SensorType.TEMPERATURE,
+                               20.0 + i, "°C") for i in range(4)]
+        readings.append(SensorData(datetime.fromtimestamp(30.0), "door_001", SensorType.DOOR, True))
+        with SQLiteHistoryStore(self.path) as store:
+            store.append_readings(readings)
+            self.assertEqual(store.query_readings("temp_001", start=60.0), readings[1:4])
+            self.assertIs(store.query_readings("door_001")[0].value, True)
+            self.assertEqual([(b['timestamp'], b['avg']) for b in store.downsample_readings("temp_001", 120)],
+                             [(0, 20.5), (120, 22.5)])
+
+    def test_open_history_store_imports_legacy_json(self):
+        legacy = os.path.join(self.tmpdir.name, 'history.json')
+        with open(legacy, 'w') as f:
+            json.dump([make_entry(25.0), make_entry(26.0)], f)
+        with open_history_store(self.path, import_from=legacy) as store:
+            self.assertIsInstance(store, SQLiteHistoryStore)
+            self.assertEqual(len(store), 2)
+
+    def test_smart_home_ai_on_sqlite(self):
+        ai = SmartHomeAI(history_file=self.path, retrain_threshold=None,
+                         retention=RetentionPolicy(max_samples=10))
+        for i in range(30):
+            ai.process_sensor_data({'temperature': 20.0 + i % 10, 'humidity': 50.0, 'door_status': False,
+                                    'air_quality': 95.0, 'presence': True}, timestamp=float(i))
+        ai.train_model()
+        self.assertLessEqual(len(ai.history), 30)
+        self.assertEqual(len(ai.history), len(ai.buffer))
+        ai.close()
+
+        reopened = SmartHomeAI(history_file=self.path, retrain_threshold=None)
+        self.assertEqual(len(reopened.buffer), len(reopened.history))
+        reopened.close()
+
+    def test_startup_loads_only_retention_window(self):
+        store = SQLiteHistoryStore(self.path)
+        store.extend(make_entry(20.0 + i % 10, timestamp=float(i)) for i in range(1000))
+        store.close()
+
+        ai = SmartHomeAI(history_file=self.path, retrain_threshold=None,
+                         retention=RetentionPolicy(max_age_seconds=100))
+        self.assertEqual(len(ai.history), 1000)
+        self.assertEqual(len(ai.buffer), 101)
+        self.assertEqual(ai.buffer.timestamps[0], 899.0)
+        ai.close()
+
+        ai = SmartHomeAI(history_file=self.path, retrain_threshold=None,
+                         retention=RetentionPolicy(max_samples=10))
+        self.assertEqual(list(ai.buffer.timestamps), [float(i) for i in range(990, 1000)])
+        for i in range(1000, 1030):
+            ai.process_sensor_data({'temperature': 21.0, 'humidity': 50.0, 'door_status': False,
+                                    'air_quality': 95.0, 'presence': True}, timestamp=float(i))
+        ai.train_model()
+        # Compaction drops the unloaded rows too, leaving store and buffer aligned
+        self.assertEqual(len(ai.history), len(ai.buffer))
+        self.assertEqual([entry['timestamp'] for entry in ai.history.iter_entries()],
+                         list(ai.buffer.timestamps))
+        ai.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
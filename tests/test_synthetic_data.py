@@ -0,0 +1,123 @@
+"""
+Tests for the vectorized synthetic data generator
+"""
+import sys
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from simulate_smart_home import SmartHomeSimulator
+from src.ai_engine import AIEngine
+from src.ai_model import SmartHomeAI
+from src.history import JSONLinesHistoryStore
+from src.history_buffer import HistoryBuffer
+from src.synthetic_data import SensorState, clipped_walk, generate, iter_chunks, write_buffer, write_store
+
+
+class TestSyntheticData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ai = SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'))
+        self.simulator = SmartHomeSimulator(ai_engine=AIEngine(ai_controller=self.ai), quiet=True)
+
+    def tearDown(self):
+        self.ai.close()
+        self.tmpdir.cleanup()
+
+    def test_clipped_walk_matches_loop(self):
+        rng = np.random.default_rng(0)
+        steps = rng.uniform(-3, 3, (3, 500))
+        start = np.array([50.0, 0.0, 100.0])
+        expected = np.empty_like(steps)
+        for home in range(3):
+            x = start[home]
+            for t in range(steps.shape[1]):
+                x = min(100.0, max(0.0, x + steps[home, t]))
+                expected[home, t] = x
+        np.testing.assert_allclose(clipped_walk(start, steps, 0.0, 100.0), expected, atol=1e-9)
+
+    def test_statistics_match_scalar_models(self):
+        start = datetime(2024, 1, 1)
+        n = 20000
+        random.seed(3)
+        scalar = np.empty((n, 5))
+        for i in range(n):
+            self.simulator.time = start + timedelta(minutes=5 * i)
+            temperature = self.simulator.simulate_temperature()
+            scalar[i] = (temperature, self.simulator.simulate_humidity(), self.simulator.simulate_door(),
+                         self.simulator.simulate_air_quality(), self.simulator.simulate_presence())
+        vectorized = generate(n, start_time=start, seed=3).features
+
+        np.testing.assert_allclose(vectorized.mean(axis=0)[[0, 1, 4]], scalar.mean(axis=0)[[0, 1, 4]],
+                                   rtol=0.02)
+        np.testing.assert_allclose(vectorized.std(axis=0)[[0, 1]], scalar.std(axis=0)[[0, 1]], rtol=0.05)
+        # The door spends about half its time open; air quality stays in range
+        self.assertAlmostEqual(vectorized[:, 2].mean(), 0.5, delta=0.1)
+        self.assertTrue(((vectorized[:, 3] >= 0) & (vectorized[:, 3] <= 100)).all())
+        # Day/night presence rates
+        hours = np.array([(start + timedelta(minutes=5 * i)).hour for i in range(n)])
+        night = (hours < 7) | (hours > 22)
+        self.assertAlmostEqual(vectorized[night, 4].mean(), 0.95, delta=0.02)
+        self.assertAlmostEqual(vectorized[~night, 4].mean(), 0.9, delta=0.02)
+
+    def test_air_quality_follows_door(self):
+        data = generate(5000, seed=1, state=SensorState(door_open=False, air_quality=95.0))
+        door, air = data.features[:, 2], data.features[:, 3]
+        change = np.diff(np.concatenate([[95.0], air]))
+        self.assertTrue((change[door == 1] >= 0).all())
+        self.assertTrue((change[door == 0] <= 0).all())
+
+    def test_many_homes(self):
+        data = generate(100, n_homes=20, seed=2)
+        self.assertEqual(data.features.shape, (20, 100, 5))
+        self.assertEqual(data.timestamps.shape, (100,))
+        self.assertFalse(np.array_equal(data.features[0], data.features[1]))
+
+    def test_many_homes_continue_from_final_state(self):
+        data = generate(100, n_homes=20, seed=2)
+        np.testing.assert_array_equal(data.final_state.door_open, data.features[:, -1, 2] == 1)
+        np.testing.assert_array_equal(data.final_state.air_quality, data.features[:, -1, 3])
+
+        following = generate(1, n_homes=20, seed=3, state=data.final_state)
+        change = following.features[:, 0, 3] - data.final_state.air_quality
+        door = following.features[:, 0, 2] == 1
+        # Each home's walk continues from its own last value
+        self.assertTrue((change[door] >= 0).all() and (change[door] <= 5.0).all())
+        self.assertTrue((change[~door] <= 0).all() and (change[~door] >= -2.0).all())
+
+    def test_chunks_continue_the_series(self):
+        start = datetime(2024, 1, 1)
+        chunks = list(iter_chunks(250, chunk_size=100, start_time=start, seed=4))
+        self.assertEqual([len(X) for X, _ in chunks], [100, 100, 50])
+        timestamps = np.concatenate([ts for _, ts in chunks])
+        np.testing.assert_allclose(np.diff(timestamps), 300.0)
+
+    def test_simulator_state_advances(self):
+        self.simulator.time = datetime(2024, 1, 1)
+        data = self.simulator.generate_bulk(12, seed=5)
+        self.assertEqual(self.simulator.time, datetime(2024, 1, 1, 0, 55))
+        self.assertEqual(self.simulator.air_quality, data.features[-1, 3])
+
+    def test_writers(self):
+        data = generate(300, start_time=datetime(2024, 1, 1), seed=6)
+        buffer = HistoryBuffer()
+        write_buffer(buffer, data.features, data.timestamps)
+        self.assertEqual(len(buffer), 300)
+
+        path = os.path.join(self.tmpdir.name, 'bulk.jsonl')
+        with JSONLinesHistoryStore(path) as store:
+            write_store(store, data.features, data.timestamps, chunk_size=128)
+        ai = SmartHomeAI(history_file=path)
+        self.assertEqual(len(ai.history), 300)
+        np.testing.assert_allclose(ai.buffer.features, buffer.features)
+        np.testing.assert_array_equal(ai.buffer.labels, buffer.labels)
+        ai.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the process-pool training worker
+"""
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.ai_controller import AIController
+from src.ai_model import SmartHomeAI
+from src.retention import RetentionPolicy
+from src.training_worker import ProcessTrainingWorker, fit_tree
+
+
+def make_readings(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(15, 30, n), rng.uniform(30, 70, n), rng.integers(0, 2, n),
+        rng.uniform(70, 100, n), rng.integers(0, 2, n)
+    ])
+
+
+class TestProcessTrainingWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.worker = ProcessTrainingWorker()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.close()
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_ai(self, **kwargs):
+        return SmartHomeAI(history_file=os.path.join(self.tmpdir.name, 'history.jsonl'),
+                           retrain_threshold=None, trainer=self.worker, **kwargs)
+
+    def test_worker_fit_matches_in_process_fit(self):
+        X = make_readings(300).astype(np.float32)
+        y = (X[:, [0, 3]] > [24.0, 90.0]).astype(np.uint8)
+        remote = self.worker.fit(X, y)
+        np.testing.assert_array_equal(remote.predict(X), fit_tree(X, y).predict(X))
+
+    def test_trains_from_arrays(self):
+        ai = self.make_ai()
+        ai.process_batch(make_readings(100), record=True)
+        ai.train_model()
+        self.assertTrue(ai.is_trained())
+        self.assertIsNotNone(ai._serving.compiled)
+        ai.close()
+
+    def test_worker_reads_shared_buffer(self):
+        ai = self.make_ai(buffer_path=os.path.join(self.tmpdir.name, 'buffer'),
+                          retention=RetentionPolicy(deduplicate=True))
+        ai.process_batch(make_readings(100, seed=1), record=True)
+        ai.train_model()
+        X, y, _ = ai.buffer.snapshot()
+        local = fit_tree(*RetentionPolicy(deduplicate=True).prepare(X, y, ai.buffer.timestamps))
+        np.testing.assert_array_equal(ai.model.predict(X), local.predict(X))
+        ai.close()
+
+
+class TestControllerTrainingMode(unittest.TestCase):
+    def test_process_mode_installs_worker(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ai = SmartHomeAI(history_file=os.path.join(tmpdir, 'history.jsonl'))
+            with AIController(ai=ai, training_mode='process'):
+                self.assertIsInstance(ai.trainer, ProcessTrainingWorker)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            AIController(training_mode='cluster')
+
+if __name__ == '__main__':
+    unittest.main()
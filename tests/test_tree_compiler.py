@@ -0,0 +1,83 @@
+"""
+Tests for the compiled decision tree predictor
+"""
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+
+from src.ai_model import SmartHomeAI, apply_explicit_rules, apply_energy_saving_override
+from src.tree_compiler import CompiledTree
+
+
+def random_features(rng, n):
+    return np.column_stack([
+        rng.uniform(10, 35, n), rng.uniform(20, 80, n), rng.integers(0, 2, n),
+        rng.uniform(60, 100, n), rng.integers(0, 2, n)
+    ])
+
+
+class TestCompiledTree(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        X = random_features(rng, 2000)
+        # Noisy labels so the tree uses its full depth
+        y = apply_energy_saving_override(X, apply_explicit_rules(X)).astype(np.uint8)
+        y ^= (rng.random(y.shape) < 0.1).astype(np.uint8)
+        self.model = DecisionTreeClassifier(max_depth=5, random_state=42).fit(X, y)
+        self.compiled = CompiledTree.from_estimator(self.model)
+        self.X_test = random_features(rng, 3000)
+
+    def test_predict_one_matches_sklearn(self):
+        expected = self.model.predict(self.X_test)
+        for x, row in zip(self.X_test.tolist(), expected.tolist()):
+            self.assertEqual(self.compiled.predict_one(x), tuple(row))
+
+    def test_vectorized_predict_matches_sklearn(self):
+        np.testing.assert_array_equal(self.compiled.predict(self.X_test),
+                                      self.model.predict(self.X_test))
+
+    def test_values_on_thresholds(self):
+        # Inputs exactly at (and one float64 ulp around) every split threshold
+        tree = self.model.tree_
+        rows = []
+        for node in np.flatnonzero(tree.children_left != -1):
+            for value in (np.nextafter(tree.threshold[node], -np.inf), tree.threshold[node],
+                          np.nextafter(tree.threshold[node], np.inf)):
+                x = self.X_test[node % len(self.X_test)].copy()
+                x[tree.feature[node]] = value
+                rows.append(x)
+        X = np.array(rows)
+        expected = self.model.predict(X)
+        np.testing.assert_array_equal(self.compiled.predict(X), expected)
+        for x, row in zip(X.tolist(), expected.tolist()):
+            self.assertEqual(self.compiled.predict_one(x), tuple(row))
+
+    def test_single_output(self):
+        rng = np.random.default_rng(3)
+        X = random_features(rng, 500)
+        model = DecisionTreeClassifier(max_depth=5, random_state=0).fit(X, X[:, 0] > 24)
+        compiled = CompiledTree.from_estimator(model)
+        np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+        self.assertEqual(compiled.predict_one(X[0].tolist())[0], model.predict(X[:1])[0])
+
+
+class TestSmartHomeAIServing(unittest.TestCase):
+    def test_publishes_compiled_predictor(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ai = SmartHomeAI(history_file=os.path.join(tmpdir, 'history.jsonl'),
+                             retrain_threshold=None)
+            rng = np.random.default_rng(5)
+            ai.process_batch(random_features(rng, 200), record=True)
+            ai.train_model()
+            self.assertIsNotNone(ai._serving.compiled)
+            self.assertIs(ai._serving.model, ai.model)
+            ai.close()
+
+if __name__ == '__main__':
+    unittest.main()